@@ -1,42 +1,32 @@
-print("Starting Flask application...")
-
+import hmac
+import logging
 import os
+import signal
 import sys
+import threading
+import time
 from datetime import datetime
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, send_file
 from flask_cors import CORS
 
-print(f"Python version: {sys.version}")
-print(f"Current working directory: {os.getcwd()}")
-
-# --- Data path checks (keep your helpful logs) ---
-data_file_path = os.path.join('..', 'data', 'internship.csv')
-print(f"Looking for data file at: {os.path.abspath(data_file_path)}")
-
-parent_dir = '..'
-if os.path.exists(parent_dir):
-    print(f"Contents of parent directory: {os.listdir(parent_dir)}")
-else:
-    print("❌ Parent directory not accessible")
-
-data_dir = os.path.join('..', 'data')
-if os.path.exists(data_dir):
-    print("✅ Data directory exists")
-    print(f"Contents of data directory: {os.listdir(data_dir)}")
-else:
-    print("❌ Data directory not found")
-
-if not os.path.exists(data_file_path):
-    print("❌ Data file not found")
-    print("Creating sample data file...")
-    try:
-        os.makedirs(data_dir, exist_ok=True)
-        print(f"✅ Data directory created at: {os.path.abspath(data_dir)}")
-    except Exception as e:
-        print(f"❌ Error creating data directory: {e}")
+from app_logging import RouteSampler, get_logger, setup_logging
+from metrics import (CONTENT_TYPE, Counter, CounterFunction, Gauge, Histogram, StageTimer, registry,
+                     collect_request_stages, stop_collecting_stages)
+from profiling import discard_profile, finish_profile, list_profiles, profile_path, start_profile
+from request_log import default_recorder
+from reloader import DatasetReloader, build_snapshot
+from snapshot_store import default_snapshot_path
+
+# Nothing below runs at import time except configuration: the data file checks and the
+# engine load happen in prepare_data_file() / init_engine(), called by `python app.py`,
+# by serve.py (once, in the pre-fork parent) or lazily by the first request.
 
-    sample_data = """internship_title,company_name,location,start_date,duration,stipend
+# Listings CSV; DATA_FILE points the API at another catalog (e.g. one from synthetic_catalog.py)
+data_file_path = os.environ.get('DATA_FILE', os.path.join('..', 'data', 'internship.csv'))
+
+# Written when the data file is missing, so the API can still start
+SAMPLE_DATA = """internship_title,company_name,location,start_date,duration,stipend
 Java Development,SunbaseData,Work From Home,Immediately,6 Months,"₹ 30,000 /month"
 Accounting and Finance,DAKSM & Co. LLP,Noida,Immediately,6 Months,"₹ 5,000-10,000 /month"
 Sales & Digital Marketing,Bharat Natural Elements Private Limited,Bangalore,Immediately,6 Months,"₹ 5,000 /month"
@@ -53,47 +43,299 @@ Python Development,DevCorp,Work From Home,Immediately,6 Months,"₹ 35,000 /mont
 UI/UX Design,DesignStudio,Pune,Immediately,6 Months,"₹ 20,000 /month"
 Content Writing,MediaHouse,Work From Home,Immediately,6 Months,"₹ 15,000 /month"
 """
-    try:
-        with open(data_file_path, 'w', encoding='utf-8') as f:
-            f.write(sample_data)
-        print("✅ Sample data file created successfully")
-    except Exception as e:
-        print(f"❌ Error creating sample data file: {e}")
-        alternative_path = 'internship.csv'
+
+
+def prepare_data_file():
+    """Log the data location and create the sample CSV when it is missing; returns the data file path"""
+    global data_file_path
+
+    print(f"Python version: {sys.version}")
+    print(f"Current working directory: {os.getcwd()}")
+    print(f"Looking for data file at: {os.path.abspath(data_file_path)}")
+
+    parent_dir = '..'
+    if os.path.exists(parent_dir):
+        print(f"Contents of parent directory: {os.listdir(parent_dir)}")
+    else:
+        print("❌ Parent directory not accessible")
+
+    data_dir = os.path.join('..', 'data')
+    if os.path.exists(data_dir):
+        print("✅ Data directory exists")
+        print(f"Contents of data directory: {os.listdir(data_dir)}")
+    else:
+        print("❌ Data directory not found")
+
+    if not os.path.exists(data_file_path):
+        print("❌ Data file not found")
+        print("Creating sample data file...")
+        try:
+            os.makedirs(data_dir, exist_ok=True)
+            print(f"✅ Data directory created at: {os.path.abspath(data_dir)}")
+        except Exception as e:
+            print(f"❌ Error creating data directory: {e}")
+
         try:
-            with open(alternative_path, 'w', encoding='utf-8') as f:
-                f.write(sample_data)
-            data_file_path = alternative_path
-            print(f"✅ Created data file in current directory: {alternative_path}")
-        except Exception as e2:
-            print(f"❌ Failed to create data file anywhere: {e2}")
-            sys.exit(1)
+            with open(data_file_path, 'w', encoding='utf-8') as f:
+                f.write(SAMPLE_DATA)
+            print("✅ Sample data file created successfully")
+        except Exception as e:
+            print(f"❌ Error creating sample data file: {e}")
+            alternative_path = 'internship.csv'
+            try:
+                with open(alternative_path, 'w', encoding='utf-8') as f:
+                    f.write(SAMPLE_DATA)
+                data_file_path = alternative_path
+                print(f"✅ Created data file in current directory: {alternative_path}")
+            except Exception as e2:
+                print(f"❌ Failed to create data file anywhere: {e2}")
+                raise RuntimeError(f"No data file available: {e2}")
+    return data_file_path
+
 
 # --- Flask app ---
 app = Flask(__name__)
 CORS(app)  # Safe even if already enabled elsewhere
 
-print("Initializing data processor...")
-try:
-    from data_processor import DataProcessor
-    data_processor = DataProcessor(data_file_path)
-    print("✅ Data processor initialized successfully")
-except Exception as e:
-    print(f"❌ Error initializing data processor: {e}")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
-
-print("Initializing recommendation engine...")
-try:
-    from recommendation_engine import RecommendationEngine
-    recommendation_engine = RecommendationEngine(data_processor)
-    print("✅ Recommendation system initialized successfully")
-except Exception as e:
-    print(f"❌ Error initializing recommendation engine: {e}")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
+# Reported by /health; serve.py replaces it
+SERVER_LABEL = 'Flask Development Server'
+
+# The live processor/engine pair is swapped atomically on reload; each request
+# reads reloader.current() once and finishes on that snapshot. Set by init_engine().
+reloader = None
+_init_lock = threading.Lock()
+
+# Set by serve.py in the workers it forks: the arbiter's pid (it reloads the dataset for all
+# workers) and the worker count (edits are refused when a change would reach only one worker)
+ARBITER_PID = None
+SERVE_WORKERS = 1
+
+
+def init_engine(check_data_file=True):
+    """Load the dataset and engine once per process (idempotent); raises RuntimeError when that fails"""
+    global reloader
+
+    with _init_lock:
+        if reloader is not None:
+            return reloader
+        setup_logging()
+        if check_data_file:
+            prepare_data_file()
+
+        print("Initializing data processor and recommendation engine...")
+        # Binary snapshot built by `python snapshot_store.py`; ignored unless it matches the CSV. Empty disables.
+        snapshot_path = os.environ.get('DATA_SNAPSHOT', default_snapshot_path(data_file_path))
+        dataset = DatasetReloader(data_file_path, builder=lambda path: build_snapshot(path, snapshot_path or None),
+                                  poll_interval=float(os.environ.get('DATA_RELOAD_INTERVAL', 5)))
+        if not dataset.reload():
+            print("❌ Error initializing recommendation system")
+            raise RuntimeError("Error initializing recommendation system")
+        print("✅ Recommendation system initialized successfully")
+        reloader = dataset
+        return reloader
+
+
+def start_background_tasks():
+    """Start the dataset file watcher (under serve.py the arbiter watches the file for all workers instead)"""
+    init_engine().start_watching()
+
+
+@app.before_request
+def ensure_initialized():
+    g.request_started = time.perf_counter()
+    # Only does work when the app is served without `python app.py` or serve.py
+    if reloader is None:
+        init_engine()
+        start_background_tasks()
+
+
+# --- Request metrics and logging: every request is counted, its log record is sampled per route ---
+log = get_logger('api')
+request_sampler = RouteSampler()
+
+REQUEST_SECONDS = registry.register(Histogram(
+    'request_duration_seconds', 'Request handling time per route', ('route', 'method')))
+REQUESTS = registry.register(Counter(
+    'requests_total', 'Requests per route and status', ('route', 'method', 'status')))
+REQUEST_ERRORS = registry.register(Counter(
+    'request_errors_total', 'Requests answered with a 5xx status', ('route',)))
+EMPTY_RESULTS = registry.register(Counter(
+    'empty_results_total', 'Recommendation, search and similar-listing results with nothing in them', ('route',)))
+
+# Endpoints an admin can profile with `X-Profile: 1` or `?profile=1` (plus X-Admin-Token)
+PROFILED_ENDPOINTS = {'get_recommendations'}
+
+# JSON endpoints whose request bodies are appended to REQUEST_RECORD_PATH when it is set (for loadtest.py replay)
+RECORDED_ENDPOINTS = {'get_recommendations', 'get_recommendations_batch'}
+request_recorder = default_recorder()
+
+
+def profiling_requested():
+    return (request.endpoint in PROFILED_ENDPOINTS and request.method == 'POST'
+            and (request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1')
+            and admin_authorized())
+
+
+@app.before_request
+def start_request_instrumentation():
+    # Engine stage laps are summed per request for the Server-Timing header
+    g.stages = collect_request_stages()
+    if profiling_requested():
+        g.profiler = start_profile()
+
+
+@app.teardown_request
+def release_profiler(error=None):
+    # Only does work when record_request didn't run
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        discard_profile(profiler)
+
+
+@app.after_request
+def record_request(response):
+    route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+    started = g.get('request_started')
+    seconds = time.perf_counter() - started if started is not None else 0.0
+    fields = g.get('log_fields', {})
+    status = response.status_code
+
+    stages = g.get('stages') or {}
+    stop_collecting_stages()
+    timing = [f'{stage};dur={stage_seconds * 1000:.3f}' for stage, stage_seconds in stages.items()]
+    timing.append(f'total;dur={seconds * 1000:.3f}')
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profile_id = finish_profile(profiler, {
+            'route': route,
+            'status': status,
+            'duration_ms': round(seconds * 1000, 3),
+            'stages_ms': ', '.join(f'{stage}={stage_seconds * 1000:.3f}' for stage, stage_seconds in stages.items()),
+            'request': request.get_data(as_text=True)[:2000],
+            'captured_at': get_current_timestamp()
+        })
+        if profile_id:
+            response.headers['X-Profile-Id'] = profile_id
+            timing.append(f'profile;desc="{profile_id}"')
+            log.info("🔬 Saved request profile %s", profile_id)
+    response.headers['Server-Timing'] = ', '.join(timing)
+    response.headers['Timing-Allow-Origin'] = '*'
+    if request_recorder is not None and request.endpoint in RECORDED_ENDPOINTS and request.method == 'POST':
+        request_recorder.record(request.method, request.full_path.rstrip('?'), request.get_data())
+
+    REQUEST_SECONDS.observe(seconds, route, request.method)
+    REQUESTS.inc(route, request.method, str(status))
+    if status >= 500:
+        REQUEST_ERRORS.inc(route)
+    # Batches report how many of their result lists were empty
+    empty = fields.get('empty', 1 if fields.get('results') == 0 else 0)
+    if empty:
+        EMPTY_RESULTS.inc(route, amount=empty)
+
+    if status < 500 and not request_sampler.keep(route):
+        return response
+    log.log(logging.ERROR if status >= 500 else logging.INFO, "request", extra={
+                'method': request.method,
+                'route': route,
+                'status': status,
+                'duration_ms': round(seconds * 1000, 2),
+                **fields
+            })
+    return response
+
+
+# Admin endpoints are disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+# --- Result cache (repeated profiles skip rescoring) ---
+from result_cache import ResultCache, profile_cache_key
+
+recommendation_cache = ResultCache(
+    max_size=int(os.environ.get('RESULT_CACHE_SIZE', 1024)),
+    ttl_seconds=float(os.environ.get('RESULT_CACHE_TTL', 300))
+)
+
+
+def recommendation_cache_key(user_profile, num_recommendations=10):
+    return profile_cache_key(user_profile, mode='profile', top_k=num_recommendations)
+
+
+def search_cache_key(query, top_k, filters, user_profile):
+    return profile_cache_key(user_profile, mode='query', query=query.lower(), top_k=top_k, filters=filters)
+
+
+# Dataset and cache state, read when /metrics is scraped
+def _dataset_gauge(read):
+    def collect():
+        snapshot = reloader.current() if reloader is not None else None
+        return {(): read(snapshot)} if snapshot is not None else {}
+    return collect
+
+
+registry.register(Gauge('catalog_rows', 'Live listings in the catalog', (),
+                        _dataset_gauge(lambda snapshot: len(snapshot.processor.processed_data))))
+registry.register(Gauge('catalog_revision', 'In-place edits applied since the dataset was loaded', (),
+                        _dataset_gauge(lambda snapshot: snapshot.processor.processed_data.revision)))
+registry.register(Gauge('dataset_info', 'Always 1; labelled with the live dataset version', ('version',),
+                        lambda: {(reloader.current().version,): 1} if reloader is not None else {}))
+registry.register(CounterFunction('dataset_reloads_total', 'Dataset reloads since start', (),
+                                  lambda: {(): reloader.reload_count} if reloader is not None else {}))
+registry.register(Gauge('result_cache_entries', 'Results held in the result cache', (),
+                        lambda: {(): recommendation_cache.stats()['size']}))
+for _counter in ('hits', 'misses', 'evictions'):
+    registry.register(CounterFunction(f'result_cache_{_counter}_total', f'Result cache {_counter}', (),
+                                      lambda name=_counter: {(): recommendation_cache.stats()[name]}))
+
+
+def timed_jsonify(operation, payload):
+    """jsonify(payload), timed as the operation's 'serialize' stage"""
+    timer = StageTimer(operation)
+    response = jsonify(payload)
+    timer.lap('serialize')
+    return response
+
+
+def cached_recommendations(snapshot, user_profile, num_recommendations=10, refresh=False):
+    """get_recommendations through the result cache, keyed by the canonical profile (refresh skips the lookup)"""
+    key = recommendation_cache_key(user_profile, num_recommendations)
+    with snapshot.lock.read():
+        return recommendation_cache.get_or_compute(
+            key, snapshot.version,
+            lambda: snapshot.engine.get_recommendations(user_profile, num_recommendations),
+            refresh=refresh
+        )
+
+
+def cached_batch_recommendations(snapshot, user_profiles, num_recommendations=10):
+    """Cached results where available; the misses are scored together with get_recommendations_batch"""
+    keys = [recommendation_cache_key(user_profile, num_recommendations) for user_profile in user_profiles]
+    with snapshot.lock.read():
+        version = snapshot.version
+        results = {}
+        for key in keys:
+            hit, value = recommendation_cache.get(key, version)
+            if hit:
+                results[key] = value
+        # Identical profiles in one batch are scored once
+        missing = {key: user_profile for key, user_profile in zip(keys, user_profiles) if key not in results}
+        if missing:
+            computed = snapshot.engine.get_recommendations_batch(list(missing.values()), num_recommendations)
+            for key, recommendations in zip(missing, computed):
+                recommendation_cache.put(key, version, recommendations)
+                results[key] = recommendations
+    return [results[key] for key in keys], len(missing)
+
+
+def cached_search(snapshot, query, top_k, filters, user_profile, refresh=False):
+    """Free-text recommend() through the result cache (refresh skips the lookup)"""
+    key = search_cache_key(query, top_k, filters, user_profile)
+    with snapshot.lock.read():
+        return recommendation_cache.get_or_compute(
+            key, snapshot.version,
+            lambda: snapshot.engine.recommend(query=query, top_k=top_k, filters=filters, user_profile=user_profile),
+            refresh=refresh
+        )
+
 
 # --- Helpers ---
 def get_current_timestamp():
@@ -101,6 +343,104 @@ def get_current_timestamp():
     return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
 
 
+def admin_authorized():
+    """True when the request carries the configured X-Admin-Token"""
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN)
+
+
+# Optional range filters accepted next to the profile fields
+NUMERIC_RANGE_FIELDS = ['max_stipend', 'min_duration', 'max_duration']
+DATE_RANGE_FIELDS = ['start_after', 'start_before']
+
+
+def extract_range_filters(data):
+    """Validated optional range filters from a request payload (raises ValueError)"""
+    from recommendation_engine import start_date_bound
+
+    filters = {}
+    for field in NUMERIC_RANGE_FIELDS:
+        if data.get(field) not in (None, ''):
+            try:
+                filters[field] = float(data[field])
+            except (TypeError, ValueError):
+                raise ValueError(f'{field} must be a number')
+    for field in DATE_RANGE_FIELDS:
+        if data.get(field) not in (None, ''):
+            start_date_bound(data[field])  # validates the format
+            filters[field] = data[field]
+    return filters
+
+
+def extract_top_k(data, default):
+    """Validated top_k of a request payload: a positive integer (raises ValueError)"""
+    value = data.get('top_k', default)
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError('top_k must be a positive integer')
+    try:
+        top_k = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('top_k must be a positive integer')
+    if top_k < 1:
+        raise ValueError('top_k must be a positive integer')
+    return top_k
+
+
+def extract_search_request(data):
+    """(filters, optional profile) of a free-text /api/recommendations body; raises ValueError on bad filters"""
+    search_filters = extract_range_filters(data)
+    for field in ('location_preference', 'min_stipend'):
+        if data.get(field):
+            search_filters[field] = data[field]
+
+    search_profile = None
+    if data.get('skills') or data.get('education'):
+        search_profile = {
+            'education': data.get('education', ''),
+            'skills': data.get('skills', []),
+            'location_preference': data.get('location_preference', ''),
+            'min_stipend': data.get('min_stipend', 0)
+        }
+    return search_filters, search_profile
+
+
+def is_cached_recommendation(data):
+    """True when POST /api/recommendations with this JSON body would be answered from the result cache"""
+    snapshot = reloader.current() if reloader else None
+    if not snapshot or not isinstance(data, dict):
+        return False
+    try:
+        query = data.get("query", "").strip()
+        if query:
+            search_filters, search_profile = extract_search_request(data)
+            key = search_cache_key(query, extract_top_k(data, 5), search_filters, search_profile)
+        else:
+            key = recommendation_cache_key(extract_user_profile(data))
+    except Exception:
+        # Bodies the endpoint rejects take the normal path and get their error there
+        return False
+    return recommendation_cache.peek(key, snapshot.version)
+
+
+def extract_user_profile(data):
+    """Validated structured profile (education/skills/location + range filters) from a payload (raises ValueError)"""
+    required_fields = ['education', 'skills', 'location_preference']
+    missing_fields = [f for f in required_fields if f not in data or not data[f]]
+    if missing_fields:
+        raise ValueError(f'Missing required fields: {", ".join(missing_fields)}')
+
+    if not isinstance(data['skills'], list) or len(data['skills']) == 0:
+        raise ValueError('At least one skill must be selected')
+
+    user_profile = {
+        'education': data['education'],
+        'skills': data['skills'],
+        'location_preference': data['location_preference'],
+        'min_stipend': data.get('min_stipend', 0)
+    }
+    user_profile.update(extract_range_filters(data))
+    return user_profile
+
+
 # --- Routes ---
 @app.route('/')
 def home():
@@ -114,7 +454,9 @@ def home():
             'health': '/health',
             'recommend': '/recommend',
             'test': '/test',
-            'api_recommendations': '/api/recommendations'
+            'api_recommendations': '/api/recommendations',
+            'api_recommendations_batch': '/api/recommendations/batch',
+            'stats': '/api/stats'
         }
     })
 
@@ -122,8 +464,10 @@ def home():
 @app.route('/health')
 def health():
     try:
-        if data_processor and hasattr(data_processor, 'df') and data_processor.df is not None:
-            data_count = len(data_processor.df)
+        snapshot = reloader.current()
+        data_processor = snapshot.processor if snapshot else None
+        if data_processor and data_processor.processed_data is not None:
+            data_count = len(data_processor.processed_data)
             status = 'healthy'
         else:
             data_count = 0
@@ -133,15 +477,17 @@ def health():
             'status': status,
             'data_loaded': data_count,
             'timestamp': get_current_timestamp(),
-            'server': 'Flask Development Server',
+            'server': SERVER_LABEL,
             'user': 'Om Raj Singh',
-            'endpoints_available': ['/', '/health', '/test', '/recommend', '/api/recommendations']
+            'endpoints_available': ['/', '/health', '/test', '/recommend', '/api/recommendations'],
+            'dataset': reloader.status(),
+            'cache': recommendation_cache.stats()
         }
-        print(f"Health check requested - Status: {status}, Data count: {data_count}")
+        log.debug("Health check - status: %s, data count: %s", status, data_count)
         return jsonify(response)
 
     except Exception as e:
-        print(f"❌ Error in health endpoint: {e}")
+        log.exception("❌ Error in health endpoint: %s", e)
         return jsonify({
             'status': 'error',
             'error_message': str(e),
@@ -155,7 +501,7 @@ def health():
 def get_recommendations_old():
     try:
         data = request.get_json() if request.is_json else request.form.to_dict()
-        print(f"Received recommendation request: {data}")
+        log.debug("Received recommendation request: %s", data)
 
         required_fields = ['name', 'education', 'skills', 'location_preference', 'min_stipend']
         for field in required_fields:
@@ -173,12 +519,20 @@ def get_recommendations_old():
             'location_preference': data['location_preference'],
             'min_stipend': float(data.get('min_stipend', 0))
         }
+        try:
+            candidate_profile.update(extract_range_filters(data))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'timestamp': get_current_timestamp()
+            }), 400
 
-        print(f"Candidate profile: {candidate_profile}")
-        recommendations = recommendation_engine.get_recommendations(candidate_profile)
-        print(f"Generated {len(recommendations)} recommendations")
+        log.debug("Candidate profile: %s", candidate_profile)
+        recommendations = cached_recommendations(reloader.current(), candidate_profile)
+        g.log_fields = {'results': len(recommendations)}
 
-        return jsonify({
+        return timed_jsonify('recommend', {
             'success': True,
             'candidate': candidate_profile,
             'recommendations': recommendations,
@@ -188,9 +542,7 @@ def get_recommendations_old():
         })
 
     except Exception as e:
-        print(f"Error in /recommend endpoint: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Error in /recommend endpoint: %s", e)
         return jsonify({
             'success': False,
             'error': 'Internal server error',
@@ -206,6 +558,8 @@ def recommendations_get():
         "message": "Use POST with JSON to fetch recommendations.",
         "examples": [
             {"education": "B.Tech", "skills": ["python", "ml"], "location_preference": "Bengaluru", "top_k": 5},
+            {"education": "B.Tech", "skills": ["python"], "location_preference": "any",
+             "min_stipend": 10000, "max_stipend": 30000, "max_duration": 6, "start_after": "2024-12-01"},
             {"query": "data science intern remote", "top_k": 5}
         ],
         "timestamp": get_current_timestamp()
@@ -218,7 +572,7 @@ def get_recommendations():
     """Newer API endpoint your frontend calls."""
     # Handle CORS preflight explicitly (Flask-CORS also helps)
     if request.method == 'OPTIONS':
-        print("📥 CORS preflight request received")
+        log.debug("📥 CORS preflight request received")
         response = jsonify({'status': 'ok'})
         response.headers.add('Access-Control-Allow-Origin', '*')
         response.headers.add('Access-Control-Allow-Headers', 'Content-Type')
@@ -226,10 +580,9 @@ def get_recommendations():
         return response
 
     try:
-        print(f"\n📥 API recommendation request received at {get_current_timestamp()}")
-
-        if not data_processor or not recommendation_engine:
-            print("❌ System not initialized")
+        snapshot = reloader.current()
+        if not snapshot or not snapshot.processor or not snapshot.engine:
+            log.error("❌ System not initialized")
             return jsonify({
                 'success': False,
                 'message': 'System not initialized properly',
@@ -237,78 +590,48 @@ def get_recommendations():
             }), 500
 
         data = request.get_json(silent=True) or {}
-        print(f"📊 Request data: {data}")
+        log.debug("📊 Request data: %s", data)
 
         # Accept either the structured profile (education/skills/location) or a plain query string
         query = data.get("query", "").strip()
+        # A profiled request does the work instead of reading the result cache
+        profiling = g.get('profiler') is not None
 
         if query:
-            # If 'query' is provided, let engine interpret it (if supported)
+            # Free-text search on the TF-IDF index, optionally blended with a profile
             try:
-                # Try common signatures without breaking your engine API
-                if hasattr(recommendation_engine, "recommend"):
-                    try:
-                        recommendations = recommendation_engine.recommend(query=query, top_k=int(data.get("top_k", 5)))
-                    except TypeError:
-                        try:
-                            recommendations = recommendation_engine.recommend(query, int(data.get("top_k", 5)))
-                        except TypeError:
-                            recommendations = recommendation_engine.recommend(query)
-                else:
-                    # Fallback to your existing method using a synthesized profile
-                    user_profile = {
-                        "education": data.get("education", ""),
-                        "skills": data.get("skills", query.split()),
-                        "location_preference": data.get("location_preference", ""),
-                        "min_stipend": data.get("min_stipend", 0)
-                    }
-                    recommendations = recommendation_engine.get_recommendations(user_profile)
-            except Exception:
-                # Final fallback to your current profile-based API
-                user_profile = {
-                    "education": data.get("education", ""),
-                    "skills": data.get("skills", query.split()),
-                    "location_preference": data.get("location_preference", ""),
-                    "min_stipend": data.get("min_stipend", 0)
-                }
-                recommendations = recommendation_engine.get_recommendations(user_profile)
-        else:
-            # Structured profile path (your existing contract)
-            required_fields = ['education', 'skills', 'location_preference']
-            missing_fields = [f for f in required_fields if f not in data or not data[f]]
-            if missing_fields:
-                print(f"❌ Missing fields: {missing_fields}")
+                search_filters, search_profile = extract_search_request(data)
+                top_k = extract_top_k(data, 5)
+            except ValueError as e:
                 return jsonify({
                     'success': False,
-                    'message': f'Missing required fields: {", ".join(missing_fields)}',
+                    'message': str(e),
                     'timestamp': get_current_timestamp()
                 }), 400
 
-            if not isinstance(data['skills'], list) or len(data['skills']) == 0:
-                print("❌ No skills provided")
+            recommendations = cached_search(snapshot, query, top_k, search_filters, search_profile, refresh=profiling)
+        else:
+            # Structured profile path (your existing contract)
+            try:
+                user_profile = extract_user_profile(data)
+            except ValueError as e:
+                log.debug("❌ %s", e)
                 return jsonify({
                     'success': False,
-                    'message': 'At least one skill must be selected',
+                    'message': str(e),
                     'timestamp': get_current_timestamp()
                 }), 400
+            log.debug("🎯 User profile: %s", user_profile)
+            recommendations = cached_recommendations(snapshot, user_profile, refresh=profiling)
 
-            user_profile = {
-                'education': data['education'],
-                'skills': data['skills'],
-                'location_preference': data['location_preference'],
-                'min_stipend': data.get('min_stipend', 0)
-            }
-            print(f"🎯 User profile: {user_profile}")
-            print("🔍 Getting recommendations...")
-            recommendations = recommendation_engine.get_recommendations(user_profile)
-
-        print(f"✅ Generated {len(recommendations)} recommendations")
-        for i, rec in enumerate(recommendations[:3]):
-            title = rec.get('title', rec.get('internship_title', 'Unknown'))
-            company = rec.get('company', rec.get('company_name', 'Unknown'))
-            print(f"  {i+1}. {title} at {company}")
+        g.log_fields = {'results': len(recommendations), 'query': bool(query)}
+        if log.isEnabledFor(logging.DEBUG):
+            for i, rec in enumerate(recommendations[:3]):
+                title = rec.get('title', rec.get('internship_title', 'Unknown'))
+                company = rec.get('company', rec.get('company_name', 'Unknown'))
+                log.debug("  %d. %s at %s", i + 1, title, company)
 
-        return jsonify({
+        return timed_jsonify('search' if query else 'recommend', {
             'success': True,
             'recommendations': recommendations,
             'count': len(recommendations),
@@ -319,9 +642,84 @@ def get_recommendations():
 
     except Exception as e:
         error_msg = f"Error getting recommendations: {str(e)}"
-        print(f"❌ {error_msg}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ %s", error_msg)
+        return jsonify({
+            'success': False,
+            'message': error_msg,
+            'timestamp': get_current_timestamp()
+        }), 500
+
+
+# ---- Batch recommendations: many profiles in one request, scored as a matrix ----
+# Profiles accepted per batch request
+BATCH_MAX_PROFILES = int(os.environ.get('BATCH_MAX_PROFILES', 1000))
+
+
+@app.route('/api/recommendations/batch', methods=['POST'])
+def get_recommendations_batch():
+    """
+    Body: {"profiles": [profile, ...], "top_k": 10}; each profile is validated like
+    a structured /api/recommendations request. Results come back in request order,
+    an invalid profile gets its own error entry instead of failing the batch.
+    """
+    try:
+        snapshot = reloader.current()
+        data = request.get_json(silent=True) or {}
+        profiles = data.get('profiles')
+        if not isinstance(profiles, list) or not profiles:
+            return jsonify({
+                'success': False,
+                'message': 'profiles must be a non-empty list',
+                'timestamp': get_current_timestamp()
+            }), 400
+        if len(profiles) > BATCH_MAX_PROFILES:
+            return jsonify({
+                'success': False,
+                'message': f'At most {BATCH_MAX_PROFILES} profiles per request',
+                'timestamp': get_current_timestamp()
+            }), 400
+        try:
+            top_k = extract_top_k(data, 10)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'timestamp': get_current_timestamp()
+            }), 400
+
+        results = [None] * len(profiles)
+        valid_positions, user_profiles = [], []
+        for position, profile_data in enumerate(profiles):
+            try:
+                if not isinstance(profile_data, dict):
+                    raise ValueError('profile must be an object')
+                user_profile = extract_user_profile(profile_data)
+                try:
+                    user_profile['min_stipend'] = float(user_profile['min_stipend'] or 0)
+                except (TypeError, ValueError):
+                    raise ValueError('min_stipend must be a number')
+                user_profiles.append(user_profile)
+                valid_positions.append(position)
+            except ValueError as e:
+                results[position] = {'success': False, 'message': str(e)}
+
+        computed, num_scored = cached_batch_recommendations(snapshot, user_profiles, top_k) if user_profiles else ([], 0)
+        for position, recommendations in zip(valid_positions, computed):
+            results[position] = {'success': True, 'recommendations': recommendations, 'count': len(recommendations)}
+        g.log_fields = {'profiles': len(profiles), 'valid': len(user_profiles), 'scored': num_scored, 'top_k': top_k,
+                        'empty': sum(1 for recommendations in computed if not recommendations)}
+
+        return timed_jsonify('batch', {
+            'success': True,
+            'results': results,
+            'count': len(results),
+            'timestamp': get_current_timestamp(),
+            'processed_by': 'Om Raj Singh'
+        })
+
+    except Exception as e:
+        error_msg = f"Error getting batch recommendations: {str(e)}"
+        log.exception("❌ %s", error_msg)
         return jsonify({
             'success': False,
             'message': error_msg,
@@ -329,11 +727,47 @@ def get_recommendations():
         }), 500
 
 
+# ---- Dataset statistics: aggregated once per dataset version, revalidated by ETag ----
+@app.route('/api/stats', methods=['GET'])
+def dataset_stats():
+    """Stats with an ETag of the dataset version; a matching If-None-Match gets an empty 304"""
+    try:
+        snapshot = reloader.current()
+        with snapshot.lock.read():
+            version = snapshot.version
+            etag = f'stats-{version}'
+            if etag in request.if_none_match:
+                stats = None
+            else:
+                stats = snapshot.processor.get_stats()
+
+        if stats is None:
+            response = app.response_class(status=304)
+        else:
+            response = jsonify({
+                'success': True,
+                'stats': stats,
+                'dataset_version': version
+            })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    except Exception as e:
+        log.exception("❌ Error in stats endpoint: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'timestamp': get_current_timestamp()
+        }), 500
+
+
 # ---- Fixed /test route (no get_data() call) ----
 @app.route("/test", methods=["GET"])
 def test_endpoint():
     """Return a tiny sample without assuming get_data() exists."""
     try:
+        data_processor = reloader.current().processor
         if hasattr(data_processor, "df"):
             df = data_processor.df
         elif hasattr(data_processor, "data"):
@@ -348,6 +782,127 @@ def test_endpoint():
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
+# ---- Admin: dataset reload ----
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Rebuild the dataset in the background (or synchronously with ?wait=1) and swap it in; under serve.py the arbiter does it"""
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden', 'timestamp': get_current_timestamp()}), 403
+
+    if ARBITER_PID is not None:
+        # serve.py: the arbiter reloads once and replaces the workers, so they all serve the new data
+        os.kill(ARBITER_PID, signal.SIGUSR1)
+        return jsonify({
+            'success': True,
+            'message': 'Reload requested; workers are replaced one at a time',
+            'dataset': reloader.status(),
+            'timestamp': get_current_timestamp()
+        }), 202
+
+    if request.args.get('wait') in ('1', 'true'):
+        reloaded = reloader.reload()
+        status_code = 200 if reloaded else 409 if reloader.reloading else 500
+    else:
+        reloaded = reloader.request_reload()
+        status_code = 202 if reloaded else 409
+
+    return jsonify({
+        'success': reloaded,
+        'dataset': reloader.status(),
+        'timestamp': get_current_timestamp()
+    }), status_code
+
+
+# ---- Single listings: read, and admin-only add / update / delete without a rebuild ----
+@app.route('/api/internships/<int:internship_id>', methods=['GET'])
+def get_internship(internship_id):
+    snapshot = reloader.current()
+    with snapshot.lock.read():
+        internship = snapshot.processor.get_internship_by_id(internship_id)
+    if internship is None:
+        return jsonify({'success': False, 'error': f'Internship {internship_id} not found',
+                        'timestamp': get_current_timestamp()}), 404
+    return jsonify({'success': True, 'internship': internship, 'timestamp': get_current_timestamp()})
+
+
+@app.route('/api/internships/<int:internship_id>/similar', methods=['GET'])
+def similar_internships(internship_id):
+    """Listings most similar to one listing (?count=5, at most NEIGHBOUR_COUNT), from the neighbour table"""
+    from neighbours import NEIGHBOUR_COUNT
+
+    try:
+        count = int(request.args.get('count', 5))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'count must be an integer',
+                        'timestamp': get_current_timestamp()}), 400
+    count = max(1, min(count, NEIGHBOUR_COUNT))
+
+    snapshot = reloader.current()
+    with snapshot.lock.read():
+        if snapshot.processor.index.row_of(internship_id) is None:
+            similar = None
+        else:
+            similar = snapshot.engine.get_similar_internships(internship_id, count)
+    if similar is None:
+        return jsonify({'success': False, 'error': f'Internship {internship_id} not found',
+                        'timestamp': get_current_timestamp()}), 404
+    g.log_fields = {'results': len(similar)}
+    return timed_jsonify('similar', {
+        'success': True,
+        'internship_id': internship_id,
+        'similar': similar,
+        'count': len(similar),
+        'timestamp': get_current_timestamp()
+    })
+
+
+@app.route('/api/internships', methods=['POST'])
+@app.route('/api/internships/<int:internship_id>', methods=['PUT', 'PATCH', 'DELETE'])
+def edit_internship(internship_id=None):
+    """
+    Body fields use the CSV column names (internship_title, company_name, location,
+    start_date, duration, stipend) or the record names (title, company, raw_stipend, ...).
+    POST needs all of them; PUT/PATCH change only the fields given.
+    """
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden', 'timestamp': get_current_timestamp()}), 403
+    if SERVE_WORKERS > 1:
+        # The edit would only reach the worker that received it
+        return jsonify({'success': False,
+                        'error': 'Single-listing edits need serve.py --workers 1; edit the CSV and reload instead',
+                        'timestamp': get_current_timestamp()}), 409
+
+    fields = request.get_json(silent=True)
+    fields = {} if fields is None else fields
+    if not isinstance(fields, dict):
+        return jsonify({'success': False, 'error': 'Request body must be a JSON object of listing fields',
+                        'timestamp': get_current_timestamp()}), 400
+
+    snapshot = reloader.current()
+    try:
+        with snapshot.lock.write():
+            if request.method == 'POST':
+                internship = snapshot.engine.add_internship(fields)
+            elif request.method == 'DELETE':
+                internship = {'id': internship_id} if snapshot.engine.remove_internship(internship_id) else None
+            else:
+                internship = snapshot.engine.update_internship(internship_id, fields)
+            version = snapshot.version
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e), 'timestamp': get_current_timestamp()}), 400
+
+    if internship is None:
+        return jsonify({'success': False, 'error': f'Internship {internship_id} not found',
+                        'timestamp': get_current_timestamp()}), 404
+    log.info("✏️ %s internship %s -> dataset version %s", request.method, internship['id'], version)
+    return jsonify({
+        'success': True,
+        'internship': internship,
+        'dataset_version': version,
+        'timestamp': get_current_timestamp()
+    }), 201 if request.method == 'POST' else 200
+
+
 # ---- Small niceties ----
 @app.errorhandler(405)
 def method_not_allowed(e):
@@ -358,6 +913,35 @@ def method_not_allowed(e):
     }), 405
 
 
+@app.route('/admin/profiles', methods=['GET'])
+def request_profiles():
+    """Saved request profiles (captured with X-Profile: 1 or ?profile=1), newest first"""
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden', 'timestamp': get_current_timestamp()}), 403
+    return jsonify({'success': True, 'profiles': list_profiles(), 'timestamp': get_current_timestamp()})
+
+
+@app.route('/admin/profiles/<profile_id>', methods=['GET'])
+def request_profile(profile_id):
+    """A saved profile's text report, or the raw pstats dump with ?format=prof"""
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden', 'timestamp': get_current_timestamp()}), 403
+    kind = request.args.get('format', 'txt')
+    path = profile_path(profile_id, kind)
+    if path is None:
+        return jsonify({'success': False, 'error': f'Profile {profile_id} not found',
+                        'timestamp': get_current_timestamp()}), 404
+    if kind == 'prof':
+        return send_file(path, mimetype='application/octet-stream', as_attachment=True)
+    return send_file(path, mimetype='text/plain')
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text format: request and engine-stage latency, counters, catalog and cache state (this process)"""
+    return app.response_class(registry.render(), mimetype=None, content_type=CONTENT_TYPE)
+
+
 @app.route("/favicon.ico")
 def favicon():
     # Quiet the dev 404 spam
@@ -365,6 +949,13 @@ def favicon():
 
 
 if __name__ == '__main__':
+    print("Starting Flask application...")
+    try:
+        init_engine()
+    except RuntimeError:
+        sys.exit(1)
+    start_background_tasks()
+
     print("\n🚀 Starting Flask development server...")
     print("📍 Server will be available at: http://localhost:5000")
     print("📍 Health check: http://localhost:5000/health")
@@ -373,6 +964,7 @@ if __name__ == '__main__':
     print("📍 Recommendations API: http://localhost:5000/api/recommendations")
     print(f"📍 User: Om Raj Singh")
     print(f"📍 Date: {get_current_timestamp()}")
+    print("📍 Production: python serve.py --workers 4 --preload")
     print("\n" + "="*50)
     try:
         app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,141 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+# Parent of every logger from get_logger(); only this tree is configured
+LOGGER_NAMESPACE = 'internships'
+
+# Minimum level written: DEBUG shows request bodies, profiles and per-stage counts
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+
+# 'json' (one object per line) or 'text'
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json').lower()
+
+# Fraction of request records kept per route ("rule=rate,..."); unlisted routes keep all, errors are never dropped
+LOG_SAMPLE_RATES = os.environ.get('LOG_SAMPLE_RATES', '/health=0.05,/favicon.ico=0')
+
+# Records waiting for the writer thread; when full, new records are dropped rather than blocking a request
+LOG_QUEUE_SIZE = 10000
+
+# Record attributes that are not structured fields
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a module, under the configured namespace"""
+    return logging.getLogger(f'{LOGGER_NAMESPACE}.{name}')
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg and any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+            'level': record.levelname,
+            'logger': record.name[len(LOGGER_NAMESPACE) + 1:] or record.name,
+            'msg': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _STANDARD_ATTRIBUTES)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """The console style of the print() calls this replaces, with extra= fields appended"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = record.getMessage()
+        fields = {key: value for key, value in vars(record).items() if key not in _STANDARD_ATTRIBUTES}
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        return line
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller: records are dropped (and counted) when the queue is full"""
+
+    dropped = 0
+
+    # prepare() (inherited) merges the args and traceback into the message on the calling
+    # thread, since args may change after the call; the writer thread does the formatting
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+_listener = None
+_handler = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level: Optional[str] = None, log_format: Optional[str] = None) -> None:
+    """
+    Route the namespace's records through a queue to a background writer
+    thread, so a request only pays for building the record. Idempotent;
+    forked children get their own writer thread.
+    """
+    global _listener, _handler
+    with _setup_lock:
+        if _listener is not None:
+            return
+        logger = logging.getLogger(LOGGER_NAMESPACE)
+        logger.setLevel(level or LOG_LEVEL)
+        logger.propagate = False
+
+        writer = logging.StreamHandler(sys.stdout)
+        writer.setFormatter(JsonFormatter() if (log_format or LOG_FORMAT) == 'json' else TextFormatter())
+        _handler = _DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        logger.addHandler(_handler)
+        _listener = logging.handlers.QueueListener(_handler.queue, writer)
+        _listener.start()
+        atexit.register(_stop)
+
+
+def _stop() -> None:
+    """Flush what is queued (at exit)"""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def _restart_after_fork() -> None:
+    # The writer thread doesn't exist in a forked child: start a new one on a fresh queue
+    global _listener
+    if _listener is None:
+        return
+    _handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = logging.handlers.QueueListener(_handler.queue, *_listener.handlers)
+    _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+class RouteSampler:
+    """Keeps a configurable fraction of request records per route"""
+
+    def __init__(self, spec: str = LOG_SAMPLE_RATES):
+        self.rates = {}
+        for item in filter(None, (part.strip() for part in spec.split(','))):
+            route, _, rate = item.rpartition('=')
+            try:
+                self.rates[route] = min(1.0, max(0.0, float(rate)))
+            except ValueError:
+                get_logger('logging').warning("Ignoring bad LOG_SAMPLE_RATES entry %r", item)
+
+    def keep(self, route: str) -> bool:
+        rate = self.rates.get(route, 1.0)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
@@ -0,0 +1,339 @@
+"""
+ASGI front for the Flask API in app.py: same routes, same payloads.
+
+    python asgi.py --bind 0.0.0.0:8000          # built-in asyncio HTTP/1.1 server
+    uvicorn asgi:application --port 8000       # or any ASGI server, if installed
+
+Every request still runs through the Flask app, but never on the event loop:
+health checks, usage pages, stats and result-cache hits go to a small "fast
+lane" thread pool, and everything that may score the catalog goes to a
+bounded scoring pool. A burst of slow full-catalog scans therefore only
+queues behind itself, while the loop keeps accepting connections and the
+fast lane keeps answering /health and cached recommendations.
+
+Threads rather than processes: the engine, its result cache and in-place
+listing edits live in one process, and the numpy/scipy kernels that do the
+scoring release the GIL for most of their work.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+from urllib.parse import unquote
+
+import app as flask_app_module
+from app_logging import get_logger
+
+# Threads that run engine calls (scoring, search, batch, edits); more requests wait their turn
+SCORING_THREADS = int(os.environ.get('ASGI_SCORING_THREADS', os.cpu_count() or 4))
+
+# Threads for cheap requests, so they never queue behind scoring
+FAST_THREADS = int(os.environ.get('ASGI_FAST_THREADS', 2))
+
+# Requests answered without touching the scorer
+FAST_ROUTES = [
+    ('GET', re.compile(r'^/$')),
+    ('GET', re.compile(r'^/health$')),
+    ('GET', re.compile(r'^/test$')),
+    ('GET', re.compile(r'^/favicon\.ico$')),
+    ('GET', re.compile(r'^/api/stats$')),
+    ('GET', re.compile(r'^/metrics$')),
+    ('GET', re.compile(r'^/api/recommendations$')),
+    ('GET', re.compile(r'^/api/internships/\d+$')),
+]
+
+# Largest POST /api/recommendations body parsed on the loop to look for a cached result
+CACHE_PROBE_MAX_BYTES = 64 * 1024
+
+log = get_logger('asgi')
+
+
+def is_fast_request(method: str, path: str, body: bytes) -> bool:
+    """True for requests that can't trigger scoring: cheap routes, CORS preflights and result-cache hits"""
+    if method in ('OPTIONS', 'HEAD'):
+        return True
+    if any(method == route_method and pattern.match(path) for route_method, pattern in FAST_ROUTES):
+        return True
+    if method == 'POST' and path == '/api/recommendations' and len(body) <= CACHE_PROBE_MAX_BYTES:
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            return False
+        # A hit can still expire before the handler runs; it is then simply scored on the fast lane
+        return flask_app_module.is_cached_recommendation(data or {})
+    return False
+
+
+def build_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """WSGI environ for an ASGI http scope (PEP 3333 str-of-bytes encoding)"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]) if server[1] is not None else '80',
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': str(client[0]),
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name == 'CONTENT_LENGTH':
+            environ['CONTENT_LENGTH'] = value
+        else:
+            key = f'HTTP_{name}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+def call_wsgi(wsgi_app, environ: Dict[str, Any]) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    """Run one request through a WSGI app; returns (status, headers, body)"""
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+        return lambda data: chunks.append(data)
+
+    chunks = []
+    result = wsgi_app(environ, start_response)
+    try:
+        chunks.extend(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return response['status'], response['headers'], b''.join(chunks)
+
+
+class AsgiApp:
+    """ASGI 3 application dispatching to a WSGI app on the fast lane or the scoring pool"""
+
+    def __init__(self, wsgi_app, scoring_threads: int = SCORING_THREADS, fast_threads: int = FAST_THREADS):
+        self.wsgi_app = wsgi_app
+        self.scoring_pool = ThreadPoolExecutor(max_workers=scoring_threads, thread_name_prefix='scoring')
+        self.fast_pool = ThreadPoolExecutor(max_workers=fast_threads, thread_name_prefix='fast')
+        self._ready = None
+
+    async def startup(self) -> None:
+        """Load the dataset once, off the event loop; later callers wait for the first load"""
+        if self._ready is None:
+            self._ready = asyncio.ensure_future(asyncio.get_running_loop().run_in_executor(self.fast_pool, self._init))
+        await asyncio.shield(self._ready)
+
+    @staticmethod
+    def _init() -> None:
+        flask_app_module.init_engine()
+        flask_app_module.start_background_tasks()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"unsupported ASGI scope type {scope['type']}")
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.startup()
+                except Exception as e:
+                    log.exception("❌ Startup failed: %s", e)
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.scoring_pool.shutdown(wait=False)
+                self.fast_pool.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send) -> None:
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body.extend(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        body = bytes(body)
+
+        # Servers without lifespan support: the first request loads the dataset
+        await self.startup()
+
+        pool = self.fast_pool if is_fast_request(scope['method'], scope['path'], body) else self.scoring_pool
+        environ = build_environ(scope, body)
+        status, headers, content = await asyncio.get_running_loop().run_in_executor(
+            pool, call_wsgi, self.wsgi_app, environ)
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': content if scope['method'] != 'HEAD' else b''})
+
+
+application = AsgiApp(flask_app_module.app)
+
+
+# ---- Minimal HTTP/1.1 server, so the ASGI app runs without extra packages ----
+REASONS = {200: 'OK', 201: 'Created', 202: 'Accepted', 204: 'No Content', 304: 'Not Modified',
+           400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found', 405: 'Method Not Allowed',
+           409: 'Conflict', 411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# Largest request head / body the built-in server accepts
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = int(os.environ.get('ASGI_MAX_BODY_BYTES', 16 * 1024 * 1024))
+
+
+async def _write_response(writer, status: int, headers: List[Tuple[bytes, bytes]], body: bytes,
+                          keep_alive: bool, head: bool = False) -> None:
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}".encode('latin-1')]
+    # A HEAD response keeps the length of the GET body it stands for
+    lines.extend(name + b': ' + value for name, value in headers
+                 if name not in (b'connection', b'transfer-encoding') and (head or name != b'content-length'))
+    if status not in (204, 304) and not head:
+        lines.append(b'content-length: ' + str(len(body)).encode())
+    lines.append(b'connection: ' + (b'keep-alive' if keep_alive else b'close'))
+    writer.write(b'\r\n'.join(lines) + b'\r\n\r\n' + (body if status not in (204, 304) else b''))
+    await writer.drain()
+
+
+async def _handle_connection(asgi_app, reader, writer) -> None:
+    server = writer.get_extra_info('sockname')[:2]
+    client = writer.get_extra_info('peername')[:2]
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except asyncio.LimitOverrunError:
+                await _write_response(writer, 413, [], b'', False)
+                return
+            request_line, *header_lines = head[:-4].decode('latin-1').split('\r\n')
+            try:
+                method, target, version = request_line.split(' ')
+            except ValueError:
+                await _write_response(writer, 400, [], b'', False)
+                return
+            headers = []
+            for line in header_lines:
+                name, _, value = line.partition(':')
+                headers.append((name.strip().lower().encode('latin-1'), value.strip().encode('latin-1')))
+            header_map = dict(headers)
+
+            if b'chunked' in header_map.get(b'transfer-encoding', b'').lower():
+                await _write_response(writer, 411, [], b'', False)
+                return
+            length = int(header_map.get(b'content-length', b'0') or 0)
+            if length > MAX_BODY_BYTES:
+                await _write_response(writer, 413, [], b'', False)
+                return
+            body = await reader.readexactly(length) if length else b''
+
+            connection = header_map.get(b'connection', b'').lower()
+            keep_alive = connection != b'close' if version == 'HTTP/1.1' else connection == b'keep-alive'
+            path, _, query = target.partition('?')
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0', 'spec_version': '2.3'},
+                'http_version': version.split('/', 1)[-1],
+                'method': method.upper(),
+                'scheme': 'http',
+                'path': unquote(path),
+                'raw_path': path.encode('latin-1'),
+                'query_string': query.encode('latin-1'),
+                'root_path': '',
+                'headers': headers,
+                'server': server,
+                'client': client,
+            }
+
+            response = {}
+            pending = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+            async def receive():
+                if pending:
+                    return pending.pop()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    response['status'] = message['status']
+                    response['headers'] = list(message.get('headers', []))
+                    response['body'] = bytearray()
+                elif message['type'] == 'http.response.body':
+                    response['body'].extend(message.get('body', b''))
+
+            try:
+                await asgi_app(scope, receive, send)
+            except Exception as e:
+                log.exception("❌ Error handling %s %s: %s", method, target, e)
+                await _write_response(writer, 500, [], b'', False)
+                return
+            await _write_response(writer, response['status'], response['headers'], bytes(response['body']),
+                                  keep_alive, head=method.upper() == 'HEAD')
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+
+async def serve(asgi_app, host: str, port: int) -> None:
+    """Run asgi_app on host:port until cancelled, with lifespan startup first"""
+    lifespan_messages = asyncio.Queue()
+    await lifespan_messages.put({'type': 'lifespan.startup'})
+    started = asyncio.get_running_loop().create_future()
+
+    async def send(message):
+        if not started.done():
+            started.set_result(message)
+
+    lifespan = asyncio.create_task(asgi_app({'type': 'lifespan', 'asgi': {'version': '3.0'}},
+                                            lifespan_messages.get, send))
+    result = await started
+    if result['type'] == 'lifespan.startup.failed':
+        raise RuntimeError(result.get('message', 'startup failed'))
+
+    server = await asyncio.start_server(lambda r, w: _handle_connection(asgi_app, r, w), host, port,
+                                        limit=MAX_HEADER_BYTES, backlog=2048)
+    print(f"🚀 ASGI server on http://{host}:{port} ({SCORING_THREADS} scoring threads, "
+          f"{FAST_THREADS} fast-lane threads)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await lifespan_messages.put({'type': 'lifespan.shutdown'})
+        await asyncio.wait_for(lifespan, timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve the internship API as an ASGI app')
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:8000'), help='host:port (default 0.0.0.0:8000)')
+    args = parser.parse_args()
+    host, _, port = args.bind.rpartition(':')
+    flask_app_module.SERVER_LABEL = 'ASGI (asgi.py)'
+    try:
+        asyncio.run(serve(application, host or '0.0.0.0', int(port)))
+    except KeyboardInterrupt:
+        print("🛑 Stopped")
+    except RuntimeError:
+        sys.exit(1)
@@ -0,0 +1,242 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from synthetic_catalog import ensure_catalog, parse_size
+
+# Catalog sizes run when none are given
+DEFAULT_SIZES = [10_000, 100_000]
+
+# Timed runs per benchmark; whole-catalog benchmarks (load, engine build, trending, cold stats) run at most
+# WHOLE_CATALOG_REPEAT times, since one run at 10M rows takes minutes
+DEFAULT_REPEAT = 5
+WHOLE_CATALOG_REPEAT = 3
+
+# One JSON file of results per commit
+RESULTS_DIR = os.path.join('..', 'benchmarks')
+
+# A benchmark regressed when its best time grew by more than this fraction and by more than REGRESSION_MIN_MS
+REGRESSION_THRESHOLD = 0.10
+REGRESSION_MIN_MS = 0.05
+
+# Profiles get_recommendations is timed over: broad, one city, remote, range filters, many skills
+BENCH_PROFILES = [
+    {'education': 'B.Tech Computer Science', 'skills': ['python', 'machine learning'], 'location_preference': 'Any',
+     'min_stipend': 0},
+    {'education': 'B.Com', 'skills': ['excel', 'accounting'], 'location_preference': 'Mumbai', 'min_stipend': 10000},
+    {'education': 'B.Des', 'skills': ['figma', 'photoshop'], 'location_preference': 'Remote', 'min_stipend': 0},
+    {'education': 'B.Tech Mechanical', 'skills': ['autocad', 'solidworks'], 'location_preference': 'Pune',
+     'min_stipend': 5000, 'max_stipend': 30000, 'min_duration': 3, 'max_duration': 6},
+    {'education': 'MBA', 'skills': ['marketing', 'sales', 'communication', 'excel', 'sql', 'python', 'tableau'],
+     'location_preference': 'Bangalore', 'min_stipend': 15000, 'start_after': '2025-01-01'},
+]
+
+# Listings get_similar_internships is timed for, spread over the catalog
+SIMILAR_SAMPLE = 20
+
+
+def time_calls(function: Callable[[Any], Any], inputs, repeat: int) -> Dict[str, Any]:
+    """
+    Milliseconds per call of function over inputs: best and median of
+    repeat runs, after one warm-up run. inputs is a list, or a function
+    of the run number (0 is the warm-up) when each run needs its own.
+    """
+    runs = []
+    for run in range(repeat + 1):
+        values = inputs(run) if callable(inputs) else inputs
+        started = time.perf_counter()
+        for value in values:
+            function(value)
+        if run:
+            runs.append((time.perf_counter() - started) * 1000 / len(values))
+    return {'min_ms': round(min(runs), 4), 'median_ms': round(statistics.median(runs), 4), 'runs': len(runs)}
+
+
+def time_once_each(function: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Like time_calls for an expensive call with no warm-up; returns the last call's result too"""
+    runs = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        runs.append((time.perf_counter() - started) * 1000)
+    return {'min_ms': round(min(runs), 4), 'median_ms': round(statistics.median(runs), 4), 'runs': len(runs),
+            'result': result}
+
+
+def run_size(rows: int, seed: int, repeat: int, only: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Benchmarks of one catalog size: {name: timings}"""
+    from data_processor import DataProcessor
+    from dataset_stats import DatasetStats
+    from recommendation_engine import RecommendationEngine
+
+    path = ensure_catalog(rows, seed)
+    whole_repeat = min(repeat, WHOLE_CATALOG_REPEAT)
+    results = {}
+
+    def wanted(name):
+        return not only or name in only
+
+    def quietly(function):
+        # The processor and engine report progress with print()
+        def call():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return function()
+        return call
+
+    timing = time_once_each(quietly(lambda: DataProcessor(path, snapshot_path=None)), whole_repeat)
+    processor = timing.pop('result')
+    if wanted('load_data'):
+        results['load_data'] = timing
+    timing = time_once_each(quietly(lambda: RecommendationEngine(processor)), whole_repeat)
+    engine = timing.pop('result')
+    if wanted('build_engine'):
+        results['build_engine'] = timing
+
+    if wanted('get_recommendations'):
+        results['get_recommendations'] = time_calls(engine.get_recommendations, BENCH_PROFILES, repeat)
+    if wanted('get_similar_internships'):
+        # Lookups without the precomputed table are memoized, so every run asks about other listings
+        ids = processor.processed_data.ids
+        spread = np.linspace(0, len(ids) - 1, SIMILAR_SAMPLE).astype(np.int64)
+        results['get_similar_internships'] = time_calls(
+            engine.get_similar_internships, lambda run: ids[(spread + run) % len(ids)].tolist(), repeat)
+    if wanted('get_trending_internships'):
+        timing = time_once_each(engine.get_trending_internships, whole_repeat)
+        timing.pop('result')
+        results['get_trending_internships'] = timing
+    if wanted('get_stats'):
+        results['get_stats'] = time_calls(lambda _: processor.get_stats(), [None], repeat)
+    if wanted('get_stats_cold'):
+        timing = time_once_each(lambda: DatasetStats(processor.processed_data, processor.index).summary(),
+                                whole_repeat)
+        timing.pop('result')
+        results['get_stats_cold'] = timing
+    return results
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def current_commit() -> Dict[str, Any]:
+    commit = _git('rev-parse', '--short=12', 'HEAD') or 'unknown'
+    dirty = bool(_git('status', '--porcelain', '--untracked-files=no'))
+    return {'commit': commit, 'dirty': dirty, 'subject': _git('log', '-1', '--format=%s') or ''}
+
+
+def results_path(commit: str, dirty: bool = False, directory: str = RESULTS_DIR) -> str:
+    return os.path.join(directory, f"{commit}{'-dirty' if dirty else ''}.json")
+
+
+def save_results(sizes: Dict[str, Dict[str, Any]], seed: int, repeat: int, directory: str = RESULTS_DIR) -> str:
+    """Merge these results into the current commit's results file; returns its path"""
+    head = current_commit()
+    path = results_path(head['commit'], head['dirty'], directory)
+    record = {'sizes': {}}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            record = json.load(f)
+    record.update(head)
+    record.update({
+        'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'seed': seed,
+        'repeat': repeat,
+        'machine': {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+                    'cpus': os.cpu_count(), 'platform': platform.platform()},
+    })
+    for size, benchmarks in sizes.items():
+        record['sizes'].setdefault(size, {}).update(benchmarks)
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, indent=2, sort_keys=True)
+    return path
+
+
+def baseline_path(ref: Optional[str] = None, directory: str = RESULTS_DIR) -> Optional[str]:
+    """Results of ref; by default of the nearest commit with results before this one (HEAD itself when dirty)"""
+    if ref:
+        commit = _git('rev-parse', '--short=12', ref)
+        path = results_path(commit, directory=directory) if commit else None
+        return path if path and os.path.exists(path) else None
+    start = 'HEAD' if current_commit()['dirty'] else 'HEAD~1'
+    for commit in (_git('rev-list', '--max-count=200', '--abbrev-commit', '--abbrev=12', start) or '').split():
+        path = results_path(commit, directory=directory)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Print current vs baseline best times; returns the regressed 'size/benchmark' names"""
+    regressions = []
+    print(f"\n{'size':>10}  {'benchmark':<26}{'baseline ms':>14}{'now ms':>12}{'change':>10}")
+    for size, benchmarks in current.items():
+        for name, timing in benchmarks.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None:
+                print(f"{size:>10}  {name:<26}{'-':>14}{timing['min_ms']:>12.3f}{'new':>10}")
+                continue
+            change = (timing['min_ms'] - before['min_ms']) / before['min_ms'] if before['min_ms'] else 0.0
+            regressed = change > REGRESSION_THRESHOLD and timing['min_ms'] - before['min_ms'] > REGRESSION_MIN_MS
+            if regressed:
+                regressions.append(f'{size}/{name}')
+            print(f"{size:>10}  {name:<26}{before['min_ms']:>14.3f}{timing['min_ms']:>12.3f}{change:>+10.1%}"
+                  f"{'  ❌' if regressed else ''}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time the data processor and engine on synthetic catalogs')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='comma-separated catalog sizes (e.g. 10k,100k,1M,10M)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', help='comma-separated benchmark names')
+    parser.add_argument('--compare', nargs='?', const='', metavar='REF',
+                        help='compare with the results of REF (default: nearest earlier commit with results)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit 1 when --compare finds a regression')
+    parser.add_argument('--no-save', action='store_true', help="don't store the results")
+    args = parser.parse_args()
+
+    only = args.only.split(',') if args.only else None
+    sizes = {}
+    for rows in (parse_size(size) for size in args.sizes.split(',')):
+        print(f"\n⏱️ {rows:,} listings")
+        sizes[str(rows)] = run_size(rows, args.seed, max(1, args.repeat), only)
+        for name, timing in sizes[str(rows)].items():
+            print(f"  {name:<26} best {timing['min_ms']:>10.3f} ms   median {timing['median_ms']:>10.3f} ms")
+
+    if not args.no_save:
+        print(f"\n✅ Results saved to {save_results(sizes, args.seed, args.repeat)}")
+
+    if args.compare is not None:
+        path = baseline_path(args.compare or None)
+        if path is None:
+            print("⚠️ No baseline results found to compare with")
+        else:
+            with open(path, encoding='utf-8') as f:
+                baseline = json.load(f)
+            print(f"\n📊 Compared with {baseline['commit']} ({baseline.get('subject', '')})")
+            regressions = compare(sizes, baseline['sizes'])
+            if regressions:
+                print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+                if args.fail_on_regression:
+                    sys.exit(1)
+            else:
+                print("\n✅ No regressions")
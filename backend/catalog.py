@@ -0,0 +1,405 @@
+import numpy as np
+import pandas as pd
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional
+
+# Field order of the dict records handed out by the catalog (matches the API responses)
+RECORD_FIELDS = [
+    'id', 'title', 'company', 'location', 'start_date', 'duration', 'raw_stipend',
+    'stipend_amount', 'is_paid', 'skills', 'domain', 'work_mode', 'duration_months'
+]
+
+# String fields stored as integer codes into a list of distinct values
+CATEGORICAL_FIELDS = ['title', 'company', 'location', 'start_date', 'duration', 'raw_stipend', 'domain', 'work_mode']
+
+INT64_MAX = np.iinfo(np.int64).max
+
+# Sentinel for start dates that could not be parsed ("Not specified", typos, ...)
+MISSING_DAY = np.iinfo(np.int64).min
+
+START_DATE_FORMATS = ['%d-%b-%Y', '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d %b %Y', '%d %B %Y', "%d %b' %y"]
+IMMEDIATE_START_MARKERS = ['immediately', 'immediate', 'asap']
+
+
+def parse_start_date(value: str, today: Optional[date] = None) -> Optional[date]:
+    """Parse a listing start date ('01-Dec-2024', '2025-01-15', 'Immediately', ...)"""
+    text = str(value).strip()
+    if text.lower() in IMMEDIATE_START_MARKERS:
+        return today or date.today()
+    for date_format in START_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def date_to_day(value: date) -> int:
+    """Date as an integer day number (proleptic Gregorian ordinal)"""
+    return value.toordinal()
+
+
+def grow_buffer(buffer: np.ndarray, size: int) -> np.ndarray:
+    """buffer itself when it holds at least size entries, else a copy with doubled capacity"""
+    if len(buffer) >= size and buffer.flags.writeable:
+        return buffer
+    grown = np.zeros((max(size, 2 * len(buffer), 16),) + buffer.shape[1:], dtype=buffer.dtype)
+    grown[:len(buffer)] = buffer
+    return grown
+
+
+def _as_int64(values) -> np.ndarray:
+    """Convert to int64, clamping the odd absurd stipend that does not fit"""
+    try:
+        return np.asarray(values, dtype=np.int64)
+    except OverflowError:
+        return np.asarray([min(int(value), INT64_MAX) for value in values], dtype=np.int64)
+
+
+class CategoricalColumn:
+    """
+    Integer-coded string column: row i holds categories[codes[i]].
+
+    Rows can be appended and overwritten; unseen values are appended to
+    categories, so existing codes never change.
+    """
+
+    def __init__(self, codes, categories: List[str]):
+        self._codes = np.asarray(codes, dtype=np.int32)
+        self._size = len(self._codes)
+        self.categories = list(categories)
+        self._lookup = None
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._codes[:self._size]
+
+    @classmethod
+    def from_values(cls, values) -> 'CategoricalColumn':
+        """Build from one string per row (categories in first-occurrence order)"""
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+        return cls(codes, [str(value) for value in uniques])
+
+    @classmethod
+    def from_codes(cls, codes, values) -> 'CategoricalColumn':
+        """Build from existing codes where values[code] is the string; equal values are merged"""
+        remap, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+        return cls(remap[np.asarray(codes)], [str(value) for value in uniques])
+
+    def code_of(self, value: str) -> Optional[int]:
+        """Code of an exact category value, or None when absent"""
+        if self._lookup is None:
+            self._lookup = {category: code for code, category in enumerate(self.categories)}
+        return self._lookup.get(value)
+
+    def encode(self, value: str) -> int:
+        """Code of value, adding it as a new category when absent"""
+        code = self.code_of(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self._lookup[value] = code
+        return code
+
+    def append(self, value: str) -> None:
+        self._codes = grow_buffer(self._codes, self._size + 1)
+        self._codes[self._size] = self.encode(value)
+        self._size += 1
+
+    def set(self, row: int, value: str) -> None:
+        self._codes = grow_buffer(self._codes, self._size)
+        self._codes[row] = self.encode(value)
+
+    def __getitem__(self, row: int) -> str:
+        return self.categories[self._codes[row]]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class InternshipCatalog(Sequence):
+    """
+    Struct-of-arrays internship store.
+
+    Numeric fields are NumPy arrays, string fields are CategoricalColumns and
+    skills are (skill_start, skill_len) segments of skill_ids into skill_vocab.
+    Indexing or iterating yields the same dict records the list-of-dicts
+    catalog used to hold; records are built lazily on every access.
+
+    Rows can be appended, overwritten and deleted in place (append/update/
+    delete). Columns keep spare capacity so an append is amortized O(1), an
+    update writes a fresh skill segment, and a delete only clears the row's
+    alive flag: row positions never move, so indexes stay valid. Every
+    change bumps revision. len() and iteration cover live rows only.
+    """
+
+    def __init__(self, ids, categoricals: Dict[str, CategoricalColumn], stipend_amount, duration_months,
+                 is_paid, skill_indptr, skill_ids, skill_vocab: List[str], skill_segments=None):
+        self._ids = np.asarray(ids, dtype=np.int64)
+        for field in CATEGORICAL_FIELDS:
+            setattr(self, field, categoricals[field])
+        self._stipend_amount = _as_int64(stipend_amount)
+        self._duration_months = _as_int64(duration_months)
+        self._is_paid = np.asarray(is_paid, dtype=bool)
+        self._alive = np.ones(len(self._ids), dtype=bool)
+        if skill_segments is not None:
+            # (skill_start, skill_len) used as given, e.g. memory-mapped from a snapshot
+            self._skill_start, self._skill_len = skill_segments
+        else:
+            skill_indptr = np.asarray(skill_indptr, dtype=np.int64)
+            self._skill_start = skill_indptr[:-1].copy()
+            self._skill_len = np.diff(skill_indptr)
+        self._skill_ids = np.asarray(skill_ids, dtype=np.int32)
+        self._skill_used = len(self._skill_ids)
+        self.skill_vocab = list(skill_vocab)
+        self._skill_lookup = None
+        self._size = len(self._ids)
+        self._live_count = self._size
+        self._live_rows = None
+        self.revision = 0
+
+    # Column views over the used part of the buffers
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    @property
+    def stipend_amount(self) -> np.ndarray:
+        return self._stipend_amount[:self._size]
+
+    @property
+    def duration_months(self) -> np.ndarray:
+        return self._duration_months[:self._size]
+
+    @property
+    def is_paid(self) -> np.ndarray:
+        return self._is_paid[:self._size]
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self._alive[:self._size]
+
+    @property
+    def skill_start(self) -> np.ndarray:
+        return self._skill_start[:self._size]
+
+    @property
+    def skill_len(self) -> np.ndarray:
+        return self._skill_len[:self._size]
+
+    @property
+    def skill_ids(self) -> np.ndarray:
+        return self._skill_ids[:self._skill_used]
+
+    @property
+    def num_rows(self) -> int:
+        """Row positions in use, deleted rows included"""
+        return self._size
+
+    def live_rows(self) -> np.ndarray:
+        """Positions of the rows that are not deleted, ascending"""
+        live_rows = self._live_rows
+        if live_rows is None:
+            if self._live_count == self._size:
+                live_rows = np.arange(self._size, dtype=np.int64)
+            else:
+                live_rows = np.flatnonzero(self.alive).astype(np.int64)
+            self._live_rows = live_rows
+        return live_rows
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> 'InternshipCatalog':
+        """Build the catalog from processed dict records"""
+        skill_vocab = {}
+        skill_ids = []
+        skill_indptr = [0]
+        for record in records:
+            for skill in record['skills']:
+                skill_ids.append(skill_vocab.setdefault(skill, len(skill_vocab)))
+            skill_indptr.append(len(skill_ids))
+
+        return cls(
+            ids=[record['id'] for record in records],
+            categoricals={field: CategoricalColumn.from_values([record[field] for record in records])
+                          for field in CATEGORICAL_FIELDS},
+            stipend_amount=[record['stipend_amount'] for record in records],
+            duration_months=[record['duration_months'] for record in records],
+            is_paid=[record['is_paid'] for record in records],
+            skill_indptr=skill_indptr,
+            skill_ids=skill_ids,
+            skill_vocab=list(skill_vocab)
+        )
+
+    def state(self) -> Dict[str, Any]:
+        """Columns of an unedited catalog as arrays (plus category lists) for from_state()"""
+        if self.revision:
+            raise ValueError('catalog was edited in place; rebuild it from the source data first')
+        state = {
+            'ids': self.ids,
+            'stipend_amount': self.stipend_amount,
+            'duration_months': self.duration_months,
+            'is_paid': self.is_paid,
+            'skill_start': self.skill_start,
+            'skill_len': self.skill_len,
+            'skill_ids': self.skill_ids,
+            'skill_vocab': self.skill_vocab,
+        }
+        for field in CATEGORICAL_FIELDS:
+            column = getattr(self, field)
+            state[f'codes:{field}'] = column.codes
+            state[f'categories:{field}'] = column.categories
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'InternshipCatalog':
+        """Catalog over the arrays of state() without copying them (read-only arrays are copied on first edit)"""
+        return cls(
+            ids=state['ids'],
+            categoricals={field: CategoricalColumn(state[f'codes:{field}'], state[f'categories:{field}'])
+                          for field in CATEGORICAL_FIELDS},
+            stipend_amount=state['stipend_amount'],
+            duration_months=state['duration_months'],
+            is_paid=state['is_paid'],
+            skill_indptr=None,
+            skill_ids=state['skill_ids'],
+            skill_vocab=state['skill_vocab'],
+            skill_segments=(state['skill_start'], state['skill_len'])
+        )
+
+    def skills_of(self, row: int) -> List[str]:
+        """Skill names of one row, in their original order"""
+        start = self._skill_start[row]
+        return [self.skill_vocab[skill_id] for skill_id in self._skill_ids[start:start + self._skill_len[row]]]
+
+    def skill_entries(self, rows: Optional[np.ndarray] = None):
+        """(row, skill id) pairs of the given rows (default: live rows), flattened in row order"""
+        rows = self.live_rows() if rows is None else np.asarray(rows, dtype=np.int64)
+        lengths = self._skill_len[rows]
+        owners = np.repeat(rows, lengths)
+        offsets = np.cumsum(lengths) - lengths
+        positions = (np.arange(len(owners)) - np.repeat(offsets, lengths)
+                     + np.repeat(self._skill_start[rows], lengths))
+        return owners, self._skill_ids[positions]
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Build the dict record for one row"""
+        return {
+            'id': int(self._ids[row]),
+            'title': self.title[row],
+            'company': self.company[row],
+            'location': self.location[row],
+            'start_date': self.start_date[row],
+            'duration': self.duration[row],
+            'raw_stipend': self.raw_stipend[row],
+            'stipend_amount': int(self._stipend_amount[row]),
+            'is_paid': bool(self._is_paid[row]),
+            'skills': self.skills_of(row),
+            'domain': self.domain[row],
+            'work_mode': self.work_mode[row],
+            'duration_months': int(self._duration_months[row])
+        }
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Add a processed record as a new row; returns its position"""
+        row = self._size
+        for name in ['_ids', '_stipend_amount', '_duration_months', '_is_paid', '_alive',
+                     '_skill_start', '_skill_len']:
+            setattr(self, name, grow_buffer(getattr(self, name), row + 1))
+        for field in CATEGORICAL_FIELDS:
+            getattr(self, field).append(record[field])
+        self._size += 1
+        self._live_count += 1
+        self._write(row, record)
+        return row
+
+    def update(self, row: int, record: Dict[str, Any]) -> None:
+        """Overwrite a live row with a processed record"""
+        for field in CATEGORICAL_FIELDS:
+            getattr(self, field).set(row, record[field])
+        self._write(row, record)
+
+    def delete(self, row: int) -> None:
+        """Mark a row deleted; its position stays reserved"""
+        if not self._alive[row]:
+            return
+        self._writable()
+        self._alive[row] = False
+        self._skill_len[row] = 0
+        self._live_count -= 1
+        self._changed()
+
+    def _write(self, row: int, record: Dict[str, Any]) -> None:
+        self._writable()
+        self._ids[row] = record['id']
+        self._stipend_amount[row] = _as_int64([record['stipend_amount']])[0]
+        self._duration_months[row] = _as_int64([record['duration_months']])[0]
+        self._is_paid[row] = record['is_paid']
+        self._alive[row] = True
+
+        # New skill segment at the end; the old one is left unreferenced
+        if self._skill_lookup is None:
+            self._skill_lookup = {skill: skill_id for skill_id, skill in enumerate(self.skill_vocab)}
+        skill_ids = []
+        for skill in record['skills']:
+            skill_id = self._skill_lookup.get(skill)
+            if skill_id is None:
+                skill_id = self._skill_lookup[skill] = len(self.skill_vocab)
+                self.skill_vocab.append(skill)
+            skill_ids.append(skill_id)
+        self._skill_ids = grow_buffer(self._skill_ids, self._skill_used + len(skill_ids))
+        self._skill_ids[self._skill_used:self._skill_used + len(skill_ids)] = skill_ids
+        self._skill_start[row] = self._skill_used
+        self._skill_len[row] = len(skill_ids)
+        self._skill_used += len(skill_ids)
+        self._changed()
+
+    def _writable(self) -> None:
+        for name in ['_ids', '_stipend_amount', '_duration_months', '_is_paid', '_alive',
+                     '_skill_start', '_skill_len']:
+            setattr(self, name, grow_buffer(getattr(self, name), self._size))
+
+    def _changed(self) -> None:
+        self._live_rows = None
+        self.revision += 1
+
+    def start_date_days(self, today: Optional[date] = None) -> np.ndarray:
+        """Parsed start date per row as a day number (MISSING_DAY when unparseable)"""
+        today = today or date.today()
+        days = []
+        for value in self.start_date.categories:
+            parsed = parse_start_date(value, today)
+            days.append(MISSING_DAY if parsed is None else date_to_day(parsed))
+        return np.asarray(days, dtype=np.int64)[self.start_date.codes]
+
+    def category_mask(self, field: str, predicate) -> np.ndarray:
+        """Row mask for a categorical field (deleted rows excluded); predicate runs once per distinct value"""
+        column = getattr(self, field)
+        matches = np.fromiter((bool(predicate(value)) for value in column.categories), dtype=bool,
+                              count=len(column.categories))
+        return matches[column.codes] & self.alive
+
+    def rows_where(self, field: str, predicate) -> np.ndarray:
+        """Row positions whose categorical field satisfies predicate"""
+        return np.flatnonzero(self.category_mask(field, predicate))
+
+    def records(self, rows) -> List[Dict[str, Any]]:
+        """Build dict records for a sequence of row positions"""
+        return [self.record(row) for row in rows]
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.records(self.live_rows()[index])
+        position = int(index)
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError('catalog index out of range')
+        return self.record(self.live_rows()[position])
+
+    def __iter__(self):
+        for row in self.live_rows():
+            yield self.record(row)
@@ -1,22 +1,88 @@
 import pandas as pd
 import numpy as np
 import re
-from typing import List, Dict, Any, Optional
+import hashlib
+import uuid
+from datetime import date
+from typing import List, Dict, Any, Optional, Sequence
+
+from catalog import InternshipCatalog, CategoricalColumn, date_to_day
+from indexes import CatalogIndex
+from dataset_stats import DatasetStats
+from keyword_matcher import TITLE_CLASSIFIER
+from snapshot_store import read_snapshot, SnapshotMismatch
+
+REQUIRED_COLUMNS = ['internship_title', 'company_name', 'location', 'start_date', 'duration', 'stipend']
+
+# Record field holding the stripped raw value of each CSV column (also accepted as input names)
+COLUMN_RECORD_FIELDS = {
+    'internship_title': 'title',
+    'company_name': 'company',
+    'location': 'location',
+    'start_date': 'start_date',
+    'duration': 'duration',
+    'stipend': 'raw_stipend',
+}
+
+UNPAID_MARKERS = ['unpaid', 'nan', 'not specified', '']
+
+# Precompiled patterns for the vectorized ingestion path
+_FIRST_TWO_NUMBERS_RE = re.compile(r'^\D*(\d+)(?:\D+(\d+))?')
+_FIRST_NUMBER_RE = re.compile(r'(\d+)')
+_PLAIN_INT_RE = re.compile(r'^[0-9]{1,15}$')
+
+def file_fingerprint(csv_file_path: str) -> str:
+    """Dataset version: short content hash of the CSV file"""
+    digest = hashlib.sha1()
+    with open(csv_file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:12]
 
 class DataProcessor:
-    def __init__(self, csv_file_path: str):
+    def __init__(self, csv_file_path: str, vectorized: bool = True, snapshot_path: Optional[str] = None):
         """
         Enhanced data processor for internship recommendation system
         Supports your exact CSV structure: internship_title,company_name,location,start_date,duration,stipend
+
+        vectorized=True derives all fields with column-wide string operations
+        (on the distinct values of each column); vectorized=False uses the
+        original row-by-row path. Both produce identical processed_data.
+
+        snapshot_path: binary snapshot (see snapshot_store) to load instead
+        of processing the CSV, used only when it was built from this exact
+        CSV. The raw DataFrame (df) is then read lazily on first access.
         """
         self.csv_file_path = csv_file_path
-        self.df = None
+        self.vectorized = vectorized
+        self.snapshot_path = snapshot_path
+        self._df = None
         self.processed_data = None
+        self.index = None
+        self.source_version = None
+        self.next_id = 1
+        self.edit_nonce = None
+        self.prebuilt = {}
+        self._stats = None
         self.load_data()
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        """Raw CSV rows (read on first access when the catalog came from a snapshot)"""
+        if self._df is None:
+            self._df = pd.read_csv(self.csv_file_path)
+        return self._df
+    
+    @df.setter
+    def df(self, value: pd.DataFrame) -> None:
+        self._df = value
         
     def load_data(self) -> None:
         """Load and initially process the CSV data"""
         try:
+            if self.snapshot_path and self._load_snapshot():
+                return
+            
             print(f"📊 Loading data from: {self.csv_file_path}")
             self.df = pd.read_csv(self.csv_file_path)
             print(f"✅ Loaded {len(self.df)} internships successfully!")
@@ -25,7 +91,15 @@ class DataProcessor:
             print(f"📋 Columns found: {list(self.df.columns)}")
             
             # Process the data
-            self.processed_data = self._process_raw_data()
+            if self.vectorized:
+                self.processed_data = self._process_raw_data_vectorized()
+            else:
+                self.processed_data = InternshipCatalog.from_records(self._process_raw_data())
+            self.index = CatalogIndex(self.processed_data)
+            self.source_version = file_fingerprint(self.csv_file_path)
+            self.prebuilt = {}
+            self._stats = None
+            self._set_next_id()
             print(f"✅ Data processing completed successfully!")
             
         except FileNotFoundError:
@@ -35,28 +109,54 @@ class DataProcessor:
             print(f"❌ Error loading data: {str(e)}")
             raise
     
+    def _load_snapshot(self) -> bool:
+        """Load catalog and indexes from the snapshot; False (CSV fallback) if it doesn't match the CSV"""
+        source_version = file_fingerprint(self.csv_file_path)
+        try:
+            parts = read_snapshot(self.snapshot_path, source_version)
+        except SnapshotMismatch as e:
+            print(f"⚠️ Snapshot not used ({e}), processing the CSV instead")
+            return False
+        
+        self.processed_data = InternshipCatalog.from_state(parts['catalog'])
+        self.index = CatalogIndex(self.processed_data, parts['index'])
+        # Scorer, TF-IDF and neighbour table state, picked up by RecommendationEngine
+        self.prebuilt = {'scorer': parts['scorer'], 'text': parts['text'], 'neighbours': parts['neighbours']}
+        self.source_version = source_version
+        self._stats = None
+        self._set_next_id()
+        print(f"✅ Loaded {len(self.processed_data)} internships from snapshot {self.snapshot_path} "
+              f"(built {parts['meta']['created_at']})")
+        return True
+    
+    def _set_next_id(self) -> None:
+        ids = self.processed_data.ids
+        self.next_id = int(ids.max()) + 1 if len(ids) else 1
+        self.edit_nonce = None
+    
+    def _begin_edit(self) -> None:
+        # The edit count restarts at every load and in every process: a random token per edit
+        # generation keeps "source+edits" versions of different content apart
+        if self.edit_nonce is None:
+            self.edit_nonce = uuid.uuid4().hex[:8]
+    
+    @property
+    def version(self) -> Optional[str]:
+        """
+        Dataset version: the CSV fingerprint, plus a token of this load's
+        edits and the edit count once listings were changed in place
+        """
+        if self.processed_data is None or not self.processed_data.revision:
+            return self.source_version
+        return f"{self.source_version}+{self.edit_nonce}.{self.processed_data.revision}"
+    
     def _process_raw_data(self) -> List[Dict[str, Any]]:
         """Process raw CSV data into structured format"""
         processed_internships = []
         
         for _, row in self.df.iterrows():
             try:
-                internship = {
-                    'id': len(processed_internships) + 1,
-                    'title': str(row['internship_title']).strip(),
-                    'company': str(row['company_name']).strip(),
-                    'location': str(row['location']).strip(),
-                    'start_date': str(row['start_date']).strip(),
-                    'duration': str(row['duration']).strip(),
-                    'raw_stipend': str(row['stipend']).strip(),
-                    'stipend_amount': self._extract_stipend_amount(str(row['stipend'])),
-                    'is_paid': self._is_paid_internship(str(row['stipend'])),
-                    'skills': self._extract_skills_from_title(str(row['internship_title'])),
-                    'domain': self._categorize_domain(str(row['internship_title'])),
-                    'work_mode': self._determine_work_mode(str(row['location'])),
-                    'duration_months': self._extract_duration_months(str(row['duration']))
-                }
-                processed_internships.append(internship)
+                processed_internships.append(self._process_row(row, len(processed_internships) + 1))
                 
             except Exception as e:
                 print(f"⚠️ Warning: Error processing row {len(processed_internships) + 1}: {str(e)}")
@@ -64,11 +164,238 @@ class DataProcessor:
         
         return processed_internships
     
+    def _process_row(self, row, internship_id: int) -> Dict[str, Any]:
+        """Derive the processed record of one raw row (CSV column -> value)"""
+        skills, domain = TITLE_CLASSIFIER.classify(str(row['internship_title']).lower())
+        return {
+            'id': internship_id,
+            'title': str(row['internship_title']).strip(),
+            'company': str(row['company_name']).strip(),
+            'location': str(row['location']).strip(),
+            'start_date': str(row['start_date']).strip(),
+            'duration': str(row['duration']).strip(),
+            'raw_stipend': str(row['stipend']).strip(),
+            'stipend_amount': self._extract_stipend_amount(str(row['stipend'])),
+            'is_paid': self._is_paid_internship(str(row['stipend'])),
+            'skills': skills,
+            'domain': domain,
+            'work_mode': self._determine_work_mode(str(row['location'])),
+            'duration_months': self._extract_duration_months(str(row['duration']))
+        }
+    
+    @staticmethod
+    def _raw_fields(fields: Dict[str, Any]) -> Dict[str, str]:
+        """Validate listing fields given by CSV column or record name; returns CSV column -> value"""
+        record_columns = {record_field: column for column, record_field in COLUMN_RECORD_FIELDS.items()}
+        raw = {}
+        for name, value in fields.items():
+            column = name if name in COLUMN_RECORD_FIELDS else record_columns.get(name)
+            if column is None:
+                raise ValueError(f"Unknown field: {name}")
+            if value is None or isinstance(value, (dict, list)):
+                raise ValueError(f"Field {name} must be a string or number")
+            raw[column] = value
+        return raw
+    
+    def add_internship(self, fields: Dict[str, Any]) -> int:
+        """Process one new listing and add it to the catalog and indexes; returns its row"""
+        raw = self._raw_fields(fields)
+        missing = [column for column in REQUIRED_COLUMNS if column not in raw]
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(missing)}")
+        
+        self._begin_edit()
+        row = self.processed_data.append(self._process_row(raw, self.next_id))
+        self.next_id += 1
+        self.index.add_row(row)
+        if self._stats is not None:
+            self._stats.add_row(row)
+        return row
+    
+    def update_internship(self, internship_id: int, fields: Dict[str, Any]) -> Optional[int]:
+        """Re-process one listing with some fields changed; returns its row, None for an unknown id"""
+        raw = self._raw_fields(fields)
+        row = self.index.row_of(internship_id)
+        if row is None:
+            return None
+        
+        current = self.processed_data.record(row)
+        merged = {column: current[record_field] for column, record_field in COLUMN_RECORD_FIELDS.items()}
+        merged.update(raw)
+        previous_keys = self.index.row_keys(row)
+        self._begin_edit()
+        if self._stats is not None:
+            self._stats.discard_row(row)
+        self.processed_data.update(row, self._process_row(merged, internship_id))
+        self.index.update_row(row, previous_keys)
+        if self._stats is not None:
+            self._stats.add_row(row)
+        return row
+    
+    def remove_internship(self, internship_id: int) -> Optional[int]:
+        """Delete one listing; returns the row it occupied, None for an unknown id"""
+        row = self.index.row_of(internship_id)
+        if row is None:
+            return None
+        
+        previous_keys = self.index.row_keys(row)
+        self._begin_edit()
+        if self._stats is not None:
+            self._stats.discard_row(row)
+        self.processed_data.delete(row)
+        self.index.remove_row(row, previous_keys)
+        return row
+    
+    def _process_raw_data_vectorized(self) -> InternshipCatalog:
+        """
+        Vectorized equivalent of _process_raw_data, building the columnar catalog directly.
+
+        Each column is factorized first, so every derived field is computed
+        once per distinct value with column-wide string operations and then
+        broadcast back to the rows through the factorization codes.
+        """
+        missing = [col for col in REQUIRED_COLUMNS if col not in self.df.columns]
+        if missing:
+            # Let the row-by-row path report the per-row failures
+            return InternshipCatalog.from_records(self._process_raw_data())
+        
+        columns = {col: self._factorize_as_str(self.df[col]) for col in REQUIRED_COLUMNS}
+        title_codes, titles = columns['internship_title']
+        location_codes, locations = columns['location']
+        duration_codes, durations = columns['duration']
+        stipend_codes, stipends = columns['stipend']
+        
+        skills, domains = self._derive_title_fields(titles)
+        stipend_amounts = self._derive_stipend_amounts(stipends)
+        skill_indptr, skill_ids, skill_vocab = self._skills_csr(title_codes, skills)
+        
+        categoricals = {
+            'title': CategoricalColumn.from_codes(title_codes, titles.str.strip()),
+            'company': CategoricalColumn.from_codes(*self._stripped(columns['company_name'])),
+            'location': CategoricalColumn.from_codes(location_codes, locations.str.strip()),
+            'start_date': CategoricalColumn.from_codes(*self._stripped(columns['start_date'])),
+            'duration': CategoricalColumn.from_codes(duration_codes, durations.str.strip()),
+            'raw_stipend': CategoricalColumn.from_codes(stipend_codes, stipends.str.strip()),
+            'domain': CategoricalColumn.from_codes(title_codes, domains),
+            'work_mode': CategoricalColumn.from_codes(location_codes, self._derive_work_modes(locations)),
+        }
+        
+        return InternshipCatalog(
+            ids=np.arange(1, len(self.df) + 1),
+            categoricals=categoricals,
+            stipend_amount=stipend_amounts[stipend_codes],
+            duration_months=self._derive_duration_months(durations)[duration_codes],
+            is_paid=(stipend_amounts != 0)[stipend_codes],
+            skill_indptr=skill_indptr,
+            skill_ids=skill_ids,
+            skill_vocab=skill_vocab
+        )
+    
+    @staticmethod
+    def _skills_csr(title_codes: np.ndarray, title_skills: np.ndarray):
+        """Expand per-title skill lists into row-level CSR arrays"""
+        skill_vocab = {}
+        title_lengths = np.array([len(skills) for skills in title_skills], dtype=np.int64)
+        title_flat = np.array([skill_vocab.setdefault(skill, len(skill_vocab))
+                               for skills in title_skills for skill in skills], dtype=np.int32)
+        title_ptr = np.concatenate([[0], np.cumsum(title_lengths)])
+        
+        row_lengths = title_lengths[title_codes]
+        skill_indptr = np.concatenate([[0], np.cumsum(row_lengths)])
+        positions = (np.arange(skill_indptr[-1]) - np.repeat(skill_indptr[:-1], row_lengths)
+                     + np.repeat(title_ptr[title_codes], row_lengths))
+        return skill_indptr, title_flat[positions], list(skill_vocab)
+    
+    @staticmethod
+    def _factorize_as_str(column: pd.Series):
+        """Factorize a column, returning codes and the str() of each distinct value"""
+        codes, uniques = pd.factorize(column, use_na_sentinel=False)
+        return codes, pd.Series([str(value) for value in uniques], dtype=object)
+    
+    @staticmethod
+    def _stripped(factorized):
+        codes, uniques = factorized
+        return codes, uniques.str.strip()
+    
+    def _derive_title_fields(self, titles: pd.Series):
+        """Skills (list per title) and domain for each distinct title, one matcher pass per title"""
+        skills = np.empty(len(titles), dtype=object)
+        domains = np.empty(len(titles), dtype=object)
+        for i, title_lower in enumerate(titles.str.lower()):
+            skills[i], domains[i] = TITLE_CLASSIFIER.classify(title_lower)
+        return skills, domains
+    
+    @staticmethod
+    def _contains_any(lower: pd.Series, words: List[str]) -> np.ndarray:
+        mask = np.zeros(len(lower), dtype=bool)
+        for word in words:
+            mask |= lower.str.contains(word, regex=False).to_numpy(dtype=bool)
+        return mask
+    
+    def _derive_stipend_amounts(self, stipends: pd.Series) -> np.ndarray:
+        """Vectorized _extract_stipend_amount over distinct stipend strings"""
+        lower = stipends.str.lower()
+        unpaid = lower.isin(UNPAID_MARKERS).to_numpy()
+        performance = lower.str.contains('performance', regex=False).to_numpy(dtype=bool)
+        has_dash = stipends.str.contains('-', regex=False).to_numpy(dtype=bool)
+        
+        numbers = stipends.str.replace(',', '', regex=False).str.extract(_FIRST_TWO_NUMBERS_RE)
+        first, first_ok = self._to_int(numbers[0])
+        second, second_ok = self._to_int(numbers[1])
+        has_first = numbers[0].notna().to_numpy()
+        has_second = numbers[1].notna().to_numpy()
+        
+        amounts = np.where(has_dash & has_second, ((first + second) / 2).astype(np.int64), first)
+        amounts = np.where(has_first, amounts, 0)
+        amounts = np.where(performance, 5000, amounts)
+        amounts = np.where(unpaid, 0, amounts).astype(np.int64)
+        
+        # Digit runs that don't fit a plain int64 (very long or non-ASCII) use the scalar path
+        exotic = ~unpaid & ~performance & ((has_first & ~first_ok) | (has_dash & has_second & ~second_ok))
+        amounts = amounts.astype(object)
+        for i in np.flatnonzero(exotic):
+            amounts[i] = self._extract_stipend_amount(stipends.iat[i])
+        return amounts
+    
+    def _derive_work_modes(self, locations: pd.Series) -> np.ndarray:
+        """Vectorized _determine_work_mode over distinct locations"""
+        remote = self._contains_any(locations.str.lower(), ['work from home', 'remote'])
+        return np.where(remote, 'Remote', 'On-site').astype(object)
+    
+    def _derive_duration_months(self, durations: pd.Series) -> np.ndarray:
+        """Vectorized _extract_duration_months over distinct duration strings"""
+        lower = durations.str.lower()
+        months = lower.str.contains('month', regex=False).to_numpy(dtype=bool)
+        weeks = lower.str.contains('week', regex=False).to_numpy(dtype=bool) & ~months
+        
+        number_str = durations.str.extract(_FIRST_NUMBER_RE)[0]
+        number, number_ok = self._to_int(number_str)
+        has_number = number_str.notna().to_numpy()
+        
+        result = np.full(len(durations), 6, dtype=np.int64)
+        result = np.where(weeks & has_number, np.maximum(1, number // 4), result)
+        result = np.where(months & has_number, number, result)
+        
+        exotic = (months | weeks) & has_number & ~number_ok
+        result = result.astype(object)
+        for i in np.flatnonzero(exotic):
+            result[i] = self._extract_duration_months(durations.iat[i])
+        return result
+    
+    @staticmethod
+    def _to_int(digits: pd.Series):
+        """Parse plain ASCII digit strings to int64; returns (values, parsed_ok mask)"""
+        ok = digits.str.match(_PLAIN_INT_RE).fillna(False).to_numpy(dtype=bool)
+        values = np.zeros(len(digits), dtype=np.int64)
+        if ok.any():
+            values[ok] = digits[ok].astype(np.int64).to_numpy()
+        return values, ok
+    
     def _extract_stipend_amount(self, stipend_str: str) -> int:
         """Extract numeric stipend amount from various formats"""
         try:
             # Handle "Unpaid" cases
-            if stipend_str.lower() in ['unpaid', 'nan', 'not specified', '']:
+            if stipend_str.lower() in UNPAID_MARKERS:
                 return 0
             
             # Handle Performance Based
@@ -93,89 +420,16 @@ class DataProcessor:
     
     def _is_paid_internship(self, stipend_str: str) -> bool:
         """Determine if internship is paid"""
-        return not (stipend_str.lower() in ['unpaid', 'nan', 'not specified', ''] or 
+        return not (stipend_str.lower() in UNPAID_MARKERS or 
                    self._extract_stipend_amount(stipend_str) == 0)
     
     def _extract_skills_from_title(self, title: str) -> List[str]:
         """Extract relevant skills from internship title"""
-        title_lower = title.lower()
-        skills = []
-        
-        # Programming languages
-        programming_skills = {
-            'python': 'Python', 'java': 'Java', 'javascript': 'JavaScript', 
-            'react': 'React.js', 'angular': 'Angular', 'node': 'Node.js',
-            'flutter': 'Flutter', 'android': 'Android', 'ios': 'iOS',
-            'php': 'PHP', 'ruby': 'Ruby', 'go': 'Go', 'swift': 'Swift'
-        }
-        
-        # Technical skills
-        technical_skills = {
-            'machine learning': 'Machine Learning', 'ai': 'Artificial Intelligence',
-            'data science': 'Data Science', 'analytics': 'Data Analytics',
-            'blockchain': 'Blockchain', 'cybersecurity': 'Cybersecurity',
-            'devops': 'DevOps', 'cloud': 'Cloud Computing', 'aws': 'AWS',
-            'database': 'Database Management', 'sql': 'SQL'
-        }
-        
-        # Design skills
-        design_skills = {
-            'ui/ux': 'UI/UX Design', 'graphic design': 'Graphic Design',
-            'web design': 'Web Design', 'photoshop': 'Photoshop',
-            'figma': 'Figma', 'sketch': 'Sketch'
-        }
-        
-        # Business skills
-        business_skills = {
-            'marketing': 'Digital Marketing', 'seo': 'SEO', 'content': 'Content Writing',
-            'sales': 'Sales', 'business': 'Business Development',
-            'finance': 'Finance', 'accounting': 'Accounting', 'hr': 'Human Resources'
-        }
-        
-        # Check all skill categories
-        all_skills = {**programming_skills, **technical_skills, **design_skills, **business_skills}
-        
-        for keyword, skill in all_skills.items():
-            if keyword in title_lower:
-                skills.append(skill)
-        
-        # Add generic skill based on title if no specific skills found
-        if not skills:
-            if any(word in title_lower for word in ['development', 'developer', 'programming']):
-                skills.append('Programming')
-            elif any(word in title_lower for word in ['design', 'creative']):
-                skills.append('Design')
-            elif any(word in title_lower for word in ['marketing', 'sales']):
-                skills.append('Marketing')
-            elif any(word in title_lower for word in ['content', 'writing']):
-                skills.append('Content Writing')
-            else:
-                skills.append('General')
-        
-        return skills
+        return TITLE_CLASSIFIER.classify(title.lower())[0]
     
     def _categorize_domain(self, title: str) -> str:
         """Categorize internship into domain"""
-        title_lower = title.lower()
-        
-        if any(word in title_lower for word in ['software', 'development', 'programming', 'coding', 'tech']):
-            return 'Technology'
-        elif any(word in title_lower for word in ['design', 'ui', 'ux', 'graphic', 'creative']):
-            return 'Design'
-        elif any(word in title_lower for word in ['marketing', 'digital', 'social media', 'seo']):
-            return 'Marketing'
-        elif any(word in title_lower for word in ['finance', 'accounting', 'investment', 'banking']):
-            return 'Finance'
-        elif any(word in title_lower for word in ['hr', 'human resources', 'recruitment']):
-            return 'Human Resources'
-        elif any(word in title_lower for word in ['content', 'writing', 'journalism']):
-            return 'Content & Media'
-        elif any(word in title_lower for word in ['sales', 'business development']):
-            return 'Sales'
-        elif any(word in title_lower for word in ['data', 'analytics', 'research']):
-            return 'Data & Analytics'
-        else:
-            return 'General'
+        return TITLE_CLASSIFIER.classify(title.lower())[1]
     
     def _determine_work_mode(self, location: str) -> str:
         """Determine work mode from location"""
@@ -201,8 +455,8 @@ class DataProcessor:
         except:
             return 6
     
-    def get_all_internships(self) -> List[Dict[str, Any]]:
-        """Get all processed internships"""
+    def get_all_internships(self) -> Sequence[Dict[str, Any]]:
+        """Get all processed internships (a lazily materializing catalog)"""
         return self.processed_data if self.processed_data else []
     
     def get_internships_by_location(self, location: str) -> List[Dict[str, Any]]:
@@ -211,75 +465,64 @@ class DataProcessor:
             return []
         
         if location.lower() == 'work from home':
-            return [internship for internship in self.processed_data 
-                   if internship['work_mode'] == 'Remote']
+            rows = self.index.remote_rows()
         else:
-            return [internship for internship in self.processed_data 
-                   if location.lower() in internship['location'].lower()]
+            rows = self.index.location_rows(location)
+        return self.processed_data.records(rows)
+    
+    def get_internships_by_stipend(self, min_stipend: int, max_stipend: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Filter internships by stipend range"""
+        if not self.processed_data:
+            return []
+        
+        return self.processed_data.records(self.index.range_rows('stipend_amount', min_stipend, max_stipend))
     
-    def get_internships_by_stipend(self, min_stipend: int) -> List[Dict[str, Any]]:
-        """Filter internships by minimum stipend"""
+    def get_internships_by_duration(self, min_months: Optional[int] = None,
+                                    max_months: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Filter internships by duration range (months)"""
         if not self.processed_data:
             return []
         
-        return [internship for internship in self.processed_data 
-               if internship['stipend_amount'] >= min_stipend]
+        return self.processed_data.records(self.index.range_rows('duration_months', min_months, max_months))
+    
+    def get_internships_by_start_date(self, start_after: Optional[date] = None,
+                                      start_before: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Filter internships by start date range ("Immediately" counts as today)"""
+        if not self.processed_data:
+            return []
+        
+        low = date_to_day(start_after) if start_after else None
+        high = date_to_day(start_before) if start_before else None
+        return self.processed_data.records(self.index.range_rows('start_date', low, high))
     
     def get_internships_by_domain(self, domain: str) -> List[Dict[str, Any]]:
         """Filter internships by domain"""
         if not self.processed_data:
             return []
         
-        return [internship for internship in self.processed_data 
-               if internship['domain'].lower() == domain.lower()]
+        rows = self.index.rows_for_any('domain', lambda value: value.lower() == domain.lower())
+        return self.processed_data.records(rows)
+    
+    def get_internships_by_skill(self, skill: str) -> List[Dict[str, Any]]:
+        """Filter internships listing a skill (case-insensitive)"""
+        if not self.processed_data:
+            return []
+        
+        return self.processed_data.records(self.index.skill_rows(skill))
     
     def get_internship_by_id(self, internship_id: int) -> Optional[Dict[str, Any]]:
         """Get specific internship by ID"""
         if not self.processed_data:
             return None
         
-        for internship in self.processed_data:
-            if internship['id'] == internship_id:
-                return internship
-        return None
+        row = self.index.row_of(internship_id)
+        return self.processed_data.record(row) if row is not None else None
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get dataset statistics"""
-        if not self.processed_data:
-            return {}
-        
-        total_internships = len(self.processed_data)
-        paid_internships = len([i for i in self.processed_data if i['is_paid']])
-        remote_internships = len([i for i in self.processed_data if i['work_mode'] == 'Remote'])
-        
-        domains = {}
-        locations = {}
-        companies = {}
-        
-        for internship in self.processed_data:
-            # Domain statistics
-            domain = internship['domain']
-            domains[domain] = domains.get(domain, 0) + 1
-            
-            # Location statistics
-            location = internship['location']
-            locations[location] = locations.get(location, 0) + 1
-            
-            # Company statistics
-            company = internship['company']
-            companies[company] = companies.get(company, 0) + 1
-        
-        return {
-            'total_internships': total_internships,
-            'paid_internships': paid_internships,
-            'unpaid_internships': total_internships - paid_internships,
-            'remote_internships': remote_internships,
-            'onsite_internships': total_internships - remote_internships,
-            'domains': domains,
-            'top_locations': dict(sorted(locations.items(), key=lambda x: x[1], reverse=True)[:10]),
-            'top_companies': dict(sorted(companies.items(), key=lambda x: x[1], reverse=True)[:10]),
-            'average_stipend': np.mean([i['stipend_amount'] for i in self.processed_data if i['is_paid']]) if paid_internships > 0 else 0
-        }
+        """Get dataset statistics (aggregated once, then kept current on listing edits)"""
+        if self._stats is None:
+            self._stats = DatasetStats(self.processed_data, self.index)
+        return self._stats.summary()
 
 # Test the data processor
 if __name__ == "__main__":
@@ -287,4 +530,4 @@ if __name__ == "__main__":
     stats = processor.get_stats()
     print("\n📊 Dataset Statistics:")
     for key, value in stats.items():
-        print(f"{key}: {value}")
\ No newline at end of file
+        print(f"{key}: {value}")
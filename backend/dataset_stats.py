@@ -0,0 +1,92 @@
+import numpy as np
+from typing import Any, Dict, Optional
+
+from catalog import grow_buffer
+
+# Categorical fields with a per-value histogram in the stats
+HISTOGRAM_FIELDS = ['domain', 'location', 'company']
+
+# Entries in the top_locations / top_companies lists
+TOP_VALUES = 10
+
+
+class DatasetStats:
+    """
+    Aggregates behind DataProcessor.get_stats(), kept current on edits.
+
+    Built once with bincounts over the category codes of the live rows;
+    add_row()/discard_row() adjust the counters for a single listing, so an
+    edit costs O(1) instead of a rescan. The summary dict is built on first
+    request and reused until the next change.
+    """
+
+    def __init__(self, catalog, index):
+        self.catalog = catalog
+        self.index = index
+        rows = catalog.live_rows()
+        self.counts = {field: np.bincount(getattr(catalog, field).codes[rows],
+                                          minlength=len(getattr(catalog, field).categories)).astype(np.int64)
+                       for field in HISTOGRAM_FIELDS}
+        paid = catalog.is_paid[rows]
+        self.total = len(rows)
+        self.paid = int(paid.sum())
+        self.remote = int(np.count_nonzero(catalog.work_mode.codes[rows] == self._remote_code()))
+        # Exact integer sum, so the average matches np.mean over the paid stipends
+        self.paid_stipend_sum = int(catalog.stipend_amount[rows][paid].sum(dtype=np.int64))
+        self._summary = None
+
+    def _remote_code(self) -> Optional[int]:
+        return self.catalog.work_mode.code_of('Remote')
+
+    def _apply(self, row: int, sign: int) -> None:
+        catalog = self.catalog
+        for field in HISTOGRAM_FIELDS:
+            code = int(getattr(catalog, field).codes[row])
+            self.counts[field] = grow_buffer(self.counts[field], code + 1)
+            self.counts[field][code] += sign
+        self.total += sign
+        if catalog.work_mode.codes[row] == self._remote_code():
+            self.remote += sign
+        if catalog.is_paid[row]:
+            self.paid += sign
+            self.paid_stipend_sum += sign * int(catalog.stipend_amount[row])
+        self._summary = None
+
+    def add_row(self, row: int) -> None:
+        """Count a listing just added (or rewritten) in the catalog"""
+        self._apply(row, 1)
+
+    def discard_row(self, row: int) -> None:
+        """Uncount a listing about to be rewritten or deleted"""
+        self._apply(row, -1)
+
+    def _histogram(self, field: str) -> Dict[str, int]:
+        """value -> count for values with live rows, in order of their first live row"""
+        counts = self.counts[field]
+        codes = np.flatnonzero(counts)
+        postings = self.index.postings[field]
+        first_rows = np.array([postings[int(code)][0] for code in codes], dtype=np.int64)
+        categories = getattr(self.catalog, field).categories
+        return {categories[code]: int(counts[code]) for code in codes[np.argsort(first_rows, kind='stable')]}
+
+    def summary(self) -> Dict[str, Any]:
+        """Same dict as the original get_stats(); shared between calls, so treat it as read-only"""
+        if self._summary is not None:
+            return self._summary
+        if not self.total:
+            self._summary = {}
+            return self._summary
+
+        top = lambda histogram: dict(sorted(histogram.items(), key=lambda x: x[1], reverse=True)[:TOP_VALUES])
+        self._summary = {
+            'total_internships': self.total,
+            'paid_internships': self.paid,
+            'unpaid_internships': self.total - self.paid,
+            'remote_internships': self.remote,
+            'onsite_internships': self.total - self.remote,
+            'domains': self._histogram('domain'),
+            'top_locations': top(self._histogram('location')),
+            'top_companies': top(self._histogram('company')),
+            'average_stipend': np.float64(self.paid_stipend_sum) / self.paid if self.paid > 0 else 0
+        }
+        return self._summary
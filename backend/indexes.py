@@ -0,0 +1,410 @@
+import threading
+import numpy as np
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+from catalog import IMMEDIATE_START_MARKERS, MISSING_DAY, parse_start_date, date_to_day
+
+EMPTY_ROWS = np.zeros(0, dtype=np.int64)
+
+# Categorical fields that get an inverted (code -> rows) index
+POSTING_FIELDS = ['domain', 'work_mode', 'company', 'location']
+
+# Bound on memoized free-text location lookups
+LOCATION_CACHE_SIZE = 1024
+
+# Range indexes that do not depend on the current date (start_date does, via "Immediately")
+STATIC_RANGE_FIELDS = ['stipend_amount', 'duration_months']
+
+# Listings starting "Immediately" / "ASAP" are kept out of the start_date index in a set of their own,
+# which a start date filter includes whenever its range contains today's date (read at query time)
+IMMEDIATE_START_FIELD = 'start_immediately'
+
+# Changed rows a range index absorbs before it is rebuilt (at least this many, or 5% of the rows)
+RANGE_DELTA_LIMIT = 1024
+
+
+def build_postings(codes: np.ndarray, num_codes: int, rows: Optional[np.ndarray] = None):
+    """
+    Group rows by code as flat (rows, offsets): the rows carrying code c are
+    rows[offsets[c]:offsets[c + 1]], in the order given (ascending by default)
+    """
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes, minlength=num_codes) if len(codes) else np.zeros(num_codes, dtype=np.int64)
+    grouped = order.astype(np.int64) if rows is None else rows[order]
+    return grouped, np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+
+def union_rows(postings: List[np.ndarray]) -> np.ndarray:
+    """Sorted union of posting lists"""
+    if not postings:
+        return EMPTY_ROWS
+    if len(postings) == 1:
+        return postings[0]
+    return np.unique(np.concatenate(postings))
+
+
+def intersect_rows(*row_sets: np.ndarray) -> np.ndarray:
+    """Sorted intersection of posting lists"""
+    result = row_sets[0]
+    for rows in row_sets[1:]:
+        result = np.intersect1d(result, rows, assume_unique=True)
+    return result
+
+
+class PostingLists:
+    """
+    code -> sorted rows, stored flat (rows, offsets) and patched lazily.
+
+    Writers only record changes: add() queues a row for a code and discard()
+    marks a code whose list may hold rows that no longer carry it. The next
+    read of that code merges the queue and drops stale rows (still_valid),
+    so an update costs O(1) and the merge cost is paid once per touched list.
+    Merged lists shadow their slice of the flat arrays, which are never
+    written (they may be read-only memory maps).
+    """
+
+    def __init__(self, rows: np.ndarray, offsets: np.ndarray, still_valid: Callable[[int, np.ndarray], np.ndarray]):
+        self.rows = rows
+        self.offsets = offsets
+        self.still_valid = still_valid
+        self._merged = {}
+        self._pending = {}
+        self._stale = set()
+        self._merge_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return max([len(self.offsets) - 1, *(code + 1 for code in self._merged), *(code + 1 for code in self._pending)])
+
+    def add(self, code: int, row: int) -> None:
+        self._pending.setdefault(code, []).append(row)
+
+    def discard(self, code: int) -> None:
+        self._stale.add(code)
+
+    def __getitem__(self, code: int) -> np.ndarray:
+        if code in self._pending or code in self._stale:
+            self._merge(code)
+        return self._current(code)
+
+    def _current(self, code: int) -> np.ndarray:
+        merged = self._merged.get(code)
+        if merged is not None:
+            return merged
+        if code < len(self.offsets) - 1:
+            return self.rows[self.offsets[code]:self.offsets[code + 1]]
+        return EMPTY_ROWS
+
+    def _merge(self, code: int) -> None:
+        with self._merge_lock:
+            if code not in self._pending and code not in self._stale:
+                return
+            rows = self._current(code)
+            pending = self._pending.get(code)
+            if pending:
+                rows = np.union1d(rows, np.asarray(pending, dtype=np.int64))
+            if code in self._stale:
+                rows = rows[self.still_valid(code, rows)]
+            # Publish the merged list before clearing the markers, so a reader
+            # that skips the merge never sees the old list
+            self._merged[code] = rows
+            self._pending.pop(code, None)
+            self._stale.discard(code)
+
+    def flat(self):
+        """(rows, offsets) with every pending change applied"""
+        if not self._merged and not self._pending and not self._stale:
+            return self.rows, self.offsets
+        lists = [self[code] for code in range(len(self))]
+        offsets = np.concatenate([[0], np.cumsum([len(rows) for rows in lists], dtype=np.int64)]).astype(np.int64)
+        return (np.concatenate(lists) if lists else EMPTY_ROWS), offsets
+
+
+class SortedRangeIndex:
+    """
+    Rows ordered by a numeric column; range queries are two binary searches
+    (np.searchsorted, i.e. bisect_left/bisect_right) over the sorted values.
+
+    Rows changed after the build are passed to mark_changed(): their sorted
+    entries are ignored and current(rows) -> (values, valid) is evaluated for
+    them directly until the index is rebuilt.
+    """
+
+    def __init__(self, values: np.ndarray, valid: Optional[np.ndarray] = None,
+                 current: Optional[Callable[[np.ndarray], tuple]] = None):
+        rows = np.arange(len(values), dtype=np.int64)
+        if valid is not None:
+            rows = rows[valid]
+        order = np.argsort(values[rows], kind='stable')
+        self.rows = rows[order]
+        self.sorted_values = values[self.rows]
+        self.current = current
+        self._changed = set()
+        self._changed_rows = EMPTY_ROWS
+
+    @classmethod
+    def from_sorted(cls, rows: np.ndarray, sorted_values: np.ndarray,
+                    current: Optional[Callable[[np.ndarray], tuple]] = None) -> 'SortedRangeIndex':
+        """Wrap rows/values that are already in value order"""
+        index = cls(EMPTY_ROWS, current=current)
+        index.rows = rows
+        index.sorted_values = sorted_values
+        return index
+
+    def mark_changed(self, row: int) -> None:
+        self._changed.add(row)
+        self._changed_rows = None
+
+    @property
+    def num_changed(self) -> int:
+        return len(self._changed)
+
+    def rows_between(self, low=None, high=None) -> np.ndarray:
+        """Sorted rows with low <= value <= high (either bound may be None)"""
+        start = 0 if low is None else np.searchsorted(self.sorted_values, low, side='left')
+        end = len(self.rows) if high is None else np.searchsorted(self.sorted_values, high, side='right')
+        rows = self.rows[start:end] if start < end else EMPTY_ROWS
+        changed = self._changed_rows
+        if changed is None:
+            changed = self._changed_rows = np.array(sorted(self._changed), dtype=np.int64)
+        if len(changed):
+            values, valid = self.current(changed)
+            if low is not None:
+                valid = valid & (values >= low)
+            if high is not None:
+                valid = valid & (values <= high)
+            rows = np.concatenate([rows[~np.isin(rows, changed)], changed[valid]])
+        if not len(rows):
+            return EMPTY_ROWS
+        return np.sort(rows)
+
+
+class CatalogIndex:
+    """
+    Lookup structures over an InternshipCatalog, built once at load time.
+
+    - id -> row lookup (binary search, as ids ascend with the rows)
+    - inverted posting lists for domain, work_mode, company and location
+    - skill -> rows posting lists from the skills column
+    - sorted range indexes on stipend_amount, duration_months and the
+      parsed start_date (as day numbers); "Immediately" listings are a
+      separate set that counts as starting on the day of the query
+
+    Location queries keep the substring semantics of the original filters:
+    the query is matched against the distinct location values (memoized),
+    and the postings of every matching location are merged.
+
+    Single-row catalog changes are patched in with add_row / update_row /
+    remove_row (take row_keys(row) before changing the row): postings are
+    fixed up lazily and range indexes keep a delta of changed rows that is
+    folded in by a rebuild once it grows past RANGE_DELTA_LIMIT.
+
+    state() exports the posting lists and date-independent range indexes
+    as flat arrays; CatalogIndex(catalog, state) reuses them instead of
+    sorting again.
+    """
+
+    def __init__(self, catalog, state: Optional[Dict[str, np.ndarray]] = None):
+        self.catalog = catalog
+        live_rows = catalog.live_rows()
+        # Ids normally increase with the row (new listings get the next id), so
+        # id -> row is a binary search over catalog.ids; otherwise a dict
+        ids = catalog.ids
+        self.id_to_row = None
+        if not np.all(ids[1:] > ids[:-1]):
+            self.id_to_row = dict(zip(ids[live_rows].tolist(), live_rows.tolist()))
+
+        self.postings = {}
+        for field in POSTING_FIELDS:
+            column = getattr(catalog, field)
+            if state is not None:
+                flat = state[f'postings:{field}:rows'], state[f'postings:{field}:offsets']
+            else:
+                flat = build_postings(column.codes[live_rows], len(column.categories), live_rows)
+            self.postings[field] = PostingLists(*flat, self._category_check(column))
+
+        self._location_lower = []
+        self._location_cache = {}
+        self._sync_locations()
+
+        if state is not None:
+            flat = state['postings:skills:rows'], state['postings:skills:offsets']
+        else:
+            # Unique (skill, row) pairs, grouped by skill with rows ascending
+            skill_rows, skill_ids = catalog.skill_entries(live_rows)
+            pairs = np.unique(skill_ids.astype(np.int64) * max(1, catalog.num_rows) + skill_rows)
+            flat = build_postings(pairs // max(1, catalog.num_rows), len(catalog.skill_vocab),
+                                  pairs % max(1, catalog.num_rows))
+        self.skill_postings = PostingLists(*flat, self._skill_check)
+        self._skill_lookup = {}
+        self._skill_vocab_size = 0
+        self._sync_skills()
+
+        self._start_days = np.zeros(0, dtype=np.int64)
+        self._starts_immediately = np.zeros(0, dtype=bool)
+        self._sync_start_days()
+        self.ranges = {}
+        for field in STATIC_RANGE_FIELDS + ['start_date', IMMEDIATE_START_FIELD]:
+            if state is not None and field in STATIC_RANGE_FIELDS:
+                self.ranges[field] = SortedRangeIndex.from_sorted(
+                    state[f'range:{field}:rows'], state[f'range:{field}:values'],
+                    current=lambda rows, field=field: self._range_values(field, rows))
+            else:
+                self.ranges[field] = self._build_range(field)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Posting lists and static range indexes as flat arrays"""
+        state = {}
+        for field, postings in [*self.postings.items(), ('skills', self.skill_postings)]:
+            state[f'postings:{field}:rows'], state[f'postings:{field}:offsets'] = postings.flat()
+        for field in STATIC_RANGE_FIELDS:
+            range_index = self.ranges[field]
+            if range_index.num_changed:
+                range_index = self._build_range(field)
+            state[f'range:{field}:rows'] = range_index.rows
+            state[f'range:{field}:values'] = range_index.sorted_values
+        return state
+
+    def _category_check(self, column):
+        catalog = self.catalog
+        return lambda code, rows: (column.codes[rows] == code) & catalog.alive[rows]
+
+    def _skill_check(self, skill_id: int, rows: np.ndarray) -> np.ndarray:
+        owners, skill_ids = self.catalog.skill_entries(rows)
+        return np.isin(rows, owners[skill_ids == skill_id])
+
+    def _sync_locations(self) -> None:
+        categories = self.catalog.location.categories
+        if len(self._location_lower) < len(categories):
+            self._location_lower.extend(location.lower() for location in categories[len(self._location_lower):])
+            self._location_cache = {}
+
+    def _sync_skills(self) -> None:
+        vocab = self.catalog.skill_vocab
+        for skill_id in range(self._skill_vocab_size, len(vocab)):
+            self._skill_lookup.setdefault(vocab[skill_id].lower(), []).append(skill_id)
+        self._skill_vocab_size = len(vocab)
+
+    def _sync_start_days(self) -> None:
+        """Day number (or "starts immediately") per start_date category, extended for categories added since"""
+        categories = self.catalog.start_date.categories
+        if len(self._start_days) < len(categories):
+            days, immediate = [], []
+            for value in categories[len(self._start_days):]:
+                immediate.append(str(value).strip().lower() in IMMEDIATE_START_MARKERS)
+                parsed = None if immediate[-1] else parse_start_date(value)
+                days.append(MISSING_DAY if parsed is None else date_to_day(parsed))
+            self._start_days = np.concatenate([self._start_days, np.asarray(days, dtype=np.int64)])
+            self._starts_immediately = np.concatenate([self._starts_immediately, np.asarray(immediate, dtype=bool)])
+
+    def _range_values(self, field: str, rows: np.ndarray):
+        """(values, valid) of a range-indexed field for the given rows"""
+        catalog = self.catalog
+        if field == 'start_date':
+            values = self._start_days[catalog.start_date.codes[rows]]
+            return values, (values != MISSING_DAY) & catalog.alive[rows]
+        if field == IMMEDIATE_START_FIELD:
+            immediate = self._starts_immediately[catalog.start_date.codes[rows]]
+            return np.zeros(len(rows), dtype=np.int64), immediate & catalog.alive[rows]
+        return getattr(catalog, field)[rows], catalog.alive[rows]
+
+    def _build_range(self, field: str) -> SortedRangeIndex:
+        values, valid = self._range_values(field, np.arange(self.catalog.num_rows, dtype=np.int64))
+        return SortedRangeIndex(values, valid=valid, current=lambda rows: self._range_values(field, rows))
+
+    def row_keys(self, row: int) -> Dict[str, List[int]]:
+        """Posting keys a row is filed under (categorical codes and skill ids)"""
+        keys = {field: [int(getattr(self.catalog, field).codes[row])] for field in POSTING_FIELDS}
+        keys['skills'] = self.catalog.skill_entries([row])[1].tolist()
+        return keys
+
+    def add_row(self, row: int) -> None:
+        """Index a row just appended to the catalog"""
+        self._sync_locations()
+        self._sync_skills()
+        self._sync_start_days()
+        if self.id_to_row is not None:
+            self.id_to_row[int(self.catalog.ids[row])] = row
+        for field, codes in self.row_keys(row).items():
+            postings = self.skill_postings if field == 'skills' else self.postings[field]
+            for code in codes:
+                postings.add(code, row)
+        self._mark_ranges(row)
+
+    def update_row(self, row: int, previous_keys: Dict[str, List[int]]) -> None:
+        """Re-index a row after it was overwritten in the catalog"""
+        self._discard(previous_keys)
+        self.add_row(row)
+
+    def remove_row(self, row: int, previous_keys: Dict[str, List[int]]) -> None:
+        """Drop a row that was deleted from the catalog"""
+        if self.id_to_row is not None:
+            self.id_to_row.pop(int(self.catalog.ids[row]), None)
+        self._discard(previous_keys)
+        self._mark_ranges(row)
+
+    def _discard(self, keys: Dict[str, List[int]]) -> None:
+        for field, codes in keys.items():
+            postings = self.skill_postings if field == 'skills' else self.postings[field]
+            for code in codes:
+                postings.discard(code)
+
+    def _mark_ranges(self, row: int) -> None:
+        limit = max(RANGE_DELTA_LIMIT, self.catalog.num_rows // 20)
+        for field, range_index in self.ranges.items():
+            if range_index.num_changed >= limit:
+                self.ranges[field] = self._build_range(field)
+            else:
+                range_index.mark_changed(row)
+
+    def all_rows(self) -> np.ndarray:
+        return self.catalog.live_rows()
+
+    def row_of(self, internship_id: int) -> Optional[int]:
+        """Row position of an internship id, or None"""
+        if self.id_to_row is not None:
+            return self.id_to_row.get(internship_id)
+        ids = self.catalog.ids
+        row = int(np.searchsorted(ids, internship_id))
+        if row < len(ids) and ids[row] == internship_id and self.catalog.alive[row]:
+            return row
+        return None
+
+    def rows_for(self, field: str, value: str) -> np.ndarray:
+        """Rows whose categorical field equals value exactly"""
+        code = getattr(self.catalog, field).code_of(value)
+        return EMPTY_ROWS if code is None else self.postings[field][code]
+
+    def rows_for_any(self, field: str, predicate) -> np.ndarray:
+        """Rows whose categorical field satisfies predicate (evaluated per distinct value)"""
+        categories = getattr(self.catalog, field).categories
+        postings = self.postings[field]
+        return union_rows([postings[code] for code, value in enumerate(categories) if predicate(value)])
+
+    def remote_rows(self) -> np.ndarray:
+        return self.rows_for('work_mode', 'Remote')
+
+    def location_rows(self, location_query: str) -> np.ndarray:
+        """Rows whose location contains location_query (case-insensitive)"""
+        query = location_query.lower()
+        codes = self._location_cache.get(query)
+        if codes is None:
+            codes = [code for code, location in enumerate(self._location_lower) if query in location]
+            if len(self._location_cache) >= LOCATION_CACHE_SIZE:
+                self._location_cache.clear()
+            self._location_cache[query] = codes
+        return union_rows([self.postings['location'][code] for code in codes])
+
+    def skill_rows(self, skill: str) -> np.ndarray:
+        """Rows listing the skill (case-insensitive exact match)"""
+        skill_ids = self._skill_lookup.get(skill.lower(), [])
+        return union_rows([self.skill_postings[skill_id] for skill_id in skill_ids])
+
+    def range_rows(self, field: str, low=None, high=None) -> np.ndarray:
+        """Rows whose numeric field lies in [low, high]; start_date bounds are day numbers"""
+        rows = self.ranges[field].rows_between(low, high)
+        if field == 'start_date':
+            today = date_to_day(date.today())
+            if (low is None or low <= today) and (high is None or today <= high):
+                rows = union_rows([rows, self.ranges[IMMEDIATE_START_FIELD].rows_between()])
+        return rows
@@ -0,0 +1,148 @@
+from collections import deque
+from typing import List, Tuple
+
+# Declarative keyword tables for internship titles (keywords are lowercase substrings)
+
+# Keyword -> skill, grouped by category
+PROGRAMMING_SKILLS = {
+    'python': 'Python', 'java': 'Java', 'javascript': 'JavaScript', 
+    'react': 'React.js', 'angular': 'Angular', 'node': 'Node.js',
+    'flutter': 'Flutter', 'android': 'Android', 'ios': 'iOS',
+    'php': 'PHP', 'ruby': 'Ruby', 'go': 'Go', 'swift': 'Swift'
+}
+
+TECHNICAL_SKILLS = {
+    'machine learning': 'Machine Learning', 'ai': 'Artificial Intelligence',
+    'data science': 'Data Science', 'analytics': 'Data Analytics',
+    'blockchain': 'Blockchain', 'cybersecurity': 'Cybersecurity',
+    'devops': 'DevOps', 'cloud': 'Cloud Computing', 'aws': 'AWS',
+    'database': 'Database Management', 'sql': 'SQL'
+}
+
+DESIGN_SKILLS = {
+    'ui/ux': 'UI/UX Design', 'graphic design': 'Graphic Design',
+    'web design': 'Web Design', 'photoshop': 'Photoshop',
+    'figma': 'Figma', 'sketch': 'Sketch'
+}
+
+BUSINESS_SKILLS = {
+    'marketing': 'Digital Marketing', 'seo': 'SEO', 'content': 'Content Writing',
+    'sales': 'Sales', 'business': 'Business Development',
+    'finance': 'Finance', 'accounting': 'Accounting', 'hr': 'Human Resources'
+}
+
+ALL_SKILLS = {**PROGRAMMING_SKILLS, **TECHNICAL_SKILLS, **DESIGN_SKILLS, **BUSINESS_SKILLS}
+
+# Fallback skill when no specific keyword matched (first rule wins)
+GENERIC_SKILL_RULES = [
+    (['development', 'developer', 'programming'], 'Programming'),
+    (['design', 'creative'], 'Design'),
+    (['marketing', 'sales'], 'Marketing'),
+    (['content', 'writing'], 'Content Writing'),
+]
+
+# Title keywords -> domain (first rule wins)
+DOMAIN_RULES = [
+    (['software', 'development', 'programming', 'coding', 'tech'], 'Technology'),
+    (['design', 'ui', 'ux', 'graphic', 'creative'], 'Design'),
+    (['marketing', 'digital', 'social media', 'seo'], 'Marketing'),
+    (['finance', 'accounting', 'investment', 'banking'], 'Finance'),
+    (['hr', 'human resources', 'recruitment'], 'Human Resources'),
+    (['content', 'writing', 'journalism'], 'Content & Media'),
+    (['sales', 'business development'], 'Sales'),
+    (['data', 'analytics', 'research'], 'Data & Analytics'),
+]
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword list.
+
+    find() walks the text once and returns a bitmask with bit i set when
+    keywords[i] occurs anywhere in it (overlapping and nested occurrences
+    included), i.e. the same answer as testing `keyword in text` for every
+    keyword, at a cost independent of the number of keywords.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(keywords)
+        transitions = [{}]
+        outputs = [0]
+
+        # Trie
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                if char not in transitions[state]:
+                    transitions.append({})
+                    outputs.append(0)
+                    transitions[state][char] = len(transitions) - 1
+                state = transitions[state][char]
+            outputs[state] |= 1 << keyword_id
+
+        # Failure links in BFS order, folded into a complete transition table
+        failure = [0] * len(transitions)
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in transitions[state].items():
+                queue.append(next_state)
+                failure[next_state] = transitions[failure[state]].get(char, 0) if state else 0
+                outputs[next_state] |= outputs[failure[next_state]]
+            for char, inherited in transitions[failure[state]].items():
+                transitions[state].setdefault(char, inherited)
+
+        self._transitions = transitions
+        self._outputs = outputs
+
+    def find(self, text: str) -> int:
+        """Bitmask of the keywords occurring in text"""
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        found = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            found |= outputs[state]
+        return found
+
+    def mask(self, keywords: List[str]) -> int:
+        """Bitmask for a subset of the matcher's keywords"""
+        return sum(1 << self.keywords.index(keyword) for keyword in set(keywords))
+
+
+class TitleClassifier:
+    """Derives skills and domain from a title with one KeywordMatcher pass"""
+
+    def __init__(self, skill_keywords, generic_rules, domain_rules):
+        keywords = list(skill_keywords)
+        for words, _ in list(generic_rules) + list(domain_rules):
+            keywords.extend(word for word in words if word not in keywords)
+        self.matcher = KeywordMatcher(keywords)
+
+        self.skill_rules = [(self.matcher.mask([keyword]), skill) for keyword, skill in skill_keywords.items()]
+        self.skill_any = self.matcher.mask(list(skill_keywords))
+        self.generic_rules = [(self.matcher.mask(words), skill) for words, skill in generic_rules]
+        self.domain_rules = [(self.matcher.mask(words), domain) for words, domain in domain_rules]
+
+    def classify(self, title_lower: str) -> Tuple[List[str], str]:
+        """(skills, domain) for a lowercased title"""
+        found = self.matcher.find(title_lower)
+        return self.skills_from(found), self.domain_from(found)
+
+    def skills_from(self, found: int) -> List[str]:
+        if found & self.skill_any:
+            return [skill for keyword_mask, skill in self.skill_rules if found & keyword_mask]
+        for rule_mask, skill in self.generic_rules:
+            if found & rule_mask:
+                return [skill]
+        return ['General']
+
+    def domain_from(self, found: int) -> str:
+        for rule_mask, domain in self.domain_rules:
+            if found & rule_mask:
+                return domain
+        return 'General'
+
+
+TITLE_CLASSIFIER = TitleClassifier(ALL_SKILLS, GENERIC_SKILL_RULES, DOMAIN_RULES)
@@ -0,0 +1,355 @@
+import argparse
+import contextlib
+import http.client
+import json
+import math
+import os
+import queue
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from request_log import read_records
+
+# What generated load draws its profiles and search queries from
+LOAD_EDUCATIONS = ['B.Tech Computer Science', 'B.Tech Mechanical', 'B.Tech Civil', 'B.Tech Electrical', 'B.Com',
+                   'BBA', 'MBA', 'B.Sc Data Science', 'B.Des', 'BA Economics', 'Diploma', 'M.Tech']
+LOAD_SKILLS = ['python', 'java', 'sql', 'excel', 'machine learning', 'react', 'autocad', 'solidworks', 'marketing',
+               'sales', 'accounting', 'communication', 'figma', 'photoshop', 'cloud', 'tableau', 'finance', 'hr']
+LOAD_LOCATIONS = ['Any', 'Mumbai', 'Bangalore', 'Delhi', 'Pune', 'Chennai', 'Hyderabad', 'Remote', 'Kolkata']
+LOAD_STIPENDS = [0, 0, 5000, 10000, 15000, 20000]
+LOAD_QUERIES = ['python developer', 'data analyst', 'machine learning', 'mechanical design', 'civil site engineer',
+                'digital marketing', 'financial analyst', 'ui ux design', 'hr recruitment', 'cloud devops',
+                'sales executive', 'content writer', 'embedded systems', 'supply chain', 'web developer react']
+
+# Seconds a started server gets to answer /health
+SERVER_START_TIMEOUT = 300
+
+# Seconds before a request is given up on
+REQUEST_TIMEOUT = 60
+
+
+def generate_payloads(count: int, query_share: float, seed: int = 0) -> List[Tuple[str, bytes]]:
+    """count distinct (mode, JSON body) requests for /api/recommendations; mode is 'structured' or 'query'"""
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(count):
+        if rng.random() < query_share:
+            body = {'query': rng.choice(LOAD_QUERIES), 'top_k': rng.choice([5, 10])}
+            if rng.random() < 0.3:
+                body['location_preference'] = rng.choice(LOAD_LOCATIONS[1:])
+            payloads.append(('query', json.dumps(body).encode()))
+        else:
+            body = {'education': rng.choice(LOAD_EDUCATIONS), 'skills': rng.sample(LOAD_SKILLS, rng.randint(1, 5)),
+                    'location_preference': rng.choice(LOAD_LOCATIONS), 'min_stipend': rng.choice(LOAD_STIPENDS)}
+            if rng.random() < 0.2:
+                body['max_duration'] = rng.choice([3, 6])
+            payloads.append(('structured', json.dumps(body).encode()))
+    return payloads
+
+
+class HttpClient:
+    """One keep-alive connection (reopened when the server closes it), for one load thread"""
+
+    def __init__(self, base_url: str, timeout: float = REQUEST_TIMEOUT):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.connection = None
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None) -> int:
+        """Status code of the request (the body is read and discarded); raises OSError / HTTPException"""
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=body,
+                                        headers={'Content-Type': 'application/json'} if body is not None else {})
+                response = self.connection.getresponse()
+                response.read()
+                if response.will_close:
+                    self.close()
+                return response.status
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # A kept-alive connection the server already closed: retry once on a new one
+                self.close()
+                if attempt:
+                    raise
+            except Exception:
+                self.close()
+                raise
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list: the first value with fraction of the list at or below it"""
+    if not ordered:
+        return 0.0
+    # The small tolerance keeps float error (0.07 * 100 == 7.000000000000001) from moving the rank up by one
+    rank = math.ceil(fraction * len(ordered) - 1e-9)
+    return ordered[min(len(ordered) - 1, max(0, rank - 1))]
+
+
+class LoadResults:
+    """Latencies and statuses of every request, by mode"""
+
+    def __init__(self):
+        self.samples = []
+        self.statuses = {}
+        self.errors = {}
+        self.lags = []
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def add(self, mode: str, seconds: float, status: Optional[int] = None, error: Optional[str] = None,
+            lag: Optional[float] = None) -> None:
+        with self._lock:
+            self.samples.append((mode, seconds, status is not None and status < 500))
+            key = status if status is not None else 'error'
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            if error:
+                self.errors[error] = self.errors.get(error, 0) + 1
+            if lag is not None:
+                self.lags.append(lag)
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        groups = {'all': list(self.samples)}
+        for sample in self.samples:
+            groups.setdefault(sample[0], []).append(sample)
+        statuses = {str(key): value for key, value in sorted(self.statuses.items(), key=str)}
+        summary = {'elapsed_seconds': round(elapsed, 3), 'statuses': statuses, 'errors': self.errors, 'modes': {}}
+        for mode, samples in groups.items():
+            latencies = sorted(seconds * 1000 for _, seconds, _ in samples)
+            summary['modes'][mode] = {
+                'requests': len(samples),
+                'failed': sum(1 for _, _, ok in samples if not ok),
+                'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+                'p50_ms': round(percentile(latencies, 0.50), 3),
+                'p95_ms': round(percentile(latencies, 0.95), 3),
+                'p99_ms': round(percentile(latencies, 0.99), 3),
+                'max_ms': round(latencies[-1], 3) if latencies else 0.0,
+            }
+        if self.lags:
+            lags = sorted(lag * 1000 for lag in self.lags)
+            summary['start_lag'] = {'p50_ms': round(percentile(lags, 0.5), 3),
+                                    'p99_ms': round(percentile(lags, 0.99), 3),
+                                    'max_ms': round(lags[-1], 3)}
+        return summary
+
+
+def print_summary(title: str, summary: Dict[str, Any]) -> None:
+    total = summary['modes']['all']
+    print(f"\n📊 {title}: {total['requests']} requests in {summary['elapsed_seconds']:.2f}s, "
+          f"{total['throughput_rps']:.1f} req/s, {total['failed']} failed")
+    print(f"  {'mode':<12}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for mode, stats in sorted(summary['modes'].items(), key=lambda item: item[0] == 'all'):
+        print(f"  {mode:<12}{stats['requests']:>10}{stats['throughput_rps']:>10.1f}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    print(f"  status codes: {summary['statuses']}")
+    if summary['errors']:
+        print(f"  ❌ errors: {summary['errors']}")
+    if 'start_lag' in summary:
+        lag = summary['start_lag']
+        print(f"  behind schedule: p50 {lag['p50_ms']:.2f} ms, p99 {lag['p99_ms']:.2f} ms, max {lag['max_ms']:.2f} ms"
+              " (latencies are measured from the scheduled time)")
+
+
+def run_load(base_url: str, payloads: List[Tuple[str, bytes]], concurrency: int, duration: float,
+             max_requests: Optional[int] = None, seed: int = 0) -> LoadResults:
+    """Closed loop: concurrency threads each send a random payload as soon as their last one is answered"""
+    results = LoadResults()
+    deadline = time.perf_counter() + duration
+    sent = iter(range(max_requests)) if max_requests else None
+    sent_lock = threading.Lock()
+
+    def worker(number: int) -> None:
+        rng = random.Random(seed * 1000 + number)
+        client = HttpClient(base_url)
+        while time.perf_counter() < deadline:
+            if sent is not None:
+                with sent_lock:
+                    if next(sent, None) is None:
+                        break
+            mode, body = rng.choice(payloads)
+            started = time.perf_counter()
+            try:
+                status = client.request('POST', '/api/recommendations', body)
+                results.add(mode, time.perf_counter() - started, status)
+            except (OSError, http.client.HTTPException) as e:
+                results.add(mode, time.perf_counter() - started, error=type(e).__name__)
+        client.close()
+
+    threads = [threading.Thread(target=worker, args=(number,), daemon=True) for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.finished = time.perf_counter()
+    return results
+
+
+def replay(base_url: str, records: List[Dict[str, Any]], speed: float, concurrency: int) -> LoadResults:
+    """
+    Open loop: send the recorded requests at their recorded spacing divided
+    by speed, from up to concurrency threads. A request's latency counts
+    from when it was due, so a server that falls behind shows it.
+    """
+    results = LoadResults()
+    pending = queue.Queue()
+
+    def worker() -> None:
+        client = HttpClient(base_url)
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            due, record = item
+            mode = 'batch' if record['p'].split('?')[0].endswith('/batch') else \
+                'query' if '"query"' in record['b'] else 'structured'
+            started = time.perf_counter()
+            try:
+                status = client.request(record['m'], record['p'], record['b'].encode('utf-8'))
+                results.add(mode, time.perf_counter() - due, status, lag=started - due)
+            except (OSError, http.client.HTTPException) as e:
+                results.add(mode, time.perf_counter() - due, error=type(e).__name__, lag=started - due)
+        client.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    first = records[0]['t'] if records else 0
+    start = time.perf_counter()
+    results.started = start
+    for record in records:
+        due = start + (record['t'] - first) / 1000 / speed
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        pending.put((due, record))
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+    results.finished = time.perf_counter()
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+class LocalServer:
+    """serve.py or asgi.py started on a free local port for the duration of a test"""
+
+    def __init__(self, kind: str, workers: int = 1, threads: int = 8, env: Optional[Dict[str, str]] = None,
+                 log_path: Optional[str] = None):
+        self.port = _free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        command = [sys.executable, f'{kind}.py', '--bind', f'127.0.0.1:{self.port}']
+        if kind == 'serve':
+            command += ['--workers', str(workers), '--threads', str(threads)]
+        self.command = command
+        self.env = {**os.environ, **(env or {})}
+        self.log_path = log_path
+        self.process = None
+
+    def __enter__(self) -> 'LocalServer':
+        here = os.path.dirname(os.path.abspath(__file__))
+        output = open(self.log_path, 'ab') if self.log_path else subprocess.DEVNULL
+        self.process = subprocess.Popen(self.command, cwd=here, env=self.env, stdout=output, stderr=subprocess.STDOUT)
+        deadline = time.time() + SERVER_START_TIMEOUT
+        client = HttpClient(self.url, timeout=5)
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with status {self.process.returncode} during startup")
+            try:
+                if client.request('GET', '/health') == 200:
+                    client.close()
+                    print(f"✅ {' '.join(self.command[1:])} ready at {self.url}")
+                    return self
+            except (OSError, http.client.HTTPException):
+                pass
+            time.sleep(0.5)
+        self.__exit__()
+        raise RuntimeError(f"Server did not answer /health within {SERVER_START_TIMEOUT}s")
+
+    def __exit__(self, *exc_info) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def _target(args, extra_env: Optional[Dict[str, str]] = None):
+    """The started server (a context manager) or, with --url, a stand-in for the running one"""
+    if not args.start:
+        return contextlib.nullcontext(SimpleNamespace(url=args.url.rstrip('/')))
+    env = dict(extra_env or {})
+    if args.catalog:
+        from synthetic_catalog import ensure_catalog, parse_size
+        env['DATA_FILE'] = os.path.abspath(ensure_catalog(parse_size(args.catalog)))
+        env.setdefault('DATA_SNAPSHOT', '')
+    env.setdefault('LOG_LEVEL', 'WARNING')
+    return LocalServer(args.start, args.workers, args.threads, env, args.server_log)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='HTTP load test and request replay for /api/recommendations')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='server to test (ignored with --start)')
+    parser.add_argument('--start', choices=['serve', 'asgi'], help='start serve.py or asgi.py on a free port first')
+    parser.add_argument('--workers', type=int, default=1, help='serve.py workers (with --start serve)')
+    parser.add_argument('--threads', type=int, default=8, help='serve.py threads per worker (with --start serve)')
+    parser.add_argument('--catalog', help='started server loads a synthetic catalog of this many rows (e.g. 100k)')
+    parser.add_argument('--server-log', help="append the started server's output to this file")
+    parser.add_argument('--record', help='started server records request bodies to this file (REQUEST_RECORD_PATH)')
+    parser.add_argument('--json', help='also write the summary to this file')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='closed-loop load from generated profiles and queries')
+    run_parser.add_argument('--concurrency', type=int, default=8)
+    run_parser.add_argument('--duration', type=float, default=10.0, help='seconds')
+    run_parser.add_argument('--requests', type=int, help='stop after this many requests')
+    run_parser.add_argument('--query-share', type=float, default=0.3, help="fraction of 'query' (free-text) requests")
+    run_parser.add_argument('--distinct', type=int, default=500,
+                            help='distinct request bodies (fewer means more result cache hits)')
+    run_parser.add_argument('--seed', type=int, default=0)
+
+    replay_parser = commands.add_parser('replay', help='replay recorded requests at their recorded pace')
+    replay_parser.add_argument('log', help='file written through REQUEST_RECORD_PATH (.gz allowed)')
+    replay_parser.add_argument('--speed', type=float, default=1.0, help='N times the recorded rate')
+    replay_parser.add_argument('--concurrency', type=int, default=64, help='requests in flight at most')
+    args = parser.parse_args()
+
+    with _target(args, {'REQUEST_RECORD_PATH': os.path.abspath(args.record)} if args.record else None) as server:
+        if args.command == 'run':
+            payloads = generate_payloads(args.distinct, args.query_share, args.seed)
+            results = run_load(server.url, payloads, args.concurrency, args.duration, args.requests, args.seed)
+            title = f"run, concurrency {args.concurrency}"
+        else:
+            records = read_records(args.log)
+            print(f"🔁 Replaying {len(records)} requests at {args.speed:g}x")
+            results = replay(server.url, records, args.speed, args.concurrency)
+            title = f"replay at {args.speed:g}x"
+
+    summary = results.summary()
+    print_summary(title, summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
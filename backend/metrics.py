@@ -0,0 +1,218 @@
+import bisect
+import contextvars
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Prefix of every metric name
+METRIC_PREFIX = 'internships_'
+
+# Latency histogram bucket upper bounds in seconds (the Prometheus 'le' labels)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: object) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[object, ...]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Name, help text and label names; label values are passed positionally, in label order"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = METRIC_PREFIX + name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        # (names, values) rendered before the metric's own labels on every series, set by the registry
+        self.constant_labels = ((), ())
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+    def _labels(self, names: Tuple[str, ...], values: Tuple[object, ...]) -> str:
+        constant_names, constant_values = self.constant_labels
+        return _format_labels(constant_names + names, constant_values + values)
+
+
+class Counter(_Metric):
+    """Monotonic count per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values = {}
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f'{self.name}{self._labels(self.label_names, labels)} {_format_value(value)}'
+                                for labels, value in items]
+
+
+class Histogram(_Metric):
+    """Bucketed observations (cumulative on output), with their sum and count, per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._series = {}
+
+    def observe(self, value: float, *label_values) -> None:
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][position] += 1
+            series[1] += value
+
+    def count(self, *label_values) -> int:
+        series = self._series.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = self.header()
+        names = self.label_names + ('le',)
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{self._labels(names, labels + (_format_value(bound),))} {cumulative}')
+            lines.append(f'{self.name}_sum{self._labels(self.label_names, labels)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{self._labels(self.label_names, labels)} {cumulative}')
+        return lines
+
+
+class Gauge(_Metric):
+    """Current values, read at scrape time from a callback returning {label values: value}"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 collect: Optional[Callable[[], Dict[Tuple[object, ...], float]]] = None):
+        super().__init__(name, documentation, labels)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        try:
+            values = self.collect() if self.collect is not None else {}
+        except Exception:
+            values = {}
+        return self.header() + [f'{self.name}{self._labels(self.label_names, labels)} {_format_value(value)}'
+                                for labels, value in sorted(values.items(), key=lambda item: item[0])]
+
+
+class CounterFunction(Gauge):
+    """A counter kept elsewhere (such as ResultCache.hits), read at scrape time"""
+
+    kind = 'counter'
+
+
+class Registry:
+    """
+    The metrics of this process, rendered in the Prometheus text exposition format.
+
+    set_constant_labels() adds labels to every series, such as the worker
+    pid under serve.py, so the series of several processes stay apart.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.constant_labels = ((), ())
+
+    def register(self, metric: _Metric) -> _Metric:
+        metric.constant_labels = self.constant_labels
+        self.metrics.append(metric)
+        return metric
+
+    def set_constant_labels(self, **labels: object) -> None:
+        self.constant_labels = (tuple(labels), tuple(labels.values()))
+        for metric in self.metrics:
+            metric.constant_labels = self.constant_labels
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Content type of Registry.render()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+registry = Registry()
+
+# Engine work per operation ('recommend', 'batch', 'search', 'similar') and stage:
+# filter (hard filters), score, rank (top-k selection), materialize (result dicts), serialize (JSON)
+STAGE_SECONDS = registry.register(Histogram(
+    'stage_duration_seconds', 'Time spent per engine operation and stage', ('operation', 'stage')))
+
+ENGINE_ERRORS = registry.register(Counter(
+    'engine_errors_total', 'Engine operations that failed and returned an empty result', ('operation',)))
+
+
+# Stage -> seconds summed over the current request's laps (for Server-Timing); None outside a request
+_request_stages = contextvars.ContextVar('request_stages', default=None)
+
+
+def collect_request_stages() -> Dict[str, float]:
+    """Start summing this request's StageTimer laps into a fresh dict, which is returned"""
+    stages = {}
+    _request_stages.set(stages)
+    return stages
+
+
+def stop_collecting_stages() -> None:
+    _request_stages.set(None)
+
+
+class StageTimer:
+    """
+    Times consecutive stages of one engine operation: each lap() records
+    the time since the previous lap (or since the timer was created), and
+    adds it to the current request's stages when they are being collected.
+    """
+
+    __slots__ = ('operation', 'last')
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        seconds = now - self.last
+        STAGE_SECONDS.observe(seconds, self.operation, stage)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + seconds
+        self.last = now
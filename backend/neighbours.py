@@ -0,0 +1,609 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from catalog import grow_buffer
+from scoring import popcount, top_k_positions
+
+# Neighbours stored per listing; larger requests are computed on demand
+NEIGHBOUR_COUNT = 20
+
+# Components of the similarity between two listings, in the order they are accumulated
+SIMILARITY_WEIGHTS = [('text', 0.4), ('domain', 0.24), ('skills', 0.24), ('work_mode', 0.12)]
+
+# Catalogs with at most this many signature groups get an exact table: every pair of groups is scored
+NEIGHBOUR_EXACT_GROUPS = 1024
+
+# Larger catalogs: each pass orders the groups by domain, skill set, work mode and a random-projection hash
+# of their text, cuts that order into blocks of NEIGHBOUR_BLOCK_SIZE and scores every pair within a block;
+# the best neighbours found over NEIGHBOUR_PASSES passes (alternate passes shift the blocks by half) are kept
+NEIGHBOUR_BLOCK_SIZE = 128
+NEIGHBOUR_PASSES = 8
+NEIGHBOUR_HASH_BITS = 16
+
+# Chunk size of the table build, in (target group, candidate group) cells
+NEIGHBOUR_BLOCK_CELLS = 1 << 22
+
+# On-demand lookups (more than NEIGHBOUR_COUNT neighbours) remembered until the next edit
+NEIGHBOUR_MEMO_SIZE = 1024
+
+# Arrays of a table, as stored in a snapshot; the per-group ones grow as edits add groups
+NEIGHBOUR_STATE_ARRAYS = ['group_of', 'group_rows', 'group_keys', 'group_hashes', 'pass_orders', 'member_indptr',
+                          'members', 'listed_indptr', 'listed_groups', 'table_rows', 'table_scores']
+GROWING_ARRAYS = ['group_rows', 'group_keys', 'group_hashes', 'table_rows', 'table_scores']
+
+
+def combine_similarity(components: Dict[str, np.ndarray], size) -> np.ndarray:
+    """Weighted similarity, accumulated in SIMILARITY_WEIGHTS order so both build paths agree bit for bit"""
+    total = np.zeros(size)
+    for name, weight in SIMILARITY_WEIGHTS:
+        total = total + components[name] * weight
+    return total
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: well-spread 64-bit keys for small integers (wraps around by design)"""
+    z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _listed_by(table_rows: np.ndarray, num_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(indptr, groups): the table rows listing catalog row r are groups[indptr[r]:indptr[r + 1]]"""
+    groups = np.repeat(np.arange(len(table_rows)), table_rows.shape[1])
+    entries = table_rows.ravel()
+    listed = entries >= 0
+    groups, entries = groups[listed], entries[listed]
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(entries, minlength=num_rows))]).astype(np.int64)
+    return indptr, groups[np.argsort(entries, kind='stable')]
+
+
+def _best_per_row(candidates: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """The k best (candidate, score) of each row, by score descending then candidate; missing entries are -1"""
+    width = candidates.shape[1]
+    if width > k:
+        # Everything above the k-th score, then as many of the entries tied with it as fit, in row order
+        threshold = np.partition(scores, width - k, axis=1)[:, width - k][:, None]
+        above = scores > threshold
+        tied = scores == threshold
+        keep = above | (tied & (np.cumsum(tied, axis=1) <= k - above.sum(axis=1, keepdims=True)))
+        candidates = candidates[keep].reshape(-1, k)
+        scores = scores[keep].reshape(-1, k)
+    order = np.argsort(candidates, axis=1, kind='stable')
+    candidates, scores = np.take_along_axis(candidates, order, 1), np.take_along_axis(scores, order, 1)
+    order = np.argsort(-scores, axis=1, kind='stable')
+    candidates, scores = np.take_along_axis(candidates, order, 1), np.take_along_axis(scores, order, 1)
+    missing = ~np.isfinite(scores)
+    candidates[missing] = -1
+    return candidates, scores
+
+
+class NeighbourIndex:
+    """
+    Precomputed "similar listings" table.
+
+    Similarity of two listings is the TF-IDF cosine of their text plus
+    domain equality, shared skills (|common| / longer skill list) and
+    work_mode equality, weighted by SIMILARITY_WEIGHTS. Listings with the
+    same title, company, domain, skills and work mode (and an unpatched
+    text vector) are identical for every component, so the table is built
+    over these signature groups: the top NEIGHBOUR_COUNT + 1 rows of each
+    group are stored and a lookup drops the listing itself.
+
+    Up to NEIGHBOUR_EXACT_GROUPS groups every pair is scored, so the table
+    is exact. Above that each group is only compared with the groups it
+    shares a block with in one of NEIGHBOUR_PASSES orderings (see
+    NEIGHBOUR_BLOCK_SIZE): the build is linear in the catalog size and
+    finds nearly all of the best neighbours; every stored score is exact.
+
+    Edits keep the table current at a cost that does not grow with the
+    catalog: the changed listing becomes a group of its own, scored against
+    its candidates (every group of an exact table, else the groups around
+    it in each pass ordering, plus the groups added by edits). It joins the
+    rows of the candidates it now outranks, and the rows that listed it
+    (found through a row -> listing groups map) are rescored from their own
+    candidates on their next lookup.
+    """
+
+    def __init__(self, catalog, index, text_index, state: Optional[Dict[str, Any]] = None,
+                 num_neighbours: int = NEIGHBOUR_COUNT):
+        self.catalog = catalog
+        self.index = index
+        self.text_index = text_index
+        self.num_neighbours = num_neighbours
+        self._lock = threading.Lock()
+        if state is not None and int(state['num_neighbours']) == num_neighbours:
+            self._reset_edits()
+            for name in NEIGHBOUR_STATE_ARRAYS:
+                setattr(self, name, state[name])
+            self.hashed_terms = int(state['hashed_terms'])
+            self.num_groups = self.built_groups = len(self.group_rows)
+        else:
+            self.build()
+
+    def _reset_edits(self) -> None:
+        self.edited = False
+        self._dirty = set()
+        self._memo = OrderedDict()
+        self._planes = None
+        self._listed_extra = {}  # row -> groups whose table row took it in after the build
+        self._departed = {}  # built group -> members that were edited or deleted since
+
+    def state(self) -> Dict[str, Any]:
+        """Arrays of an unedited table for NeighbourIndex(..., state=...)"""
+        if self.edited:
+            raise ValueError('neighbour table was edited in place; rebuild it from the source data first')
+        state = {name: getattr(self, name) for name in NEIGHBOUR_STATE_ARRAYS}
+        state['group_of'] = self.group_of[:self.catalog.num_rows]
+        state['num_neighbours'] = self.num_neighbours
+        state['hashed_terms'] = self.hashed_terms
+        return state
+
+    @property
+    def width(self) -> int:
+        return self.num_neighbours + 1
+
+    def _signatures(self, rows: np.ndarray) -> np.ndarray:
+        """One int64 key row per listing: category codes, skill ids (padded) and an unpatched-text flag"""
+        catalog = self.catalog
+        lengths = catalog.skill_len[rows]
+        width = int(lengths.max(initial=0))
+        skills = np.full((len(rows), width), -1, dtype=np.int64)
+        owners, skill_ids = catalog.skill_entries(rows)
+        positions = np.arange(len(owners)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        skills[np.repeat(np.arange(len(rows)), lengths), positions] = skill_ids
+        # Patched text vectors may differ from the fitted vector of the same text: keep those rows apart
+        patched = np.full(len(rows), -1, dtype=np.int64)
+        if self.text_index is not None and self.text_index._overrides:
+            override_rows = self.text_index._overridden()[0]
+            overridden = np.isin(rows, override_rows)
+            patched[overridden] = rows[overridden]
+        codes = [getattr(catalog, field).codes[rows].astype(np.int64)
+                 for field in ('title', 'company', 'domain', 'work_mode')]
+        return np.column_stack(codes + [patched, skills])
+
+    def build(self) -> None:
+        """Group the live rows by signature and store every group's top neighbours"""
+        catalog = self.catalog
+        rows = catalog.live_rows()
+        self._reset_edits()
+        self.group_of = np.full(catalog.num_rows, -1, dtype=np.int64)
+        self.group_rows = np.zeros(0, dtype=np.int64)
+        self.group_keys = np.zeros((0, 3), dtype=np.int64)
+        self.group_hashes = np.zeros((0, 0), dtype=np.int64)
+        self.pass_orders = np.zeros((0, 0), dtype=np.int64)
+        self.member_indptr = np.zeros(1, dtype=np.int64)
+        self.members = np.zeros(0, dtype=np.int64)
+        self.table_rows = np.zeros((0, self.width), dtype=np.int64)
+        self.table_scores = np.zeros((0, self.width))
+        self.listed_indptr, self.listed_groups = _listed_by(self.table_rows, catalog.num_rows)
+        self.hashed_terms = self.text_index.matrix.shape[1] if self.text_index is not None else 0
+        self.num_groups = self.built_groups = 0
+        if len(rows) == 0:
+            return
+
+        # Group equal signatures, numbered by their first row so group order is row order
+        signatures = self._signatures(rows)
+        order = np.lexsort(signatures.T[::-1])
+        starts = np.concatenate([[True], (np.diff(signatures[order], axis=0) != 0).any(axis=1)])
+        group_of = np.empty(len(rows), dtype=np.int64)
+        group_of[order] = np.cumsum(starts) - 1
+        first = np.full(starts.sum(), len(rows), dtype=np.int64)
+        np.minimum.at(first, group_of, np.arange(len(rows)))
+        renumber = np.empty(len(first), dtype=np.int64)
+        renumber[np.argsort(first)] = np.arange(len(first))
+        group_of = renumber[group_of]
+        self.group_of[rows] = group_of
+        self.group_rows = rows[np.sort(first)]
+        self.num_groups = self.built_groups = len(self.group_rows)
+        # Members of each group, ascending
+        self.members = rows[np.argsort(group_of, kind='stable')]
+        self.member_indptr = np.concatenate([[0], np.cumsum(np.bincount(group_of))]).astype(np.int64)
+
+        features = self._features(self.group_rows)
+        self.group_keys = np.column_stack([features['domain'], features['skill_key'],
+                                           features['work_mode']]).astype(np.int64)
+        best_groups, best_scores = self._best_groups(features)
+        self.table_rows, self.table_scores = self._expand_members(rows, group_of, best_groups, best_scores)
+        self.listed_indptr, self.listed_groups = _listed_by(self.table_rows, catalog.num_rows)
+
+    def _features(self, rows: np.ndarray) -> Dict[str, Any]:
+        """Per-row inputs of the similarity components"""
+        catalog = self.catalog
+        owners, skill_ids = catalog.skill_entries(rows)
+        positions = np.repeat(np.arange(len(rows)), catalog.skill_len[rows])
+        skill_masks = np.zeros((len(rows), max(1, (len(catalog.skill_vocab) + 63) // 64)), dtype=np.uint64)
+        np.bitwise_or.at(skill_masks, (positions, skill_ids // 64),
+                         np.left_shift(np.uint64(1), (skill_ids % 64).astype(np.uint64)))
+        return {
+            'text': self.text_index.row_vectors(rows) if self.text_index is not None else None,
+            'domain': catalog.domain.codes[rows],
+            'work_mode': catalog.work_mode.codes[rows],
+            'skill_masks': skill_masks,
+            'skill_key': self._skill_keys(rows),
+            'skill_len': catalog.skill_len[rows],
+        }
+
+    def _skill_keys(self, rows) -> np.ndarray:
+        """One int64 per row, equal for rows with the same set of skills"""
+        catalog = self.catalog
+        rows = np.asarray(rows, dtype=np.int64)
+        vocab = max(1, len(catalog.skill_vocab))
+        pairs = np.unique(np.repeat(np.arange(len(rows)), catalog.skill_len[rows]) * vocab
+                          + catalog.skill_entries(rows)[1])
+        keys = np.zeros(len(rows), dtype=np.uint64)
+        np.add.at(keys, pairs // vocab, _mix64(pairs % vocab))
+        return keys.view(np.int64)
+
+    def _pass_planes(self) -> List[np.ndarray]:
+        """Random projections of the text hash of each pass (the same for every build)"""
+        if self._planes is None:
+            rng = np.random.default_rng(0)
+            self._planes = [rng.standard_normal((self.hashed_terms, NEIGHBOUR_HASH_BITS))
+                            for _ in range(len(self.pass_orders))]
+        return self._planes
+
+    def _text_hashes(self, vectors) -> np.ndarray:
+        """(rows, passes) text hashes of the given text vectors"""
+        weights = 1 << np.arange(NEIGHBOUR_HASH_BITS)
+        hashes = [((vectors[:, :self.hashed_terms] @ planes) > 0) @ weights for planes in self._pass_planes()]
+        return np.column_stack(hashes).astype(np.int64) if hashes else np.zeros((vectors.shape[0], 0), np.int64)
+
+    def _best_groups(self, features: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """(groups, groups) top self.width candidate groups and scores of every group"""
+        num_groups = len(features['domain'])
+        self.pass_orders = np.zeros((0, num_groups), dtype=np.int64)
+        self.group_hashes = np.zeros((num_groups, 0), dtype=np.int64)
+        if num_groups <= NEIGHBOUR_EXACT_GROUPS:
+            return self._pass_scores(features, np.arange(num_groups), num_groups, 0)
+
+        self.pass_orders = np.zeros((NEIGHBOUR_PASSES, num_groups), dtype=np.int64)
+        self.group_hashes = (self._text_hashes(features['text']) if features['text'] is not None
+                             else np.zeros((num_groups, NEIGHBOUR_PASSES), dtype=np.int64))
+        best = None
+        for number in range(NEIGHBOUR_PASSES):
+            order = self.pass_orders[number] = np.lexsort((self.group_hashes[:, number], features['work_mode'],
+                                                           features['skill_key'], features['domain']))
+            found = self._pass_scores(features, order, NEIGHBOUR_BLOCK_SIZE, NEIGHBOUR_BLOCK_SIZE // 2 * (number % 2))
+            if best is not None:
+                # Candidates found in both passes carry the same exact score: keep one of them
+                groups = np.concatenate([best[0], found[0]], axis=1)
+                scores = np.concatenate([best[1], found[1]], axis=1)
+                order = np.argsort(groups, axis=1, kind='stable')
+                groups, scores = np.take_along_axis(groups, order, 1), np.take_along_axis(scores, order, 1)
+                repeated = np.zeros(groups.shape, dtype=bool)
+                repeated[:, 1:] = (groups[:, 1:] == groups[:, :-1]) & (groups[:, 1:] >= 0)
+                scores[repeated] = -np.inf
+                found = _best_per_row(groups, scores, self.width)
+            best = found
+        return best
+
+    def _pass_scores(self, features: Dict[str, Any], order: np.ndarray, block_size: int,
+                     shift: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Best candidate groups of every group, scoring the pairs within blocks of order"""
+        num_groups = len(order)
+        # Blocks padded to block_size slots (-1 = empty); the first block holds block_size - shift groups
+        slots = np.full(-(-(num_groups + shift) // block_size) * block_size, -1, dtype=np.int64)
+        slots[shift:shift + num_groups] = order
+        blocks = slots.reshape(-1, block_size)
+        best_groups = np.full((num_groups, self.width), -1, dtype=np.int64)
+        best_scores = np.full((num_groups, self.width), -np.inf)
+
+        chunk = max(1, NEIGHBOUR_BLOCK_CELLS // (block_size * block_size))
+        for start in range(0, len(blocks), chunk):
+            members = blocks[start:start + chunk]
+            scores = self._block_scores(features, members).reshape(-1, block_size)
+            candidates = np.broadcast_to(members[:, None, :], (len(members), block_size, block_size))
+            groups, scores = _best_per_row(candidates.reshape(-1, block_size), scores, self.width)
+            targets = members.ravel()
+            filled = targets >= 0
+            best_groups[targets[filled]] = groups[filled]
+            best_scores[targets[filled]] = scores[filled]
+        return best_groups, best_scores
+
+    @staticmethod
+    def _block_scores(features: Dict[str, Any], members: np.ndarray) -> np.ndarray:
+        """(blocks, target, candidate) similarity of the groups within each block; -inf for empty slots"""
+        num_blocks, block_size = members.shape
+        size = (num_blocks, block_size, block_size)
+        groups = np.maximum(members, 0)
+        text = np.zeros(size)
+        if features['text'] is not None:
+            # Terms are moved to a column range per block, so one product scores all pairs within the blocks;
+            # candidates @ targets.T, like TextIndex.similarities_to, so sums run in the same order
+            filled = np.flatnonzero(members.ravel() >= 0)
+            vectors = features['text'][members.ravel()[filled]]
+            columns = (vectors.indices.astype(np.int64)
+                       + np.repeat(filled // block_size * vectors.shape[1], np.diff(vectors.indptr)))
+            separated = sp.csr_matrix((vectors.data, columns, vectors.indptr),
+                                      shape=(len(filled), num_blocks * vectors.shape[1]))
+            products = (separated @ separated.T).tocoo()
+            text.reshape(-1, block_size)[filled[products.col], filled[products.row] % block_size] = products.data
+
+        masks = features['skill_masks'][groups]
+        common = np.zeros(size, dtype=np.int64)
+        for word in range(masks.shape[2]):
+            common += popcount(masks[:, :, None, word] & masks[:, None, :, word])
+        skill_len = features['skill_len'][groups]
+        longest = np.maximum(skill_len[:, :, None], skill_len[:, None, :])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shared = np.where(longest > 0, common / longest, 0.0)
+        domain = features['domain'][groups]
+        work_mode = features['work_mode'][groups]
+        components = {
+            'text': text,
+            'domain': domain[:, :, None] == domain[:, None, :],
+            'skills': shared,
+            'work_mode': work_mode[:, :, None] == work_mode[:, None, :],
+        }
+        scores = combine_similarity(components, size)
+        scores[np.broadcast_to((members < 0)[:, None, :], size)] = -np.inf
+        return scores
+
+    def _expand_members(self, rows: np.ndarray, group_of: np.ndarray, best_groups: np.ndarray,
+                        best_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Table rows from the best groups of each group: their members, best first, ties by row"""
+        width = self.width
+        sizes = np.bincount(group_of, minlength=len(best_groups))
+        if sizes.max(initial=0) <= 1:
+            found = best_groups >= 0
+            return np.where(found, self.group_rows[np.maximum(best_groups, 0)], -1), np.where(found, best_scores, 0.0)
+
+        # Members of each group in ascending row order; only the first `width` of a group can make it into a row
+        order = np.argsort(group_of, kind='stable')
+        members = rows[order]
+        member_offsets = np.concatenate([[0], np.cumsum(sizes)])
+        targets = np.repeat(np.arange(len(best_groups)), width)
+        groups, scores = best_groups.ravel(), best_scores.ravel()
+        found = groups >= 0
+        targets, groups, scores = targets[found], groups[found], scores[found]
+        counts = np.minimum(sizes[groups], width)
+        entry_rows = members[np.repeat(member_offsets[groups], counts)
+                             + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)]
+        targets, scores = np.repeat(targets, counts), np.repeat(scores, counts)
+        order = np.lexsort((entry_rows, -scores, targets))
+        targets, entry_rows, scores = targets[order], entry_rows[order], scores[order]
+        rank = np.arange(len(targets)) - np.searchsorted(targets, targets)
+        keep = rank < width
+        table_rows = np.full((len(best_groups), width), -1, dtype=np.int64)
+        table_scores = np.zeros((len(best_groups), width))
+        table_rows[targets[keep], rank[keep]] = entry_rows[keep]
+        table_scores[targets[keep], rank[keep]] = scores[keep]
+        return table_rows, table_scores
+
+    def refresh_rows(self, rows: List[int]) -> None:
+        """Listings were added, changed or deleted: update the table rows they affect"""
+        with self._lock:
+            self._memo = OrderedDict()
+            filled = len(self.group_of)
+            self.group_of = grow_buffer(self.group_of, self.catalog.num_rows)
+            self.group_of[filled:] = -1
+            for name in GROWING_ARRAYS:
+                # Snapshot tables are read-only memory maps: copied (with spare capacity) before the first edit
+                setattr(self, name, grow_buffer(getattr(self, name), self.num_groups))
+            self.edited = True
+            for row in rows:
+                self._refresh_row(int(row))
+
+    def _refresh_row(self, row: int) -> None:
+        # Table rows listing the row (its own group's included) are rescored on their next lookup
+        self._dirty.update(self._listing_groups(row))
+        group = int(self.group_of[row])
+        if group >= 0:
+            self.group_of[row] = -1
+            if group < self.built_groups:
+                self._departed[group] = self._departed.get(group, 0) + 1
+            if self.group_rows[group] == row:
+                # The group is named after its first row: pass that on to another member (if any)
+                members = self._member_rows(np.array([group]))
+                self.group_rows[group] = members[0] if len(members) else -1
+        if not self.catalog.alive[row]:
+            return
+
+        # A changed or added listing is a group of its own, scored against its candidates
+        group = self._add_group(row)
+        candidates = self._candidate_groups(group)
+        rows = self._member_rows(candidates)
+        self._set_table_row(group, rows, self._scores_to(row, rows))
+
+        # Similarity is symmetric: the listing joins the rows of candidates whose last entry it beats
+        candidates = candidates[(candidates != group) & (self.group_rows[candidates] >= 0)]
+        scores = self._scores_to(row, self.group_rows[candidates], reverse=True)
+        last_rows, last_scores = self.table_rows[candidates, -1], self.table_scores[candidates, -1]
+        beats = (last_rows < 0) | (scores > last_scores) | ((scores == last_scores) & (row < last_rows))
+        for other_group, score in zip(candidates[beats].tolist(), scores[beats].tolist()):
+            if other_group in self._dirty:
+                continue
+            entries = self.table_rows[other_group]
+            filled = int((entries >= 0).sum())
+            slot = 0
+            while slot < filled and (self.table_scores[other_group, slot] > score
+                                     or (self.table_scores[other_group, slot] == score and entries[slot] < row)):
+                slot += 1
+            self.table_rows[other_group, slot + 1:] = self.table_rows[other_group, slot:-1].copy()
+            self.table_scores[other_group, slot + 1:] = self.table_scores[other_group, slot:-1].copy()
+            self.table_rows[other_group, slot] = row
+            self.table_scores[other_group, slot] = score
+            self._listed_extra.setdefault(row, set()).add(other_group)
+
+    def _listing_groups(self, row: int) -> List[int]:
+        """Groups whose table row lists row"""
+        groups = set(self._listed_extra.get(row, ()))
+        if row < len(self.listed_indptr) - 1:
+            groups.update(self.listed_groups[self.listed_indptr[row]:self.listed_indptr[row + 1]].tolist())
+        return [group for group in groups if (self.table_rows[group] == row).any()]
+
+    def _add_group(self, row: int) -> int:
+        """New single-row group for an edited listing"""
+        group = self.num_groups
+        for name in GROWING_ARRAYS:
+            # Capacity doubles when full, so adding a group rarely copies the table
+            setattr(self, name, grow_buffer(getattr(self, name), group + 1))
+        self.num_groups += 1
+        self.group_of[row] = group
+        self.group_rows[group] = row
+        self.group_keys[group] = [self.catalog.domain.codes[row], self._skill_keys([row])[0],
+                                  self.catalog.work_mode.codes[row]]
+        if len(self.pass_orders):
+            vector = self.text_index.row_vectors([row]) if self.text_index is not None else sp.csr_matrix((1, 0))
+            self.group_hashes[group] = self._text_hashes(vector)[0]
+        return group
+
+    def _candidate_groups(self, group: int) -> np.ndarray:
+        """
+        Groups (ascending) a group is scored against: every group of an
+        exact table, else the NEIGHBOUR_BLOCK_SIZE groups around it in each
+        pass ordering plus every group added by edits
+        """
+        if len(self.pass_orders) == 0:
+            return np.arange(self.num_groups)
+        half = NEIGHBOUR_BLOCK_SIZE // 2
+        found = [np.arange(self.built_groups, self.num_groups)]
+        for number, order in enumerate(self.pass_orders):
+            position = self._locate(number, group)
+            found.append(order[max(0, position - half):position + half])
+        return np.unique(np.concatenate(found))
+
+    def _locate(self, number: int, group: int) -> int:
+        """Position of a group's sort key in the ordering of pass number (binary search)"""
+        def key(of):
+            return (*self.group_keys[of].tolist(), int(self.group_hashes[of, number]))
+
+        order = self.pass_orders[number]
+        target = key(group)
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if key(order[middle]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _member_rows(self, groups: np.ndarray) -> np.ndarray:
+        """Current members of the given (ascending) groups, the first self.width of each, ascending"""
+        built = groups[groups < self.built_groups]
+        allowance = self.width + np.array([self._departed.get(group, 0) for group in built.tolist()], dtype=np.int64)
+        counts = np.minimum(self.member_indptr[built + 1] - self.member_indptr[built], allowance)
+        owners = np.repeat(built, counts)
+        rows = self.members[np.repeat(self.member_indptr[built], counts)
+                            + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)]
+        current = self.group_of[rows] == owners
+        owners, rows = owners[current], rows[current]
+        rows = rows[np.arange(len(owners)) - np.searchsorted(owners, owners) < self.width]
+        added = groups[groups >= self.built_groups]
+        added = self.group_rows[added][self.group_of[np.maximum(self.group_rows[added], 0)] == added]
+        return np.sort(np.concatenate([rows, added]))
+
+    def _set_table_row(self, group: int, rows: np.ndarray, scores: np.ndarray) -> None:
+        """Store the best of (ascending) rows as the table row of group, best first, ties by row"""
+        best = top_k_positions(scores, self.width)
+        self.table_rows[group] = -1
+        self.table_scores[group] = 0.0
+        self.table_rows[group, :len(best)] = rows[best]
+        self.table_scores[group, :len(best)] = scores[best]
+        for row in rows[best].tolist():
+            self._listed_extra.setdefault(row, set()).add(group)
+
+    def _rescore_group(self, group: int) -> None:
+        """Table row of a group whose listed rows changed, from its candidates"""
+        row = self.group_rows[group]
+        if row < 0:
+            self.table_rows[group] = -1
+            self.table_scores[group] = 0.0
+        else:
+            rows = self._member_rows(self._candidate_groups(group))
+            self._set_table_row(group, rows, self._scores_to(int(row), rows))
+        self._dirty.discard(group)
+
+    def similar(self, row: int, count: int = NEIGHBOUR_COUNT) -> List[Tuple[int, float]]:
+        """(row, similarity) of the count listings most similar to row, best first, ties by row"""
+        count = max(0, count)
+        group = self.group_of[row] if 0 <= row < len(self.group_of) else -1
+        if count <= self.num_neighbours and group >= 0:
+            if group in self._dirty:
+                with self._lock:
+                    if group in self._dirty:
+                        self._rescore_group(group)
+            entries, scores = self.table_rows[group], self.table_scores[group]
+            keep = (entries != row) & (entries >= 0)
+            return list(zip(entries[keep][:count].tolist(), scores[keep][:count].tolist()))
+
+        key = (row, count)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        similar = self._similar_to_row(row, count)
+        with self._lock:
+            self._memo[key] = similar
+            if len(self._memo) > NEIGHBOUR_MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return similar
+
+    def _scores_to(self, row: int, rows: np.ndarray, reverse: bool = False) -> np.ndarray:
+        """Similarity of row to each of rows, summed like _row_scores(row, reverse)"""
+        catalog = self.catalog
+        text = np.zeros(len(rows))
+        if self.text_index is not None and len(rows):
+            vector = self.text_index.row_vectors([row])
+            others = self.text_index.row_vectors(rows)
+            text = ((vector @ others.T) if reverse else (others @ vector.T).T).toarray().ravel()
+        vocab = max(1, len(catalog.skill_vocab))
+        pairs = np.unique(np.repeat(np.arange(len(rows)), catalog.skill_len[rows]) * vocab
+                          + catalog.skill_entries(rows)[1])
+        shared_pairs = pairs[np.isin(pairs % vocab, catalog.skill_entries([row])[1])]
+        common = np.bincount(shared_pairs // vocab, minlength=len(rows))
+        longest = np.maximum(catalog.skill_len[row], catalog.skill_len[rows])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shared = np.where(longest > 0, common / longest, 0.0)
+        components = {
+            'text': text,
+            'domain': catalog.domain.codes[rows] == catalog.domain.codes[row],
+            'skills': shared,
+            'work_mode': catalog.work_mode.codes[rows] == catalog.work_mode.codes[row],
+        }
+        return combine_similarity(components, len(rows))
+
+    def _row_scores(self, row: int, reverse: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (live rows, similarity to row), the row itself included. Text dot
+        products run over the terms of the other row, as in a lookup of row;
+        reverse=True runs them over the terms of row, as in the lookups of the
+        other rows (the two can differ in the last bit).
+        """
+        catalog = self.catalog
+        rows = catalog.live_rows()
+        text = np.zeros(catalog.num_rows)
+        if self.text_index is not None:
+            vector = self.text_index.row_vectors([row])
+            if reverse:
+                text[rows] = (vector @ self.text_index.row_vectors(rows).T).toarray().ravel()
+            else:
+                text_rows, values = self.text_index.similarities_to(vector)
+                text[text_rows] = values
+        common = np.zeros(catalog.num_rows)
+        for skill_id in np.unique(catalog.skill_entries([row])[1]):
+            common[self.index.skill_postings[int(skill_id)]] += 1
+        longest = np.maximum(catalog.skill_len[row], catalog.skill_len[rows])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shared = np.where(longest > 0, common[rows] / longest, 0.0)
+        components = {
+            'text': text[rows],
+            'domain': catalog.domain.codes[rows] == catalog.domain.codes[row],
+            'skills': shared,
+            'work_mode': catalog.work_mode.codes[rows] == catalog.work_mode.codes[row],
+        }
+        return rows, combine_similarity(components, len(rows))
+
+    def _similar_to_row(self, row: int, count: int) -> List[Tuple[int, float]]:
+        """Exact neighbours of one row, scored against every live row"""
+        rows, scores = self._row_scores(row)
+        others = rows != row
+        rows, scores = rows[others], scores[others]
+        best = top_k_positions(scores, count)
+        return list(zip(rows[best].tolist(), scores[best].tolist()))
@@ -0,0 +1,107 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import tempfile
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app_logging import get_logger
+
+# Saved request profiles; on disk so any worker process can serve any of them
+PROFILE_DIR = os.path.abspath(os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'internship-profiles')))
+
+# Profiles kept in PROFILE_DIR; the oldest are deleted
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 50))
+
+# Functions listed in a text report, by cumulative time
+PROFILE_TOP_FUNCTIONS = 40
+
+# Saved profile ids: time of capture plus a random suffix, so names sort oldest first
+_PROFILE_ID = re.compile(r'^\d{8}-\d{6}-\d{6}-[0-9a-f]{8}$')
+
+# cProfile can't run two profilers at once in one process; a request asking while one runs isn't profiled
+_active = threading.Lock()
+
+log = get_logger('profiling')
+
+
+def start_profile() -> Optional[cProfile.Profile]:
+    """A running profiler for the calling thread, or None when another capture is in progress"""
+    if not _active.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Some other profiling tool is active
+        _active.release()
+        return None
+    return profiler
+
+
+def discard_profile(profiler: cProfile.Profile) -> None:
+    """Stop the profiler without saving anything"""
+    profiler.disable()
+    _active.release()
+
+
+def finish_profile(profiler: cProfile.Profile, details: Dict[str, Any]) -> Optional[str]:
+    """Stop the profiler and save its report (details go in the header); returns the profile id"""
+    profiler.disable()
+    _active.release()
+
+    profile_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{uuid.uuid4().hex[:8]}"
+    report = io.StringIO()
+    for key, value in details.items():
+        report.write(f"{key}: {' '.join(str(value).split())}\n")
+    report.write('\n')
+    pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        base = os.path.join(PROFILE_DIR, profile_id)
+        profiler.dump_stats(base + '.prof')
+        # The text report is written last: list_profiles() only shows complete profiles
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+        _prune()
+    except OSError as e:
+        log.error("❌ Could not save request profile: %s", e)
+        return None
+    return profile_id
+
+
+def _prune() -> None:
+    reports = sorted(name for name in os.listdir(PROFILE_DIR) if name.endswith('.txt'))
+    for name in reports[:max(0, len(reports) - PROFILE_KEEP)]:
+        for suffix in ('.txt', '.prof'):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, name[:-4] + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Saved profiles, newest first"""
+    try:
+        names = sorted((name for name in os.listdir(PROFILE_DIR) if name.endswith('.txt')), reverse=True)
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in names:
+        with open(os.path.join(PROFILE_DIR, name), encoding='utf-8') as f:
+            header = dict(line.split(': ', 1) for line in iter(f.readline, '\n') if ': ' in line)
+        profiles.append({'id': name[:-4], **{key: value.strip() for key, value in header.items()}})
+    return profiles
+
+
+def profile_path(profile_id: str, kind: str = 'txt') -> Optional[str]:
+    """Path of a saved profile's text report ('txt') or pstats dump ('prof'); None when there is none"""
+    if not _PROFILE_ID.match(profile_id) or kind not in ('txt', 'prof'):
+        return None
+    path = os.path.join(PROFILE_DIR, f'{profile_id}.{kind}')
+    return path if os.path.exists(path) else None
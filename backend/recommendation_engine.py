@@ -1,19 +1,70 @@
+import heapq
+import os
 import numpy as np
-from typing import List, Dict, Any, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import List, Dict, Any, Optional, Tuple
 from sklearn.metrics.pairwise import cosine_similarity
 import re
 
+from app_logging import get_logger
+from catalog import parse_start_date, date_to_day
+from indexes import union_rows, intersect_rows
+from metrics import ENGINE_ERRORS, StageTimer
+from text_index import TextIndex
+from neighbours import NeighbourIndex
+from sharded_scoring import ShardedScorer, SHARD_MIN_ROWS
+from scoring import BatchScorer, top_k_positions
+
+# Profile keys accepted as range filters: key -> (indexed field, bound side)
+RANGE_FILTERS = {
+    'min_stipend': ('stipend_amount', 'low'),
+    'max_stipend': ('stipend_amount', 'high'),
+    'min_duration': ('duration_months', 'low'),
+    'max_duration': ('duration_months', 'high'),
+    'start_after': ('start_date', 'low'),
+    'start_before': ('start_date', 'high'),
+}
+
+# Batch scoring works on blocks of about this many (profile, row, skill word) cells
+SCORE_BLOCK_CELLS = 1 << 20
+
+# Catalog shards scored in parallel worker processes per request (1 = score in the request thread)
+SCORING_SHARDS = int(os.environ.get('SCORING_SHARDS', 1))
+
+log = get_logger('engine')
+
+
+def start_date_bound(value) -> int:
+    """Day number for a start date filter bound ('2025-01-15', '01-Dec-2024', date objects)"""
+    if hasattr(value, 'toordinal'):
+        return value.toordinal()
+    parsed = parse_start_date(value)
+    if parsed is None:
+        raise ValueError(f"Unrecognized start date: {value}")
+    return date_to_day(parsed)
+
 class RecommendationEngine:
-    def __init__(self, data_processor):
+    def __init__(self, data_processor, num_shards: Optional[int] = None):
         """
         Enhanced recommendation engine with improved matching algorithms
+
+        num_shards > 1 scores large candidate sets in that many catalog shards
+        on worker processes (default: SCORING_SHARDS); results are identical.
         """
         self.data_processor = data_processor
         self.internships = data_processor.get_all_internships()
-        self.tfidf_vectorizer = None
-        self.internship_vectors = None
-        self._prepare_vectors()
+        self.index = data_processor.index
+        prebuilt = getattr(data_processor, 'prebuilt', None) or {}
+        self.scorer = BatchScorer(self.internships, prebuilt.get('scorer'))
+        num_shards = SCORING_SHARDS if num_shards is None else num_shards
+        self.sharded = ShardedScorer(self.scorer, num_shards) if num_shards > 1 else None
+        self.text_index = None
+        if prebuilt.get('text'):
+            # Fitted state loaded from a snapshot: no refit
+            self.text_index = TextIndex.from_state(prebuilt['text'])
+        else:
+            self._prepare_vectors()
+        # "Similar listings" table over the TF-IDF vectors and the domain/skills/work_mode terms
+        self.neighbours = NeighbourIndex(self.internships, self.index, self.text_index, prebuilt.get('neighbours'))
         
         print(f"Recommendation engine initialized with {len(self.internships)} internships")
     
@@ -21,25 +72,60 @@ class RecommendationEngine:
         """Prepare TF-IDF vectors for internship content"""
         try:
             # Create content strings for each internship
-            internship_content = []
-            for internship in self.internships:
-                content = f"{internship['title']} {internship['company']} {internship['domain']} {' '.join(internship['skills'])}"
-                internship_content.append(content.lower())
+            internship_content = [self._content(internship) for internship in self.internships]
             
-            # Create TF-IDF vectors
-            self.tfidf_vectorizer = TfidfVectorizer(
+            # Create TF-IDF vectors (matrix rows are catalog rows)
+            self.text_index = TextIndex.fit(
+                internship_content,
+                num_rows=self.internships.num_rows,
+                rows=self.internships.live_rows(),
                 max_features=1000,
                 stop_words='english',
                 ngram_range=(1, 2)
             )
-            
-            self.internship_vectors = self.tfidf_vectorizer.fit_transform(internship_content)
             print(" TF-IDF vectors prepared successfully")
             
         except Exception as e:
             print(f"⚠️ Warning: Could not prepare TF-IDF vectors: {str(e)}")
-            self.tfidf_vectorizer = None
-            self.internship_vectors = None
+            self.text_index = None
+    
+    @staticmethod
+    def _content(internship: Dict[str, Any]) -> str:
+        """Text that represents an internship in the TF-IDF index"""
+        return f"{internship['title']} {internship['company']} {internship['domain']} {' '.join(internship['skills'])}".lower()
+    
+    def refresh_rows(self, rows: List[int]) -> None:
+        """Patch the scorer, text vectors and neighbour table for catalog rows that were added, changed or deleted"""
+        self.scorer.refresh_rows(rows)
+        if self.sharded is not None:
+            self.sharded.invalidate()
+        if self.text_index is not None:
+            for row in rows:
+                alive = self.internships.alive[row]
+                self.text_index.set_row(row, self._content(self.internships.record(row)) if alive else None)
+        self.neighbours.refresh_rows(rows)
+    
+    def add_internship(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Add one listing (raw CSV-style fields) and return its processed record"""
+        row = self.data_processor.add_internship(fields)
+        self.refresh_rows([row])
+        return self.internships.record(row)
+    
+    def update_internship(self, internship_id: int, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Change fields of one listing; None when the id is unknown"""
+        row = self.data_processor.update_internship(internship_id, fields)
+        if row is None:
+            return None
+        self.refresh_rows([row])
+        return self.internships.record(row)
+    
+    def remove_internship(self, internship_id: int) -> bool:
+        """Delete one listing; False when the id is unknown"""
+        row = self.data_processor.remove_internship(internship_id)
+        if row is None:
+            return False
+        self.refresh_rows([row])
+        return True
     
     def get_recommendations(self, user_profile: Dict[str, Any], num_recommendations: int = 10) -> List[Dict[str, Any]]:
         """
@@ -51,258 +137,260 @@ class RecommendationEngine:
                 'education': str,
                 'location_preference': str,
                 'min_stipend': int,
-                'preferred_domains': List[str] (optional)
+                'preferred_domains': List[str] (optional),
+                'max_stipend', 'min_duration', 'max_duration' (months),
+                'start_after', 'start_before' (dates): optional range filters
             }
             num_recommendations: Number of recommendations to return
         """
         try:
-            print(f"🔍 Generating recommendations for user profile: {user_profile}")
+            log.debug("🔍 Generating recommendations for user profile: %s", user_profile)
+            timer = StageTimer('recommend')
             
             # Get filtered internships based on hard constraints
-            filtered_internships = self._apply_filters(user_profile)
-            print(f"📊 {len(filtered_internships)} internships match basic criteria")
+            filtered_rows = self._filter_rows(user_profile)
+            timer.lap('filter')
+            log.debug("📊 %d internships match basic criteria", len(filtered_rows))
             
-            if not filtered_internships:
-                print("⚠️ No internships match the basic criteria")
+            if len(filtered_rows) == 0:
+                log.debug("⚠️ No internships match the basic criteria")
                 return []
             
-            # Calculate match scores for filtered internships
-            scored_internships = []
-            for internship in filtered_internships:
-                score = self._calculate_match_score(user_profile, internship)
-                scored_internships.append({
-                    **internship,
+            # Score every candidate at once, then materialize only the top-k
+            top_rows, top_scores = self._top_rows(user_profile, filtered_rows, num_recommendations, timer)
+            
+            recommendations = []
+            for row, score in zip(top_rows, top_scores.tolist()):
+                recommendations.append({
+                    **self.internships.record(row),
                     'match_score': score,
                     'match_percentage': min(100, int(score * 100))
                 })
+            timer.lap('materialize')
+            
+            log.debug("✅ Generated %d recommendations", len(recommendations))
+            return recommendations
+            
+        except Exception as e:
+            ENGINE_ERRORS.inc('recommend')
+            log.exception("❌ Error generating recommendations: %s", e)
+            return []
+    
+    def _top_rows(self, user_profile: Dict[str, Any], rows: np.ndarray, k: int,
+                  timer: StageTimer) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, scores) of the k best rows, best first, ties by row; sharded when configured and worth it"""
+        if self.sharded is not None and len(rows) >= SHARD_MIN_ROWS:
+            try:
+                # The shards rank their own rows, so this is all 'score'
+                top = self.sharded.top_k(user_profile, rows, k)
+                timer.lap('score')
+                return top
+            except Exception as e:
+                log.warning("⚠️ Sharded scoring failed (%s), scoring in-process", e)
+        scores = self.scorer.score(user_profile, rows)
+        timer.lap('score')
+        winners = top_k_positions(scores, k)
+        timer.lap('rank')
+        return rows[winners], scores[winners]
+    
+    def get_recommendations_batch(self, user_profiles: List[Dict[str, Any]],
+                                  num_recommendations: int = 10) -> List[List[Dict[str, Any]]]:
+        """
+        get_recommendations() for many profiles, scored together
+        
+        Profiles with the same hard filters (location and range bounds) share
+        their candidate rows, which are scored in column blocks as one
+        (profiles x rows) matrix; each block keeps only the rows that can
+        still reach a profile's top-k. Returns one list per profile,
+        identical to what get_recommendations() gives for it.
+        """
+        try:
+            log.debug("🔍 Generating recommendations for %d profiles", len(user_profiles))
+            timer = StageTimer('batch')
+            k = max(0, num_recommendations)
+            groups = {}
+            for position, user_profile in enumerate(user_profiles):
+                groups.setdefault(self._filter_key(user_profile), []).append(position)
             
-            # Sort by match score
-            scored_internships.sort(key=lambda x: x['match_score'], reverse=True)
+            best_profiles, best_rows, best_scores = [], [], []
+            for positions in groups.values() if k else []:
+                filtered_rows = self._filter_rows(user_profiles[positions[0]])
+                timer.lap('filter')
+                group_profiles = [user_profiles[position] for position in positions]
+                positions = np.asarray(positions, dtype=np.int64)
+                block_size = max(k, SCORE_BLOCK_CELLS // (len(positions) * self.scorer.skills.num_words))
+                for start in range(0, len(filtered_rows), block_size):
+                    rows = filtered_rows[start:start + block_size]
+                    scores = self.scorer.score_matrix(group_profiles, rows)
+                    # Anything below a profile's k-th best score in this block can't make its top-k
+                    if len(rows) > k:
+                        threshold = np.partition(scores, len(rows) - k, axis=1)[:, len(rows) - k]
+                        profiles, columns = np.nonzero(scores >= threshold[:, None])
+                    else:
+                        profiles, columns = np.divmod(np.arange(scores.size), len(rows))
+                    best_profiles.append(positions[profiles])
+                    best_rows.append(rows[columns])
+                    best_scores.append(scores[profiles, columns])
+                timer.lap('score')
             
-            # Return top recommendations
-            recommendations = scored_internships[:num_recommendations]
+            # Best score first, ties by row position, as top_k_positions orders them
+            profiles = np.concatenate(best_profiles) if best_profiles else np.zeros(0, dtype=np.int64)
+            rows = np.concatenate(best_rows) if best_rows else np.zeros(0, dtype=np.int64)
+            scores = np.concatenate(best_scores) if best_scores else np.zeros(0)
+            order = np.lexsort((rows, -scores, profiles))
+            profiles, rows, scores = profiles[order], rows[order], scores[order]
+            group_starts = np.searchsorted(profiles, np.arange(len(user_profiles)))
+            group_ends = np.minimum(np.searchsorted(profiles, np.arange(len(user_profiles)), side='right'),
+                                    group_starts + k)
+            timer.lap('rank')
             
-            print(f"✅ Generated {len(recommendations)} recommendations")
-            return recommendations
+            results = []
+            for start, end in zip(group_starts, group_ends):
+                recommendations = []
+                for row, score in zip(rows[start:end], scores[start:end]):
+                    score = float(score)
+                    recommendations.append({
+                        **self.internships.record(row),
+                        'match_score': score,
+                        'match_percentage': min(100, int(score * 100))
+                    })
+                results.append(recommendations)
+            timer.lap('materialize')
+            
+            log.debug("✅ Generated %d candidate scores in %d filter groups for %d profiles",
+                      len(rows), len(groups), len(user_profiles))
+            return results
             
         except Exception as e:
-            print(f"❌ Error generating recommendations: {str(e)}")
+            ENGINE_ERRORS.inc('batch')
+            log.exception("❌ Error generating batch recommendations: %s", e)
+            return [[] for _ in user_profiles]
+    
+    @staticmethod
+    def _filter_key(user_profile: Dict[str, Any]):
+        """Profiles with equal keys pass the same rows through _filter_rows"""
+        location_pref = user_profile.get('location_preference', '').lower()
+        return (location_pref if location_pref != 'any' else '',
+                tuple(repr(user_profile.get(key)) for key in RANGE_FILTERS))
+    
+    def recommend(self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None,
+                  user_profile: Optional[Dict[str, Any]] = None, profile_weight: float = 0.3) -> List[Dict[str, Any]]:
+        """
+        Free-text search over the TF-IDF vectors
+        
+        Args:
+            query: search box text
+            top_k: number of results
+            filters: hard filters, same keys as a user profile
+                     (location_preference, min_stipend and the range filters)
+            user_profile: optional profile; when given the text relevance is blended
+                          with the structured match score using profile_weight
+        """
+        try:
+            if self.text_index is None:
+                # No text index available: treat the query words as skills
+                fallback_profile = {**(filters or {}), **(user_profile or {})}
+                fallback_profile.setdefault('skills', query.split())
+                return self.get_recommendations(fallback_profile, top_k)
+            
+            timer = StageTimer('search')
+            # Deleted rows have empty vectors, so they never match
+            rows, relevance = self.text_index.similarities(query.lower())
+            timer.lap('score')
+            
+            if filters:
+                allowed = np.isin(rows, self._filter_rows(filters), assume_unique=True)
+                rows, relevance = rows[allowed], relevance[allowed]
+                timer.lap('filter')
+            
+            scores = relevance
+            if user_profile and len(rows):
+                match_scores = self.scorer.score(user_profile, rows)
+                scores = (1 - profile_weight) * relevance + profile_weight * match_scores
+                timer.lap('score')
+            
+            top_k = max(0, top_k)
+            candidates = range(len(rows))
+            if top_k and len(rows) > 4 * top_k:
+                # Only scores tied with or above the k-th best can make it into the heap
+                threshold = np.partition(scores, -top_k)[-top_k]
+                candidates = np.flatnonzero(scores >= threshold)
+            best = heapq.nlargest(top_k, candidates, key=lambda i: (scores[i], -rows[i]))
+            timer.lap('rank')
+            
+            results = []
+            for i in best:
+                score = float(scores[i])
+                results.append({
+                    **self.internships.record(rows[i]),
+                    'relevance_score': float(relevance[i]),
+                    'match_score': score,
+                    'match_percentage': min(100, int(score * 100))
+                })
+            timer.lap('materialize')
+            return results
+            
+        except Exception as e:
+            ENGINE_ERRORS.inc('search')
+            log.exception("❌ Error searching internships: %s", e)
             return []
     
     def _apply_filters(self, user_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Apply hard filters based on user preferences"""
-        filtered = self.internships.copy()
+        return self.internships.records(self._filter_rows(user_profile))
+    
+    def _filter_rows(self, user_profile: Dict[str, Any]) -> np.ndarray:
+        """Row positions passing the hard filters, answered from the catalog indexes"""
+        index = self.index
+        row_sets = self._range_filter_rows(user_profile)
         
         # Location filter
         location_pref = user_profile.get('location_preference', '').lower()
         if location_pref and location_pref != 'any':
             if location_pref == 'work from home':
-                filtered = [i for i in filtered if i['work_mode'] == 'Remote']
+                row_sets.append(index.remote_rows())
             else:
-                filtered = [i for i in filtered if 
-                          location_pref in i['location'].lower() or i['work_mode'] == 'Remote']
-        
-        # Stipend filter
-        min_stipend = user_profile.get('min_stipend', 0)
-        if min_stipend > 0:
-            filtered = [i for i in filtered if i['stipend_amount'] >= min_stipend]
-        
-        return filtered
-    
-    def _calculate_match_score(self, user_profile: Dict[str, Any], internship: Dict[str, Any]) -> float:
-        """Calculate comprehensive match score between user and internship"""
-        total_score = 0.0
-        max_score = 0.0
-        
-        # 1. Skills matching (40% weight)
-        skills_score = self._calculate_skills_match(user_profile.get('skills', []), internship['skills'])
-        total_score += skills_score * 0.4
-        max_score += 0.4
-        
-        # 2. Education relevance (25% weight)
-        education_score = self._calculate_education_match(user_profile.get('education', ''), internship)
-        total_score += education_score * 0.25
-        max_score += 0.25
-        
-        # 3. Location preference (15% weight)
-        location_score = self._calculate_location_match(user_profile.get('location_preference', ''), internship)
-        total_score += location_score * 0.15
-        max_score += 0.15
-        
-        # 4. Stipend attractiveness (10% weight)
-        stipend_score = self._calculate_stipend_score(user_profile.get('min_stipend', 0), internship['stipend_amount'])
-        total_score += stipend_score * 0.1
-        max_score += 0.1
+                row_sets.append(union_rows([index.location_rows(location_pref), index.remote_rows()]))
         
-        # 5. Company and role prestige (10% weight)
-        prestige_score = self._calculate_prestige_score(internship)
-        total_score += prestige_score * 0.1
-        max_score += 0.1
-        
-        # Normalize score
-        final_score = total_score / max_score if max_score > 0 else 0
-        return min(1.0, final_score)
+        if not row_sets:
+            return index.all_rows()
+        # Intersect smallest-first so later sets only probe surviving rows
+        return intersect_rows(*sorted(row_sets, key=len))
     
-    def _calculate_skills_match(self, user_skills: List[str], internship_skills: List[str]) -> float:
-        """Calculate skills matching score"""
-        if not user_skills or not internship_skills:
-            return 0.0
-        
-        user_skills_lower = [skill.lower() for skill in user_skills]
-        internship_skills_lower = [skill.lower() for skill in internship_skills]
-        
-        # Direct matches
-        direct_matches = len(set(user_skills_lower) & set(internship_skills_lower))
-        
-        # Partial matches (e.g., "Python" in "Python Development")
-        partial_matches = 0
-        for user_skill in user_skills_lower:
-            for int_skill in internship_skills_lower:
-                if user_skill in int_skill or int_skill in user_skill:
-                    partial_matches += 0.5
-        
-        total_matches = direct_matches + partial_matches
-        max_possible_matches = max(len(user_skills), len(internship_skills))
-        
-        return min(1.0, total_matches / max_possible_matches)
-    
-    def _calculate_education_match(self, user_education: str, internship: Dict[str, Any]) -> float:
-        """Calculate education relevance score"""
-        if not user_education:
-            return 0.5  # Neutral score
-        
-        education_lower = user_education.lower()
-        title_lower = internship['title'].lower()
-        domain_lower = internship['domain'].lower()
-        
-        # Direct field matches
-        field_matches = {
-            'computer science': ['software', 'programming', 'development', 'tech', 'it', 'coding'],
-            'information technology': ['software', 'programming', 'development', 'tech', 'it'],
-            'business': ['business', 'management', 'sales', 'marketing', 'finance'],
-            'design': ['design', 'ui', 'ux', 'graphic', 'creative'],
-            'engineering': ['engineering', 'technical', 'development'],
-            'marketing': ['marketing', 'digital', 'social', 'content'],
-            'finance': ['finance', 'accounting', 'investment', 'banking']
-        }
-        
-        for field, keywords in field_matches.items():
-            if field in education_lower:
-                for keyword in keywords:
-                    if keyword in title_lower or keyword in domain_lower:
-                        return 1.0
-        
-        return 0.6  # Decent match for other fields
-    
-    def _calculate_location_match(self, user_location_pref: str, internship: Dict[str, Any]) -> float:
-        """Calculate location preference match"""
-        if not user_location_pref or user_location_pref.lower() == 'any':
-            return 1.0
-        
-        user_pref_lower = user_location_pref.lower()
-        
-        # Perfect match for remote preference
-        if user_pref_lower == 'work from home' and internship['work_mode'] == 'Remote':
-            return 1.0
-        
-        # Good match for city preference
-        if user_pref_lower in internship['location'].lower():
-            return 1.0
-        
-        # Remote is always an option
-        if internship['work_mode'] == 'Remote':
-            return 0.8
-        
-        return 0.3  # Different location
-    
-    def _calculate_stipend_score(self, user_min_stipend: int, internship_stipend: int) -> float:
-        """Calculate stipend attractiveness score"""
-        if user_min_stipend == 0:
-            return 1.0 if internship_stipend > 0 else 0.5
-        
-        if internship_stipend < user_min_stipend:
-            return 0.0
-        
-        # Higher stipend = higher score
-        if internship_stipend >= user_min_stipend * 1.5:
-            return 1.0
-        elif internship_stipend >= user_min_stipend * 1.2:
-            return 0.8
-        else:
-            return 0.6
-    
-    def _calculate_prestige_score(self, internship: Dict[str, Any]) -> float:
-        """Calculate company and role prestige score"""
-        company = internship['company'].lower()
-        title = internship['title'].lower()
-        
-        # High-prestige indicators
-        prestige_companies = ['google', 'microsoft', 'amazon', 'apple', 'facebook', 'netflix', 'uber']
-        prestige_roles = ['machine learning', 'data scientist', 'software engineer', 'product manager']
-        
-        score = 0.5  # Base score
-        
-        # Company prestige
-        for prestige_company in prestige_companies:
-            if prestige_company in company:
-                score += 0.3
-                break
-        
-        # Role prestige
-        for prestige_role in prestige_roles:
-            if prestige_role in title:
-                score += 0.2
-                break
-        
-        # High stipend indicates prestige
-        if internship['stipend_amount'] > 25000:
-            score += 0.2
-        elif internship['stipend_amount'] > 15000:
-            score += 0.1
-        
-        return min(1.0, score)
+    def _range_filter_rows(self, user_profile: Dict[str, Any]) -> List[np.ndarray]:
+        """Row sets for the stipend / duration / start date range filters present in the profile"""
+        bounds = {}
+        for key, (field, side) in RANGE_FILTERS.items():
+            value = user_profile.get(key)
+            if value is None or value == '':
+                continue
+            if field == 'start_date':
+                value = start_date_bound(value)
+            elif key == 'min_stipend' and not value > 0:
+                continue
+            bounds.setdefault(field, {})[side] = value
+        
+        return [self.index.range_rows(field, field_bounds.get('low'), field_bounds.get('high'))
+                for field, field_bounds in bounds.items()]
     
     def get_similar_internships(self, internship_id: int, num_similar: int = 5) -> List[Dict[str, Any]]:
-        """Get internships similar to a given internship"""
+        """Get internships similar to a given internship (from the precomputed neighbour table)"""
         try:
-            target_internship = self.data_processor.get_internship_by_id(internship_id)
-            if not target_internship:
+            timer = StageTimer('similar')
+            row = self.index.row_of(internship_id)
+            if row is None:
                 return []
+            neighbours = self.neighbours.similar(row, num_similar)
+            timer.lap('rank')
             
-            similar_internships = []
-            
-            for internship in self.internships:
-                if internship['id'] == internship_id:
-                    continue
-                
-                # Calculate similarity based on domain, skills, and company
-                similarity = 0.0
-                
-                # Domain similarity
-                if internship['domain'] == target_internship['domain']:
-                    similarity += 0.4
-                
-                # Skills similarity
-                common_skills = set(internship['skills']) & set(target_internship['skills'])
-                skills_similarity = len(common_skills) / max(len(internship['skills']), len(target_internship['skills']))
-                similarity += skills_similarity * 0.4
-                
-                # Location similarity
-                if internship['work_mode'] == target_internship['work_mode']:
-                    similarity += 0.2
-                
-                similar_internships.append({
-                    **internship,
-                    'similarity_score': similarity
-                })
-            
-            # Sort by similarity
-            similar_internships.sort(key=lambda x: x['similarity_score'], reverse=True)
-            
-            return similar_internships[:num_similar]
+            similar = [{**self.internships.record(neighbour), 'similarity_score': score}
+                       for neighbour, score in neighbours]
+            timer.lap('materialize')
+            return similar
             
         except Exception as e:
-            print(f"❌ Error finding similar internships: {str(e)}")
+            ENGINE_ERRORS.inc('similar')
+            log.exception("❌ Error finding similar internships: %s", e)
             return []
     
     def get_trending_internships(self, num_trending: int = 5) -> List[Dict[str, Any]]:
@@ -359,4 +447,4 @@ if __name__ == "__main__":
     recommendations = engine.get_recommendations(test_profile)
     print(f"\n🎯 Top recommendations:")
     for i, rec in enumerate(recommendations[:3], 1):
-        print(f"{i}. {rec['title']} at {rec['company']} - Match: {rec['match_percentage']}%")
\ No newline at end of file
+        print(f"{i}. {rec['title']} at {rec['company']} - Match: {rec['match_percentage']}%")
@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+
+class ReadWriteLock:
+    """Many concurrent readers or one writer; a waiting writer blocks new readers"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class EngineSnapshot:
+    """
+    One loaded dataset: the processor, its engine and when/what was loaded.
+
+    Listings can be edited in place (engine.add_internship & co.); edits
+    hold lock.write() and everything reading the engine holds lock.read().
+    """
+
+    def __init__(self, processor, engine, loaded_at: datetime, load_seconds: float):
+        self.processor = processor
+        self.engine = engine
+        self.loaded_at = loaded_at
+        self.load_seconds = load_seconds
+        self.lock = ReadWriteLock()
+
+    @property
+    def version(self) -> str:
+        """Changes with every reload and every in-place edit"""
+        return self.processor.version
+
+
+def build_snapshot(csv_path: str, snapshot_path: Optional[str] = None) -> EngineSnapshot:
+    """
+    Build processor, indexes and vectors: from the binary snapshot at
+    snapshot_path when it matches the CSV, else from the CSV itself
+    """
+    from data_processor import DataProcessor
+    from recommendation_engine import RecommendationEngine
+
+    started = time.perf_counter()
+    processor = DataProcessor(csv_path, snapshot_path=snapshot_path)
+    engine = RecommendationEngine(processor)
+    return EngineSnapshot(processor, engine, datetime.utcnow(), time.perf_counter() - started)
+
+
+class DatasetReloader:
+    """
+    Owns the live EngineSnapshot and swaps it atomically on reload.
+
+    Requests call current() once and keep using that snapshot, so in-flight
+    requests finish on the old data while a new snapshot is built on a
+    background thread. Reloads are triggered by the mtime watcher or by
+    request_reload() (admin endpoint); a failed reload keeps the old snapshot.
+    A reload starts over from the CSV, dropping listings edited in place.
+    """
+
+    def __init__(self, csv_path: str, builder: Callable[[str], EngineSnapshot] = build_snapshot,
+                 poll_interval: float = 5.0):
+        self.csv_path = csv_path
+        self.builder = builder
+        self.poll_interval = poll_interval
+        self._snapshot = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        self._file_state = None
+        self.reload_count = 0
+        self.last_error = None
+        self.last_reload_at = None
+
+    def current(self) -> Optional[EngineSnapshot]:
+        """The live snapshot (a single attribute read, safe without locking)"""
+        return self._snapshot
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.csv_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def reload(self) -> bool:
+        """Build a new snapshot and swap it in; returns False if it failed or one is already running"""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            file_state = self._stat()
+            print(f"🔄 Loading dataset from {self.csv_path}")
+            snapshot = self.builder(self.csv_path)
+            self._snapshot = snapshot
+            self._file_state = file_state
+            self.reload_count += 1
+            self.last_error = None
+            self.last_reload_at = datetime.utcnow()
+            print(f"✅ Dataset version {snapshot.version} live ({snapshot.load_seconds:.2f}s load)")
+            return True
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ Reload failed, keeping the current dataset: {e}")
+            traceback.print_exc()
+            return False
+        finally:
+            self._reload_lock.release()
+
+    def request_reload(self) -> bool:
+        """Start a reload on a background thread; False if one is already in progress"""
+        if self._reload_lock.locked():
+            return False
+        threading.Thread(target=self.reload, name='dataset-reload', daemon=True).start()
+        return True
+
+    @property
+    def reloading(self) -> bool:
+        return self._reload_lock.locked()
+
+    def start_watching(self) -> None:
+        """Poll the data file's mtime/size and reload when it changes"""
+        if self.poll_interval <= 0 or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name='dataset-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            if self.file_changed():
+                self.reload()
+
+    def file_changed(self) -> bool:
+        """True when the data file's content differs from the live snapshot (checked after an mtime/size change)"""
+        file_state = self._stat()
+        if file_state is None or file_state == self._file_state or self.reloading:
+            return False
+        snapshot = self._snapshot
+        if snapshot is not None and self._fingerprint() == snapshot.processor.source_version:
+            # Touched but unchanged content: nothing to rebuild
+            self._file_state = file_state
+            return False
+        return True
+
+    def _fingerprint(self) -> Optional[str]:
+        from data_processor import file_fingerprint
+        try:
+            return file_fingerprint(self.csv_path)
+        except OSError:
+            return None
+
+    def status(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            'dataset_version': snapshot.version if snapshot else None,
+            'loaded_at': snapshot.loaded_at.strftime('%Y-%m-%d %H:%M:%S') if snapshot else None,
+            'load_seconds': round(snapshot.load_seconds, 3) if snapshot else None,
+            'reloads': self.reload_count,
+            'reloading': self.reloading,
+            'watching': self._watcher is not None and not self._stop.is_set(),
+            'last_error': self.last_error
+        }
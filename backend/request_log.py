@@ -0,0 +1,60 @@
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app_logging import get_logger
+
+# Where request bodies are recorded for replay (see loadtest.py); empty disables recording
+REQUEST_RECORD_PATH = os.environ.get('REQUEST_RECORD_PATH', '')
+
+# Bodies longer than this are not recorded
+REQUEST_RECORD_MAX_BYTES = 64 * 1024
+
+log = get_logger('request_log')
+
+
+class RequestRecorder:
+    """
+    Appends one JSON line per request: {"t": epoch ms, "m": method,
+    "p": path with query, "b": body}. Each line is a single O_APPEND
+    write, so the worker processes of serve.py can share one file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+        self._pid = None
+        self._open_lock = threading.Lock()
+
+    def record(self, method: str, path: str, body: bytes) -> None:
+        if len(body) > REQUEST_RECORD_MAX_BYTES:
+            return
+        # Descriptors opened before a fork are shared; each process opens its own
+        if self._pid != os.getpid():
+            with self._open_lock:
+                if self._pid != os.getpid():
+                    self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    self._pid = os.getpid()
+        line = json.dumps({'t': int(time.time() * 1000), 'm': method, 'p': path,
+                           'b': body.decode('utf-8', 'replace')}, separators=(',', ':'), ensure_ascii=False)
+        try:
+            os.write(self._fd, (line + '\n').encode('utf-8'))
+        except OSError as e:
+            log.error("❌ Could not record request: %s", e)
+
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    """Recorded requests in time order (.gz files are read compressed)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    # Workers append independently, so lines are only roughly in order
+    records.sort(key=lambda record: record['t'])
+    return records
+
+
+def default_recorder() -> Optional[RequestRecorder]:
+    return RequestRecorder(REQUEST_RECORD_PATH) if REQUEST_RECORD_PATH else None
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Profile fields that change results, besides skills/education/location
+RANGE_KEYS = ['min_stipend', 'max_stipend', 'min_duration', 'max_duration', 'start_after', 'start_before']
+
+
+def _normalize_number(value):
+    """20000, 20000.0 and '20000' style inputs that score identically share a key"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return repr(value)
+
+
+def profile_cache_key(user_profile: Optional[Dict[str, Any]], **extra) -> Hashable:
+    """
+    Canonical cache key for a profile.
+
+    Skills are lowercased and sorted (duplicates kept, since they change the
+    score), education and location are lowercased. Fields that don't affect
+    results (e.g. 'name') are ignored. Extra keyword arguments (top_k, query,
+    filters, ...) are folded into the key.
+    """
+    key = []
+    if user_profile is not None:
+        skills = user_profile.get('skills', [])
+        if isinstance(skills, (list, tuple)):
+            skills = tuple(sorted(str(skill).lower() for skill in skills))
+        else:
+            skills = repr(skills)
+        key.extend([
+            ('skills', skills),
+            ('education', str(user_profile.get('education', '')).lower()),
+            ('location', str(user_profile.get('location_preference', '')).lower()),
+        ])
+        key.extend((field, _normalize_number(user_profile[field]) if field.endswith(('stipend', 'duration'))
+                    else repr(user_profile[field]))
+                   for field in RANGE_KEYS if user_profile.get(field) not in (None, ''))
+    for name in sorted(extra):
+        value = extra[name]
+        if isinstance(value, dict):
+            value = profile_cache_key(value)
+        key.append((name, value))
+    return tuple(key)
+
+
+class ResultCache:
+    """
+    Bounded LRU cache with a per-entry TTL for recommendation results.
+
+    Entries belong to a dataset version: the first lookup with a new version
+    drops everything cached for the old one. Thread-safe; hit/miss/eviction
+    counters are exposed through stats().
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, version) -> None:
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Hashable, version) -> Tuple[bool, Any]:
+        """(hit, value) for key under the given dataset version"""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, version, value) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def peek(self, key: Hashable, version) -> bool:
+        """True when get() would hit right now; leaves the counters and LRU order alone"""
+        with self._lock:
+            if version != self._version:
+                return False
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > self._clock()
+
+    def get_or_compute(self, key: Hashable, version, compute: Callable[[], Any], refresh: bool = False):
+        """Cached value for key, computing (outside the lock) and storing it on a miss or when refresh is set"""
+        if not refresh:
+            hit, value = self.get(key, version)
+            if hit:
+                return value
+        value = compute()
+        self.put(key, version, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'dataset_version': self._version
+            }
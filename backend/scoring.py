@@ -0,0 +1,510 @@
+import numpy as np
+from typing import List, Dict, Any, Optional
+
+from catalog import grow_buffer
+
+# Component weights of the match score, in the order they are accumulated
+SCORE_WEIGHTS = [('skills', 0.4), ('education', 0.25), ('location', 0.15), ('stipend', 0.1), ('prestige', 0.1)]
+
+# Education field -> title/domain keywords that make an internship relevant
+EDUCATION_FIELD_KEYWORDS = {
+    'computer science': ['software', 'programming', 'development', 'tech', 'it', 'coding'],
+    'information technology': ['software', 'programming', 'development', 'tech', 'it'],
+    'business': ['business', 'management', 'sales', 'marketing', 'finance'],
+    'design': ['design', 'ui', 'ux', 'graphic', 'creative'],
+    'engineering': ['engineering', 'technical', 'development'],
+    'marketing': ['marketing', 'digital', 'social', 'content'],
+    'finance': ['finance', 'accounting', 'investment', 'banking']
+}
+
+EDUCATION_FIELDS = list(EDUCATION_FIELD_KEYWORDS)
+
+# High-prestige indicators
+PRESTIGE_COMPANIES = ['google', 'microsoft', 'amazon', 'apple', 'facebook', 'netflix', 'uber']
+PRESTIGE_ROLES = ['machine learning', 'data scientist', 'software engineer', 'product manager']
+
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """Set bits per uint64 word"""
+        return np.bitwise_count(words)
+else:
+    _POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """Set bits per uint64 word (byte lookup table for NumPy < 2.0)"""
+        words = np.ascontiguousarray(words, dtype=np.uint64)
+        return _POPCOUNT_TABLE[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1)
+
+
+def top_k_positions(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k best scores, highest first, ties broken by position.
+
+    Same result as a stable descending sort followed by [:k], but only the
+    argpartition winners (plus anything tied with the k-th score) get sorted.
+    """
+    n = len(scores)
+    k = len(range(n)[:k])  # slice semantics, including negative k
+    if k == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < n:
+        winners = np.argpartition(-scores, k - 1)[:k]
+        candidates = np.flatnonzero(scores >= scores[winners].min())
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
+
+
+class SkillBitsets:
+    """
+    Internship skill sets as bitmasks over the canonical (lowercased) skill vocabulary.
+
+    Built once per catalog: every distinct lowercase skill gets an integer id,
+    each row gets a (num_words,) uint64 bitmask, and the substring-containment
+    relation between canonical skills (the "partial match" test) is tabulated.
+    A request resolves its skills to ids once and scores all rows with AND +
+    popcount, giving exactly the scores of the original per-listing skill match
+    (kept in test_recommendation_engine.py).
+    refresh_rows() re-encodes rows changed in the catalog.
+    """
+
+    def __init__(self, catalog, state: Optional[Dict[str, np.ndarray]] = None):
+        self.catalog = catalog
+        self.canonical = []
+        self.lookup = {}
+        self.vocab_canonical = np.zeros(0, dtype=np.int64)
+        self.containment = None
+        self.masks = None
+        self._sync_vocab()
+
+        if state is not None:
+            self.masks = state['skill_masks']
+            self.repeat_rows = state['repeat_rows']
+            self.repeat_skills = state['repeat_skills']
+            return
+
+        entry_rows, entry_skills = catalog.skill_entries()
+        entry_skills = self.vocab_canonical[entry_skills]
+        self.masks = np.zeros((catalog.num_rows, self.num_words), dtype=np.uint64)
+        np.bitwise_or.at(self.masks, (entry_rows, entry_skills // 64),
+                         np.left_shift(np.uint64(1), (entry_skills % 64).astype(np.uint64)))
+
+        # A row listing the same skill twice counts it twice for partial matches;
+        # those (rare) repeated entries are kept aside to correct the bitset count
+        first = np.zeros(len(entry_rows), dtype=bool)
+        first[np.unique(entry_rows * len(self.canonical) + entry_skills, return_index=True)[1]] = True
+        self.repeat_rows = entry_rows[~first]
+        self.repeat_skills = entry_skills[~first]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.catalog.skill_len
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Arrays that let SkillBitsets(catalog, state) skip the build"""
+        return {'skill_masks': self.masks[:self.catalog.num_rows], 'repeat_rows': self.repeat_rows,
+                'repeat_skills': self.repeat_skills}
+
+    def _sync_vocab(self) -> None:
+        """Extend the canonical skills (and the containment table) to new catalog skills"""
+        vocab = self.catalog.skill_vocab
+        known = len(self.vocab_canonical)
+        if known == len(vocab) and self.containment is not None:
+            return
+        num_canonical = len(self.canonical)
+        added = [self.lookup.setdefault(skill.lower(), len(self.lookup)) for skill in vocab[known:]]
+        self.vocab_canonical = np.concatenate([self.vocab_canonical, np.asarray(added, dtype=np.int64)])
+        self.canonical = list(self.lookup)
+        self.num_words = max(1, (len(self.canonical) + 63) // 64)
+        if num_canonical == len(self.canonical) and self.containment is not None:
+            return
+
+        # containment[a, b]: canonical skill a is a substring of b or vice versa
+        self.containment = np.array([[a in b or b in a for b in self.canonical] for a in self.canonical],
+                                    dtype=bool).reshape(len(self.canonical), len(self.canonical))
+        if self.masks is not None and self.masks.shape[1] < self.num_words:
+            widened = np.zeros((len(self.masks), self.num_words), dtype=np.uint64)
+            widened[:, :self.masks.shape[1]] = self.masks
+            self.masks = widened
+
+    def refresh_rows(self, rows) -> None:
+        """Re-encode rows that were added, changed or deleted in the catalog"""
+        self._sync_vocab()
+        rows = np.asarray(rows, dtype=np.int64)
+        self.masks = grow_buffer(self.masks, self.catalog.num_rows)
+        entry_rows, entry_skills = self.catalog.skill_entries(rows)
+        entry_skills = self.vocab_canonical[entry_skills]
+        self.masks[rows] = 0
+        np.bitwise_or.at(self.masks, (entry_rows, entry_skills // 64),
+                         np.left_shift(np.uint64(1), (entry_skills % 64).astype(np.uint64)))
+
+        keep = ~np.isin(self.repeat_rows, rows)
+        first = np.zeros(len(entry_rows), dtype=bool)
+        first[np.unique(entry_rows * len(self.canonical) + entry_skills, return_index=True)[1]] = True
+        self.repeat_rows = np.concatenate([self.repeat_rows[keep], entry_rows[~first]])
+        self.repeat_skills = np.concatenate([self.repeat_skills[keep], entry_skills[~first]])
+
+    def word_mask(self, skill_mask: np.ndarray) -> np.ndarray:
+        """Pack a boolean mask over canonical skills into uint64 words"""
+        words = np.zeros(self.num_words, dtype=np.uint64)
+        for skill_id in np.flatnonzero(skill_mask):
+            words[skill_id // 64] |= np.uint64(1) << np.uint64(skill_id % 64)
+        return words
+
+    def encode(self, user_skills: List[str]):
+        """Resolve user skills once: (direct-match words, partial-match count per canonical skill)"""
+        direct = np.zeros(len(self.canonical), dtype=bool)
+        partial = np.zeros(len(self.canonical), dtype=np.int64)
+        for user_skill in (skill.lower() for skill in user_skills):
+            skill_id = self.lookup.get(user_skill)
+            if skill_id is not None:
+                direct[skill_id] = True
+                partial += self.containment[skill_id]
+            else:
+                partial += [user_skill in skill or skill in user_skill for skill in self.canonical]
+        return self.word_mask(direct), partial
+
+    def encode_scoring(self, user_skills: List[str]) -> Dict[str, Any]:
+        """What skill_scores() needs from a profile: its skill count, direct words and per-count partial words"""
+        if not user_skills:
+            return {'num_skills': 0}
+        direct_words, partial = self.encode(user_skills)
+        return {
+            'num_skills': len(user_skills),
+            'direct_words': direct_words,
+            'partial_words': [(int(count), self.word_mask(partial == count))
+                              for count in np.unique(partial[partial > 0])],
+            'partial': partial,
+        }
+
+    def pack_words(self, skill_masks: np.ndarray) -> np.ndarray:
+        """word_mask() for each row of a (profiles, canonical skills) boolean matrix"""
+        bits = np.zeros((len(skill_masks), self.num_words * 64), dtype=bool)
+        bits[:, :skill_masks.shape[1]] = skill_masks
+        packed = np.packbits(bits, axis=1, bitorder='little')
+        return np.ascontiguousarray(packed).view('<u8').astype(np.uint64)
+
+    def encode_many(self, skill_lists: List[List[str]]):
+        """encode() for many profiles: (direct words (P, W), partial counts (P, canonical skills))"""
+        direct = np.zeros((len(skill_lists), len(self.canonical)), dtype=bool)
+        partial = np.zeros((len(skill_lists), len(self.canonical)), dtype=np.int64)
+        encoded = {}
+        for position, user_skills in enumerate(skill_lists):
+            if not user_skills:
+                continue
+            key = tuple(user_skills)
+            if key not in encoded:
+                encoded[key] = self.encode(user_skills)[1]
+            partial[position] = encoded[key]
+            for user_skill in user_skills:
+                skill_id = self.lookup.get(user_skill.lower())
+                if skill_id is not None:
+                    direct[position, skill_id] = True
+        return self.pack_words(direct), partial
+
+    def score_matrix(self, skill_lists: List[List[str]], rows: np.ndarray) -> np.ndarray:
+        """
+        scores() for many profiles at once: a (profiles, rows) matrix.
+
+        Direct matches are one broadcast AND + popcount of the profile words
+        against the row bitsets. Partial-match counts are split into bit
+        planes (count = sum of 2**b * plane_b), so they cost one AND +
+        popcount per plane instead of one per distinct count.
+        """
+        direct_words, partial = self.encode_many(skill_lists)
+        masks = self.masks[rows]
+        direct = popcount(direct_words[:, None, :] & masks[None, :, :]).sum(axis=2, dtype=np.int64)
+
+        partial_matches = np.zeros((len(skill_lists), len(rows)), dtype=np.int64)
+        for plane in range(int(partial.max(initial=0)).bit_length()):
+            plane_words = self.pack_words((partial >> plane) & 1 > 0)
+            partial_matches += popcount(plane_words[:, None, :] & masks[None, :, :]).sum(axis=2, dtype=np.int64) << plane
+        if len(self.repeat_rows) and len(rows):
+            # rows ascend, so repeated entries are located with one searchsorted
+            positions = np.searchsorted(rows, self.repeat_rows)
+            found = positions < len(rows)
+            found[found] = rows[positions[found]] == self.repeat_rows[found]
+            np.add.at(partial_matches, (slice(None), positions[found]), partial[:, self.repeat_skills[found]])
+
+        num_user_skills = np.array([len(user_skills) for user_skills in skill_lists])
+        lengths = self.lengths[rows]
+        max_possible = np.maximum(num_user_skills[:, None], lengths[None, :])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.minimum(1.0, (direct + partial_matches * 0.5) / max_possible)
+        return np.where((lengths[None, :] > 0) & (num_user_skills[:, None] > 0), scores, 0.0)
+
+
+class BatchScorer:
+    """
+    Computes the match score of one profile against many catalog rows at once.
+
+    Every component is evaluated as a NumPy array over the candidate rows;
+    string tests run once per distinct category value (titles, companies,
+    locations, skills) and are broadcast through the category codes.
+    Produces exactly the scores of the original per-listing scorer (kept as
+    the reference in test_recommendation_engine.py).
+
+    The user-independent parts are precomputed once per catalog: the
+    prestige vector and an education-field x internship relevance matrix,
+    packed as one bit per field in education_relevance. refresh_rows()
+    recomputes them for rows changed in the catalog.
+    """
+
+    def __init__(self, catalog, state: Optional[Dict[str, np.ndarray]] = None):
+        self.catalog = catalog
+        self.title_lower = []
+        self.domain_lower = []
+        self.location_lower = []
+        self.company_lower = []
+        self.category_hits = {}
+        if state is not None:
+            self.category_hits = {name[len('hits:'):]: hits for name, hits in state.items() if name.startswith('hits:')}
+        self._sync_categories()
+        self.skills = SkillBitsets(catalog, state)
+
+        if state is not None:
+            self.prestige = state['prestige']
+            self.education_relevance = state['education_relevance']
+            return
+        all_rows = np.arange(catalog.num_rows, dtype=np.int64)
+        self.prestige = self._compute_prestige(all_rows)
+        self.education_relevance = self._compute_education_relevance(all_rows)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Precomputed arrays that let BatchScorer(catalog, state) skip the build"""
+        num_rows = self.catalog.num_rows
+        state = {'prestige': self.prestige[:num_rows], 'education_relevance': self.education_relevance[:num_rows]}
+        state.update(('hits:' + name, hits) for name, hits in self.category_hits.items())
+        state.update(self.skills.state())
+        return state
+
+    def _sync_categories(self) -> None:
+        """Extend the lowercased category lists (and their keyword hits) to values added since"""
+        for lowered, column in [(self.title_lower, self.catalog.title), (self.domain_lower, self.catalog.domain),
+                                (self.location_lower, self.catalog.location),
+                                (self.company_lower, self.catalog.company)]:
+            lowered.extend(value.lower() for value in column.categories[len(lowered):])
+        self.remote_code = self.catalog.work_mode.code_of('Remote')
+
+        # Keyword hits per distinct value, so refreshing a row never rescans all categories
+        specs = [('company_prestige', self.company_lower, PRESTIGE_COMPANIES),
+                 ('title_prestige', self.title_lower, PRESTIGE_ROLES)]
+        for field, keywords in EDUCATION_FIELD_KEYWORDS.items():
+            specs += [(f'title:{field}', self.title_lower, keywords), (f'domain:{field}', self.domain_lower, keywords)]
+        for name, lowered, keywords in specs:
+            hits = self.category_hits.get(name, np.zeros(0, dtype=bool))
+            if len(hits) < len(lowered):
+                self.category_hits[name] = np.concatenate([hits, contains_any(lowered[len(hits):], keywords)])
+
+    def refresh_rows(self, rows) -> None:
+        """Recompute the per-row precomputed parts for rows added, changed or deleted in the catalog"""
+        rows = np.asarray(rows, dtype=np.int64)
+        self._sync_categories()
+        self.skills.refresh_rows(rows)
+        self.prestige = grow_buffer(self.prestige, self.catalog.num_rows)
+        self.prestige[rows] = self._compute_prestige(rows)
+        self.education_relevance = grow_buffer(self.education_relevance, self.catalog.num_rows)
+        self.education_relevance[rows] = self._compute_education_relevance(rows)
+
+    def score(self, user_profile: Dict[str, Any], rows: np.ndarray) -> np.ndarray:
+        """Match scores (0..1) for the given catalog rows"""
+        return score_columns(self.encode_profile(user_profile), self.columns(), rows)
+
+    def encode_profile(self, user_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        A profile resolved against the catalog vocabularies: small numeric
+        parameters that score_columns() combines with the per-row columns.
+        """
+        user_education = user_profile.get('education', '')
+        education_lower = (user_education or '').lower()
+        user_location_pref = user_profile.get('location_preference', '')
+        location_hits = None
+        if user_location_pref and user_location_pref.lower() != 'any':
+            user_pref_lower = user_location_pref.lower()
+            location_hits = np.array([user_pref_lower in location for location in self.location_lower], dtype=bool)
+        return {
+            'skills': self.skills.encode_scoring(user_profile.get('skills', [])),
+            'education_fields': sum(1 << bit for bit, field in enumerate(EDUCATION_FIELDS) if field in education_lower),
+            'education_fallback': 0.6 if user_education else 0.5,
+            'location_hits': location_hits,
+            'work_from_home': location_hits is not None and user_location_pref.lower() == 'work from home',
+            'remote_code': self.remote_code,
+            'min_stipend': user_profile.get('min_stipend', 0),
+        }
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Per-row arrays read by score_columns(), indexed by catalog row"""
+        catalog = self.catalog
+        return {
+            'skill_masks': self.skills.masks,
+            'skill_len': catalog.skill_len,
+            'repeat_rows': self.skills.repeat_rows,
+            'repeat_skills': self.skills.repeat_skills,
+            'education_relevance': self.education_relevance,
+            'prestige': self.prestige,
+            'stipend_amount': catalog.stipend_amount,
+            'work_mode': catalog.work_mode.codes,
+            'location': catalog.location.codes,
+        }
+
+    def score_matrix(self, user_profiles: List[Dict[str, Any]], rows: np.ndarray) -> np.ndarray:
+        """
+        Match scores of many profiles against the same ascending rows, as a
+        (profiles, rows) matrix: row i equals score(user_profiles[i], rows).
+        Each component is computed for all profiles at once by broadcasting
+        per-profile parameters against the per-row columns.
+        """
+        size = (len(user_profiles), len(rows))
+        components = {
+            'skills': self.skills.score_matrix([profile.get('skills', []) for profile in user_profiles], rows),
+            'education': self.education_matrix([profile.get('education', '') for profile in user_profiles], rows),
+            'location': self.location_matrix([profile.get('location_preference', '') for profile in user_profiles],
+                                             rows),
+            'stipend': self.stipend_matrix([profile.get('min_stipend', 0) for profile in user_profiles], rows),
+            'prestige': self.prestige_scores(rows),
+        }
+        return combine_components(components, size)
+
+    def _compute_education_relevance(self, rows: np.ndarray) -> np.ndarray:
+        """Bit f of each entry is set when a keyword of EDUCATION_FIELDS[f] is in the title or domain"""
+        relevance = np.zeros(len(rows), dtype=np.min_scalar_type(2 ** len(EDUCATION_FIELDS) - 1))
+        for bit, field in enumerate(EDUCATION_FIELDS):
+            title_hit = self.category_hits[f'title:{field}'][self.catalog.title.codes[rows]]
+            domain_hit = self.category_hits[f'domain:{field}'][self.catalog.domain.codes[rows]]
+            relevance |= (title_hit | domain_hit).astype(relevance.dtype) << bit
+        return relevance
+
+    def education_matrix(self, educations: List[str], rows: np.ndarray) -> np.ndarray:
+        active_fields = np.array([sum(1 << bit for bit, field in enumerate(EDUCATION_FIELDS)
+                                      if field in (education or '').lower()) for education in educations],
+                                 dtype=self.education_relevance.dtype)
+        fallback = np.array([0.6 if education else 0.5 for education in educations])
+        relevant = (self.education_relevance[rows][None, :] & active_fields[:, None]) != 0
+        return np.where(relevant, 1.0, fallback[:, None])
+
+    def location_matrix(self, preferences: List[str], rows: np.ndarray) -> np.ndarray:
+        # One hit row over the distinct locations per distinct preference, gathered through the codes
+        distinct = {}
+        pref_ids = np.array([distinct.setdefault((preference or '').lower(), len(distinct))
+                             for preference in preferences], dtype=np.int64)
+        hits = np.array([[pref in location for location in self.location_lower] for pref in distinct],
+                        dtype=bool).reshape(len(distinct), len(self.location_lower))
+        remote = self.catalog.work_mode.codes[rows] == self.remote_code
+        location_hit = hits[pref_ids][:, self.catalog.location.codes[rows]]
+        work_from_home = np.array([pref == 'work from home' for pref in distinct], dtype=bool)[pref_ids]
+        location_hit |= work_from_home[:, None] & remote[None, :]
+        anywhere = np.array([pref in ('', 'any') for pref in distinct], dtype=bool)[pref_ids]
+        return np.where(anywhere[:, None], 1.0,
+                        np.where(location_hit, 1.0, np.where(remote, 0.8, 0.3)))
+
+    def stipend_matrix(self, min_stipends, rows: np.ndarray) -> np.ndarray:
+        stipend = self.catalog.stipend_amount[rows][None, :]
+        min_stipends = np.asarray(min_stipends, dtype=np.float64)[:, None]
+        scores = np.where(stipend < min_stipends, 0.0,
+                          np.where(stipend >= min_stipends * 1.5, 1.0,
+                                   np.where(stipend >= min_stipends * 1.2, 0.8, 0.6)))
+        return np.where(min_stipends == 0, np.where(stipend > 0, 1.0, 0.5), scores)
+
+    def prestige_scores(self, rows: np.ndarray) -> np.ndarray:
+        return self.prestige[rows]
+
+    def _compute_prestige(self, rows: np.ndarray) -> np.ndarray:
+        company_hit = self.category_hits['company_prestige'][self.catalog.company.codes[rows]]
+        role_hit = self.category_hits['title_prestige'][self.catalog.title.codes[rows]]
+        stipend = self.catalog.stipend_amount[rows]
+
+        score = np.full(len(rows), 0.5)
+        score = np.where(company_hit, score + 0.3, score)
+        score = np.where(role_hit, score + 0.2, score)
+        score = np.where(stipend > 25000, score + 0.2, np.where(stipend > 15000, score + 0.1, score))
+        return np.minimum(1.0, score)
+
+
+def skill_scores(encoded: Dict[str, Any], masks: np.ndarray, lengths: np.ndarray, repeat_rows: np.ndarray,
+                 repeat_skills: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Skills component for rows, from SkillBitsets.encode_scoring() and the skill columns"""
+    if not encoded['num_skills']:
+        return np.zeros(len(rows))
+
+    masks = masks[rows]
+    direct = popcount(masks & encoded['direct_words']).sum(axis=1, dtype=np.int64)
+
+    partial = encoded['partial']
+    partial_matches = np.zeros(len(rows), dtype=np.int64)
+    for count, words in encoded['partial_words']:
+        partial_matches += count * popcount(masks & words).sum(axis=1, dtype=np.int64)
+    if len(repeat_rows) and len(rows):
+        order = np.argsort(rows, kind='stable')
+        positions = np.searchsorted(rows[order], repeat_rows)
+        found = positions < len(rows)
+        found[found] = rows[order][positions[found]] == repeat_rows[found]
+        np.add.at(partial_matches, order[positions[found]], partial[repeat_skills[found]])
+
+    lengths = lengths[rows]
+    max_possible = np.maximum(encoded['num_skills'], lengths)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.minimum(1.0, (direct + partial_matches * 0.5) / max_possible)
+    return np.where(lengths > 0, scores, 0.0)
+
+
+def education_column_scores(profile: Dict[str, Any], education_relevance: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    if not profile['education_fields']:
+        return np.full(len(rows), profile['education_fallback'])
+    return np.where(education_relevance[rows] & profile['education_fields'], 1.0, 0.6)
+
+
+def location_column_scores(profile: Dict[str, Any], location_codes: np.ndarray, work_mode_codes: np.ndarray,
+                           rows: np.ndarray) -> np.ndarray:
+    if profile['location_hits'] is None:
+        return np.ones(len(rows))
+
+    remote = work_mode_codes[rows] == profile['remote_code']
+    location_hit = profile['location_hits'][location_codes[rows]]
+    if profile['work_from_home']:
+        location_hit |= remote
+    return np.where(location_hit, 1.0, np.where(remote, 0.8, 0.3))
+
+
+def stipend_column_scores(user_min_stipend, stipend_amount: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    stipend = stipend_amount[rows]
+    if user_min_stipend == 0:
+        return np.where(stipend > 0, 1.0, 0.5)
+
+    return np.where(stipend < user_min_stipend, 0.0,
+                    np.where(stipend >= user_min_stipend * 1.5, 1.0,
+                             np.where(stipend >= user_min_stipend * 1.2, 0.8, 0.6)))
+
+
+def score_columns(profile: Dict[str, Any], columns: Dict[str, np.ndarray], rows: np.ndarray) -> np.ndarray:
+    """
+    Match scores of an encoded profile (BatchScorer.encode_profile) for rows
+    of the given columns (BatchScorer.columns, or a slice of them holding
+    the same rows). Every component is elementwise per row, so scoring the
+    rows in pieces gives the same floats as scoring them together.
+    """
+    components = {
+        'skills': skill_scores(profile['skills'], columns['skill_masks'], columns['skill_len'],
+                               columns['repeat_rows'], columns['repeat_skills'], rows),
+        'education': education_column_scores(profile, columns['education_relevance'], rows),
+        'location': location_column_scores(profile, columns['location'], columns['work_mode'], rows),
+        'stipend': stipend_column_scores(profile['min_stipend'], columns['stipend_amount'], rows),
+        'prestige': columns['prestige'][rows],
+    }
+    return combine_components(components, len(rows))
+
+
+def contains_any(values: List[str], keywords) -> np.ndarray:
+    """Mask over values: True where any keyword is a substring"""
+    return np.array([any(keyword in value for keyword in keywords) for value in values], dtype=bool)
+
+
+def combine_components(components: Dict[str, np.ndarray], size) -> np.ndarray:
+    """Weighted, normalized total (size: length or matrix shape); same accumulation order as the scalar scorer"""
+    total = np.zeros(size)
+    max_score = 0.0
+    for name, weight in SCORE_WEIGHTS:
+        total = total + components[name] * weight
+        max_score += weight
+    return np.minimum(1.0, total / max_score)
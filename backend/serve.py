@@ -0,0 +1,326 @@
+"""
+Production entry point: a pre-forking WSGI server for app.py.
+
+    python serve.py --workers 4 --threads 8 --bind 0.0.0.0:5000 --preload --max-requests 5000
+
+The parent binds the socket and (with --preload) loads the dataset and engine
+once, then forks the workers, which share those pages copy-on-write. Each
+worker serves requests on a bounded thread pool and exits gracefully after
+--max-requests (plus jitter); the parent replaces any worker that exits.
+
+Dataset reloads go through the parent, so every worker serves the same data:
+it watches the data file, reloads once (with --preload) and replaces the
+workers one at a time, which fork from the new dataset. /admin/reload in a
+worker signals the parent. Single-listing edits are refused (409) with more
+than one worker, because an edit would only change the worker that got it.
+
+Signals to the parent:
+    SIGTERM / SIGINT  graceful shutdown (workers finish in-flight requests)
+    SIGHUP            graceful restart of every worker, one at a time
+    SIGUSR1           reload the dataset, then restart the workers one at a time
+    SIGTTIN / SIGTTOU one worker more / less
+"""
+import argparse
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug WSGI server that handles connections on a fixed-size thread pool"""
+
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, host: str, port: int, app, threads: int, max_requests: int = 0, fd: Optional[int] = None):
+        super().__init__(host, port, app, handler=QuietRequestHandler, fd=fd)
+        self.threads = threads
+        self.max_requests = max_requests
+        self.handled = 0
+        self._count_lock = threading.Lock()
+        # Stop accepting while every thread is busy, so idle workers pick up the next connections
+        self._slots = threading.BoundedSemaphore(threads)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='request')
+
+    def verify_request(self, request, client_address) -> bool:
+        self._slots.acquire()
+        return True
+
+    def process_request(self, request, client_address) -> None:
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+            with self._count_lock:
+                self.handled += 1
+                recycle = self.max_requests and self.handled == self.max_requests
+            if recycle:
+                print(f"♻️ Worker {os.getpid()} served {self.handled} requests, recycling")
+                threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def drain(self, timeout: float) -> None:
+        """Wait (up to timeout) for the requests already accepted"""
+        deadline = time.monotonic() + timeout
+        for _ in range(self.threads):
+            if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                break
+        self._pool.shutdown(wait=False)
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Access log off by default (SERVE_ACCESS_LOG=1 turns it on); errors are still printed"""
+
+    # One request per connection: an idle keep-alive connection would hold a pool thread
+    protocol_version = 'HTTP/1.0'
+
+    def log_request(self, code='-', size='-') -> None:
+        if os.environ.get('SERVE_ACCESS_LOG') == '1':
+            super().log_request(code, size)
+
+
+def parse_bind(bind: str):
+    host, _, port = bind.rpartition(':')
+    return host or '0.0.0.0', int(port)
+
+
+class Arbiter:
+    """Parent process: owns the listening socket and keeps `workers` children running"""
+
+    def __init__(self, options):
+        self.options = options
+        self.num_workers = options.workers
+        self.workers: Dict[int, float] = {}  # pid -> start time
+        self.retiring = set()
+        self.restart_queue = []
+        self.stopping = False
+        self.events = []
+        self.poll_interval = float(os.environ.get('DATA_RELOAD_INTERVAL', 5))
+        self.next_poll = time.monotonic() + self.poll_interval
+        self.data_file_state = None
+        host, port = parse_bind(options.bind)
+        self.socket = socket.create_server((host, port), backlog=options.backlog)
+        self.socket.set_inheritable(True)
+        self.address = f"{host}:{self.socket.getsockname()[1]}"
+
+    def load_app(self):
+        import app as app_module
+
+        app_module.SERVER_LABEL = f"serve.py ({self.num_workers} workers x {self.options.threads} threads)"
+        app_module.ARBITER_PID = os.getpid()
+        try:
+            if self.options.preload:
+                app_module.init_engine()
+            else:
+                app_module.prepare_data_file()  # here, so the workers and the data file check use one path
+        except RuntimeError:
+            sys.exit(1)
+        self.data_file_state = self._data_file_state(app_module.data_file_path)
+        return app_module
+
+    def run(self) -> None:
+        started = time.perf_counter()
+        self.app_module = self.load_app()
+        preloaded = f" (preloaded in {time.perf_counter() - started:.2f}s)" if self.options.preload else ""
+        print(f"🚀 Serving on http://{self.address} with {self.num_workers} workers x "
+              f"{self.options.threads} threads{preloaded}")
+
+        # Handlers only record the signal; the loop below acts on it
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, lambda signum, frame: self.events.append(signum))
+
+        while not self.stopping:
+            self._handle_events()
+            self._check_data_file()
+            self._reap()
+            self._maintain()
+            time.sleep(0.1)
+        self._shutdown()
+
+    def _handle_events(self) -> None:
+        while self.events:
+            signum = self.events.pop(0)
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                self.stopping = True
+            elif signum == signal.SIGHUP:
+                print("🔄 Restarting workers one at a time")
+                self.restart_queue = sorted(self.workers, key=self.workers.get)
+            elif signum == signal.SIGUSR1:
+                self._reload_dataset()
+            else:
+                previous = self.num_workers
+                self.num_workers = max(1, self.num_workers + (1 if signum == signal.SIGTTIN else -1))
+                print(f"👷 Worker count set to {self.num_workers}")
+                if (previous > 1) != (self.num_workers > 1):
+                    # Whether edits are allowed changed: running workers pick that up when replaced
+                    self.restart_queue = sorted(self.workers, key=self.workers.get)
+
+    @staticmethod
+    def _data_file_state(path: str):
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _check_data_file(self) -> None:
+        """Reload when the data file changed; the workers don't watch it themselves"""
+        if self.poll_interval <= 0 or time.monotonic() < self.next_poll:
+            return
+        self.next_poll = time.monotonic() + self.poll_interval
+        reloader = self.app_module.reloader
+        if reloader is not None:
+            changed = reloader.file_changed()
+        else:
+            # --no-preload: the parent has no dataset, so any change replaces the workers
+            state = self._data_file_state(self.app_module.data_file_path)
+            changed = state != self.data_file_state
+            self.data_file_state = state
+        if changed:
+            self._reload_dataset()
+
+    def _reload_dataset(self) -> None:
+        """Reload once in the parent (with --preload), then replace every worker so all of them serve it"""
+        reloader = self.app_module.reloader
+        if reloader is not None and not reloader.reload():
+            return  # the workers keep serving the current dataset
+        print("🔄 Replacing workers one at a time to serve the new dataset")
+        self.restart_queue = sorted(self.workers, key=self.workers.get)
+
+    def _maintain(self) -> None:
+        """Spawn missing workers, retire surplus ones and advance a rolling restart"""
+        active = [pid for pid in self.workers if pid not in self.retiring]
+        while len(active) < self.num_workers:
+            active.append(self._spawn())
+        if self.restart_queue:
+            # One worker at a time: the next is retired once the previous one has exited
+            if not self.retiring:
+                pid = self.restart_queue.pop(0)
+                if pid in self.workers:
+                    self._spawn()  # replacement first, so capacity never dips
+                    self._retire(pid)
+        elif len(active) > self.num_workers:
+            for pid in sorted(active, key=self.workers.get)[:len(active) - self.num_workers]:
+                self._retire(pid)
+
+    def _spawn(self) -> int:
+        self.app_module.SERVE_WORKERS = self.num_workers
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.monotonic()
+            return pid
+        # Child
+        status = 0
+        try:
+            self._worker_main()
+        except SystemExit as e:
+            status = e.code or 0
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    def _worker_main(self) -> None:
+        for signum in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C reaches the parent, which stops the workers
+        signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+
+        app_module = self.app_module
+        app_module.init_engine()  # no-op when preloaded; no file watcher, the parent reloads for all workers
+        # Each worker counts its own requests: the label keeps their series apart when Prometheus sums them
+        app_module.registry.set_constant_labels(worker=os.getpid())
+
+        options = self.options
+        max_requests = 0
+        if options.max_requests:
+            max_requests = options.max_requests + random.randint(0, max(0, options.max_requests_jitter))
+        host, port = parse_bind(options.bind)
+        server = PooledWSGIServer(host, port, app_module.app, options.threads, max_requests,
+                                  fd=self.socket.fileno())
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+
+        server.serve_forever(poll_interval=0.5)
+        server.drain(options.graceful_timeout)
+
+    def _retire(self, pid: int) -> None:
+        """Ask a worker to finish its in-flight requests and exit"""
+        if pid in self.workers and pid not in self.retiring:
+            self.retiring.add(pid)
+            self._signal(pid, signal.SIGTERM)
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            started = self.workers.pop(pid, None)
+            self.retiring.discard(pid)
+            code = os.waitstatus_to_exitcode(status)
+            if code != 0 and not self.stopping:
+                print(f"⚠️ Worker {pid} exited with status {code}")
+                if started is not None and time.monotonic() - started < 1.0:
+                    time.sleep(1.0)  # don't respawn in a tight loop when workers die at startup
+
+    def _signal(self, pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _shutdown(self) -> None:
+        print("🛑 Stopping workers")
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.options.graceful_timeout + 1
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGKILL)
+        self.socket.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the internship API with pre-forked workers')
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:5000'), help='host:port (default 0.0.0.0:5000)')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1)))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('SERVE_THREADS', 4)),
+                        help='request threads per worker')
+    parser.add_argument('--preload', action=argparse.BooleanOptionalAction, default=True,
+                        help='load the dataset once in the parent before forking (default on)')
+    parser.add_argument('--max-requests', type=int, default=int(os.environ.get('SERVE_MAX_REQUESTS', 0)),
+                        help='recycle a worker after this many requests (0 = never)')
+    parser.add_argument('--max-requests-jitter', type=int, default=int(os.environ.get('SERVE_MAX_REQUESTS_JITTER', 0)),
+                        help='random extra requests per worker, so workers do not recycle together')
+    parser.add_argument('--graceful-timeout', type=float, default=30.0,
+                        help='seconds a stopping worker gets to finish in-flight requests')
+    parser.add_argument('--backlog', type=int, default=2048)
+    options = parser.parse_args(argv)
+    if options.workers < 1 or options.threads < 1:
+        parser.error('--workers and --threads must be at least 1')
+    return options
+
+
+if __name__ == "__main__":
+    Arbiter(parse_args()).run()
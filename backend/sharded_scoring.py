@@ -0,0 +1,194 @@
+import heapq
+import multiprocessing
+import os
+import threading
+import uuid
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from scoring import score_columns, top_k_positions
+
+# Fewer candidate rows than this are scored in-process: shipping the request costs more than it saves
+SHARD_MIN_ROWS = 20000
+
+# Shard blocks place every column at a multiple of this many bytes
+COLUMN_ALIGNMENT = 64
+
+# Worker pool shared by every ShardedScorer of the process, created on first use
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _worker_pool(num_workers: int) -> ProcessPoolExecutor:
+    """
+    The process's shard worker pool. Spawned (not forked) workers, so the
+    pool can be started from a threaded server process; re-created after a
+    fork, since a pool doesn't survive into the child.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid() or _pool._max_workers < num_workers:
+            if _pool is not None and _pool_pid == os.getpid():
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _release_blocks(blocks: List[shared_memory.SharedMemory]) -> None:
+    for block in blocks:
+        try:
+            block.close()
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ShardedScorer:
+    """
+    Scores a BatchScorer's catalog in N contiguous row shards on a process pool.
+
+    publish() copies each shard's scoring columns into one shared memory
+    block; workers map the blocks once and keep them, so a request only
+    ships the encoded profile (BatchScorer.encode_profile) and, when the
+    hard filters narrowed the candidates, each shard's candidate rows.
+    Every shard returns its top k by (score desc, row asc) and the shard
+    lists are merged with a heap. score_columns() is elementwise per row,
+    so the result is the same as scoring all rows in one process.
+
+    Edits make the published blocks stale: invalidate() (called with the
+    engine's write lock held, so no request is using them) releases them
+    and the next request publishes the new columns.
+    """
+
+    def __init__(self, scorer, num_shards: int):
+        self.scorer = scorer
+        self.catalog = scorer.catalog
+        self.num_shards = num_shards
+        self.token = uuid.uuid4().hex
+        self._shards = None
+        self._blocks = []
+        self._publish_lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, _release_blocks, self._blocks)
+
+    def publish(self) -> List[Dict[str, object]]:
+        """Copy the columns into one shared memory block per shard (once per catalog state)"""
+        with self._publish_lock:
+            if self._shards is not None:
+                return self._shards
+            columns = self.scorer.columns()
+            repeat_rows, repeat_skills = columns.pop('repeat_rows'), columns.pop('repeat_skills')
+            columns['alive'] = self.catalog.alive
+            num_rows = self.catalog.num_rows
+            bounds = np.linspace(0, num_rows, self.num_shards + 1).astype(np.int64)
+
+            shards = []
+            for number, (start, end) in enumerate(zip(bounds[:-1].tolist(), bounds[1:].tolist())):
+                in_shard = (repeat_rows >= start) & (repeat_rows < end)
+                arrays = {name: np.ascontiguousarray(column[start:end]) for name, column in columns.items()}
+                arrays['repeat_rows'] = repeat_rows[in_shard] - start
+                arrays['repeat_skills'] = repeat_skills[in_shard]
+
+                layout = []
+                offset = 0
+                for name, array in arrays.items():
+                    layout.append((name, array.dtype.str, array.shape, offset))
+                    offset += -(-array.nbytes // COLUMN_ALIGNMENT) * COLUMN_ALIGNMENT
+                block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+                self._blocks.append(block)
+                for (name, dtype, shape, position), array in zip(layout, arrays.values()):
+                    np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=position)[...] = array
+                shards.append({'slot': (self.token, number), 'block': block.name, 'layout': layout,
+                               'start': start, 'end': end})
+            self._shards = shards
+            return shards
+
+    def invalidate(self) -> None:
+        """The catalog changed: drop the published blocks (callers hold the engine's write lock)"""
+        with self._publish_lock:
+            self._shards = None
+            _release_blocks(self._blocks)
+            self._blocks.clear()
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def top_k(self, user_profile: Dict[str, object], rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (rows, scores) of the k best candidate rows, best first, ties by row:
+        the same as top_k_positions over scorer.score(user_profile, rows).
+        rows must ascend (as the engine's filters return them).
+        """
+        k = len(range(len(rows))[:k])
+        shards = self.publish()
+        profile = self.scorer.encode_profile(user_profile)
+        # All live rows: the workers take them from their own 'alive' column
+        every_live_row = rows is self.catalog.live_rows()
+        cuts = np.searchsorted(rows, [shard['start'] for shard in shards] + [shards[-1]['end']])
+
+        pool = _worker_pool(self.num_shards)
+        futures = []
+        for shard, low, high in zip(shards, cuts[:-1], cuts[1:]):
+            if high == low:
+                continue
+            local_rows = None if every_live_row else (rows[low:high] - shard['start']).astype(np.int32)
+            futures.append(pool.submit(_score_shard, shard, profile, local_rows, k))
+        results = [future.result() for future in futures]
+
+        best = list(heapq.merge(*[zip((-shard_scores).tolist(), shard_rows.tolist())
+                                  for shard_rows, shard_scores in results]))[:k]
+        return (np.array([row for _, row in best], dtype=np.int64),
+                np.array([-score for score, _ in best], dtype=np.float64))
+
+
+# ---- Worker process side ----
+# (scorer token, shard number) -> (block name, SharedMemory, {column: array}), least recently used first
+_attached = {}
+
+# Shard mappings a worker keeps; older ones (from replaced engines) are unmapped
+MAX_ATTACHED = 64
+
+
+def _attach(shard: Dict[str, object]) -> Dict[str, np.ndarray]:
+    """The shard's columns, mapping its block on first use and unmapping the slot's previous block"""
+    slot = shard['slot']
+    entry = _attached.pop(slot, None)
+    if entry is not None and entry[0] != shard['block']:
+        _detach(entry)
+        entry = None
+    if entry is None:
+        # Workers share the parent's resource tracker, which keeps the block registered to the parent
+        block = shared_memory.SharedMemory(name=shard['block'])
+        columns = {name: np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+                   for name, dtype, shape, offset in shard['layout']}
+        entry = (shard['block'], block, columns)
+    _attached[slot] = entry
+    while len(_attached) > MAX_ATTACHED:
+        _detach(_attached.pop(next(iter(_attached))))
+    return entry[2]
+
+
+def _detach(entry) -> None:
+    _, block, columns = entry
+    columns.clear()
+    try:
+        block.close()
+    except BufferError:
+        pass  # a view is still alive; the mapping goes when it does
+
+
+def _score_shard(shard: Dict[str, object], profile: Dict[str, object], local_rows: Optional[np.ndarray],
+                 k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Top k (global rows, scores) of one shard, best first, ties by row"""
+    columns = _attach(shard)
+    if local_rows is None:
+        local_rows = np.flatnonzero(columns['alive'])
+    local_rows = local_rows.astype(np.int64)
+    scores = score_columns(profile, columns, local_rows)
+    best = top_k_positions(scores, k)
+    return local_rows[best] + shard['start'], scores[best]
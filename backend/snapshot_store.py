@@ -0,0 +1,197 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Bump whenever the derived fields or the stored layout change; older snapshots are then ignored
+SNAPSHOT_FORMAT = 4
+
+# Parts of the engine state stored in a snapshot
+SNAPSHOT_COMPONENTS = ['catalog', 'index', 'scorer', 'text', 'neighbours']
+
+
+class SnapshotMismatch(Exception):
+    """The snapshot is missing, corrupt, or was built from different data or code"""
+
+
+def default_snapshot_path(csv_path: str) -> str:
+    """data/internship.csv -> data/internship.snapshot (directory layout)"""
+    return os.path.splitext(csv_path)[0] + '.snapshot'
+
+
+def _content_checksum(arrays: Dict[str, np.ndarray]) -> str:
+    digest = hashlib.sha1()
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f'{name}:{array.dtype.str}:{array.shape}'.encode())
+        digest.update(array.view(np.uint8).reshape(-1) if array.size else b'')
+    return digest.hexdigest()
+
+
+def write_snapshot(processor, engine, path: str) -> Dict[str, Any]:
+    """
+    Write the processed catalog, its indexes, the scorer precomputation,
+    the fitted TF-IDF state and the similar-listings table. Arrays are stored as-is; lists and settings go
+    into a JSON header.
+
+    Two layouts: a path ending in .npz is one portable file; any other path
+    is a directory of .npy files plus meta.json, which read_snapshot memory
+    maps so every worker process shares one copy of the arrays.
+    Both are written to a temporary name and swapped in.
+    """
+    if engine.text_index is None:
+        raise ValueError('engine has no TF-IDF index to store')
+    parts = {
+        'catalog': processor.processed_data.state(),
+        'index': processor.index.state(),
+        'scorer': engine.scorer.state(),
+        'text': engine.text_index.state(),
+        'neighbours': engine.neighbours.state(),
+    }
+
+    arrays = {}
+    members = {}
+    settings = {}
+    for component, state in parts.items():
+        for name, value in state.items():
+            if isinstance(value, np.ndarray):
+                member = f'a{len(arrays)}'
+                arrays[member] = value
+                members.setdefault(component, {})[name] = member
+            else:
+                settings.setdefault(component, {})[name] = value
+
+    meta = {
+        'format': SNAPSHOT_FORMAT,
+        'source_version': processor.source_version,
+        'source_bytes': os.path.getsize(processor.csv_file_path),
+        'num_rows': processor.processed_data.num_rows,
+        'created_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+        'checksum': _content_checksum(arrays),
+        'members': members,
+        'settings': settings,
+    }
+
+    temp_path = f'{path}.tmp-{os.getpid()}'
+    if path.endswith('.npz'):
+        with open(temp_path, 'wb') as f:
+            np.savez(f, meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8), **arrays)
+        os.replace(temp_path, path)
+        return meta
+
+    os.makedirs(temp_path)
+    for member, array in arrays.items():
+        np.save(os.path.join(temp_path, f'{member}.npy'), array, allow_pickle=False)
+    with open(os.path.join(temp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    # Processes still mapping the old files keep them until they let go
+    old_path = f'{path}.old-{os.getpid()}'
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(temp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return meta
+
+
+def _check_meta(meta: Dict[str, Any], source_version: Optional[str]) -> None:
+    if meta.get('format') != SNAPSHOT_FORMAT:
+        raise SnapshotMismatch(f"snapshot format {meta.get('format')}, expected {SNAPSHOT_FORMAT}")
+    if source_version is not None and meta.get('source_version') != source_version:
+        raise SnapshotMismatch(f"snapshot built from {meta.get('source_version')}, CSV is {source_version}")
+
+
+def _members(meta: Dict[str, Any]):
+    return [member for component in meta['members'].values() for member in component.values()]
+
+
+def read_snapshot(path: str, source_version: Optional[str] = None, verify_checksum: bool = True,
+                  mmap: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Load a snapshot written by write_snapshot as {component: state}.
+
+    Directory snapshots are opened with mmap_mode='r' (unless mmap=False):
+    the arrays are read-only views of the page cache, shared by every
+    process that maps them, and anything that edits a column copies it first.
+
+    Raises SnapshotMismatch when the snapshot is missing or unreadable, has a
+    different SNAPSHOT_FORMAT, was built from another CSV version, or its
+    arrays don't match the stored checksum.
+    """
+    if not os.path.exists(path):
+        raise SnapshotMismatch(f'no snapshot at {path}')
+    try:
+        if os.path.isdir(path):
+            with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+            _check_meta(meta, source_version)
+            arrays = {member: np.load(os.path.join(path, f'{member}.npy'), mmap_mode='r' if mmap else None,
+                                      allow_pickle=False)
+                      for member in _members(meta)}
+        else:
+            with np.load(path, allow_pickle=False) as archive:
+                meta = json.loads(archive['meta'].tobytes().decode('utf-8'))
+                _check_meta(meta, source_version)
+                arrays = {member: archive[member] for member in _members(meta)}
+    except SnapshotMismatch:
+        raise
+    except Exception as e:
+        raise SnapshotMismatch(f'unreadable snapshot {path}: {e}')
+
+    if verify_checksum and _content_checksum(arrays) != meta['checksum']:
+        raise SnapshotMismatch(f'checksum mismatch in {path}')
+
+    parts = {}
+    for component in SNAPSHOT_COMPONENTS:
+        state = dict(meta['settings'].get(component, {}))
+        state.update((name, arrays[member]) for name, member in meta['members'].get(component, {}).items())
+        parts[component] = state
+    parts['meta'] = {name: value for name, value in meta.items() if name not in ('members', 'settings')}
+    return parts
+
+
+def _disk_bytes(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path))
+    return os.path.getsize(path)
+
+
+def build(csv_path: str, snapshot_path: Optional[str] = None) -> Dict[str, Any]:
+    """Process the CSV from scratch and write its snapshot"""
+    from data_processor import DataProcessor
+    from recommendation_engine import RecommendationEngine
+
+    snapshot_path = snapshot_path or default_snapshot_path(csv_path)
+    started = time.perf_counter()
+    processor = DataProcessor(csv_path, snapshot_path=None)
+    engine = RecommendationEngine(processor)
+    meta = write_snapshot(processor, engine, snapshot_path)
+    print(f"✅ Snapshot {snapshot_path} written for dataset version {meta['source_version']} "
+          f"({meta['num_rows']} internships, {_disk_bytes(snapshot_path) / 1e6:.1f} MB, "
+          f"{time.perf_counter() - started:.2f}s)")
+    return meta
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build the binary snapshot the API loads at startup')
+    parser.add_argument('csv', nargs='?', default=os.path.join('..', 'data', 'internship.csv'))
+    parser.add_argument('--output', help='snapshot path (default: next to the CSV)')
+    parser.add_argument('--check', action='store_true', help='only report whether the snapshot matches the CSV')
+    args = parser.parse_args()
+
+    if args.check:
+        from data_processor import file_fingerprint
+        path = args.output or default_snapshot_path(args.csv)
+        try:
+            meta = read_snapshot(path, file_fingerprint(args.csv))['meta']
+            print(f"✅ {path} matches {args.csv} (version {meta['source_version']}, built {meta['created_at']})")
+        except SnapshotMismatch as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+    else:
+        build(args.csv, args.output)
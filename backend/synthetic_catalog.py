@@ -0,0 +1,214 @@
+import argparse
+import os
+import time
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Columns of a catalog CSV, in file order
+CATALOG_COLUMNS = ['internship_title', 'company_name', 'location', 'start_date', 'duration', 'stipend']
+
+# Rows generated and written per step; fixed, so a seed gives the same file at any size
+CHUNK_ROWS = 250_000
+
+# Real listings the role, company and city vocabulary is taken from
+TEMPLATE_CSV = os.path.join('..', 'data', 'internship.csv')
+
+# Title variations: "PM Internship - <level><role><focus>"
+TITLE_LEVELS = ['', 'Junior ', 'Associate ', 'Trainee ', 'Graduate ', 'Senior ', 'Assistant ', 'Lead ']
+TITLE_FOCUS = ['', ' (Python)', ' (Java)', ' (SQL)', ' (Excel)', ' (AutoCAD)', ' (Cloud)', ' (React)',
+               ' (Machine Learning)', ' (Marketing)', ' (Finance)', ' (Operations)', ' (Research)',
+               ' - Remote Team', ' - Plant Operations', ' - Field Work']
+
+# Cities beyond the template's, with rough listing weights
+EXTRA_CITIES = {'Jaipur': 4, 'Lucknow': 4, 'Indore': 3, 'Chandigarh': 3, 'Kochi': 3, 'Nagpur': 2,
+                'Coimbatore': 2, 'Vadodara': 2, 'Bhubaneswar': 2, 'Visakhapatnam': 2, 'Patna': 1,
+                'Ranchi': 1, 'Guwahati': 1, 'Mysore': 1, 'Surat': 2}
+
+# Share of listings that are remote, and that name two cities ("Delhi, Noida")
+REMOTE_SHARE = 0.12
+MULTI_CITY_SHARE = 0.06
+
+# Company name variants, so large catalogs have thousands of distinct employers
+COMPANY_SUFFIXES = ['', ' Pvt Ltd', ' Solutions', ' Labs', ' Services', ' Digital', ' Foundation', ' Group']
+
+# Duration strings and weights, in the formats the parser handles
+DURATIONS = {'1 Month': 3, '2 Months': 8, '3 Months': 20, '4 Months': 5, '6 Months': 30, '12 Months': 20,
+             '8 Weeks': 6, '12 Weeks': 5, '6 Weeks': 3}
+
+# Stipend formats: fixed amount, range, performance based, unpaid (weights)
+STIPEND_KINDS = {'fixed': 62, 'range': 25, 'performance': 5, 'unpaid': 8}
+
+# Start date formats seen in listings, and the share of "Immediately"
+START_DATE_FORMATS = ['%d-%b-%Y', '%Y-%m-%d', '%d %b %Y', '%d/%m/%Y']
+IMMEDIATE_SHARE = 0.1
+
+# Start dates fall from a month before to six months after this day (fixed, so files don't change by date)
+START_DATE_ANCHOR = date(2025, 1, 1)
+
+# Part of generated file names; bump when the generator's output changes
+GENERATOR_VERSION = 1
+
+
+def _zipf_weights(count: int, exponent: float = 1.0) -> np.ndarray:
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _normalized(weights) -> np.ndarray:
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+
+def load_vocabulary(template_csv: Optional[str] = TEMPLATE_CSV) -> Tuple[List[str], List[str], dict]:
+    """(roles, companies, {city: weight}) from the template listings, most frequent first"""
+    if template_csv and os.path.exists(template_csv):
+        template = pd.read_csv(template_csv, dtype=str).fillna('')
+        roles = template['internship_title'].str.replace(r'^PM Internship\s*-\s*', '', regex=True)
+        roles = roles[roles != ''].value_counts().index.tolist()
+        companies = template['company_name'].value_counts().index.tolist()
+        cities = template['location'].value_counts().to_dict()
+    else:
+        roles = ['Software Developer', 'Data Analyst', 'Mechanical Engineer', 'Civil Engineer',
+                 'Marketing Executive', 'Financial Analyst', 'HR Associate', 'Electrical Engineer']
+        companies = ['Tata Consultancy Services', 'Infosys Limited', 'Larsen & Toubro', 'Tata Motors']
+        cities = {'Mumbai': 10, 'Bangalore': 8, 'Delhi': 6, 'Pune': 4, 'Chennai': 3, 'Hyderabad': 3}
+    for city, weight in EXTRA_CITIES.items():
+        cities.setdefault(city, weight)
+    return roles, companies, cities
+
+
+class CatalogGenerator:
+    """
+    Random listings in the schema and string formats of data/internship.csv.
+
+    Every column is drawn from a pool of distinct strings with skewed
+    weights (a few big employers, cities and roles carry most listings),
+    so a large catalog has realistic cardinalities for the per-distinct-value
+    ingestion and the text index. The same seed gives the same rows.
+    """
+
+    def __init__(self, seed: int = 0, template_csv: Optional[str] = TEMPLATE_CSV, anchor: date = START_DATE_ANCHOR):
+        self.rng = np.random.default_rng(seed)
+        roles, companies, cities = load_vocabulary(template_csv)
+
+        titles = [f'PM Internship - {level}{role}{focus}'
+                  for role in roles for level in TITLE_LEVELS for focus in TITLE_FOCUS]
+        # Plain titles (no level or focus) are the most common
+        title_weights = np.array([(3.0 if not level else 1.0) * (3.0 if not focus else 1.0)
+                                  for role in roles for level in TITLE_LEVELS for focus in TITLE_FOCUS])
+        self.titles = self._pool(titles, title_weights * np.repeat(_zipf_weights(len(roles), 0.6),
+                                                                   len(TITLE_LEVELS) * len(TITLE_FOCUS)))
+
+        names = [f'{company}{suffix}' for company in companies for suffix in COMPANY_SUFFIXES]
+        name_weights = np.outer(_zipf_weights(len(companies), 0.8), [8.0] + [1.0] * (len(COMPANY_SUFFIXES) - 1))
+        self.companies = self._pool(names, name_weights.ravel())
+
+        city_names = list(cities)
+        city_weights = _normalized(list(cities.values()))
+        pairs = [f'{city_names[a]}, {city_names[b]}' for a in range(min(8, len(city_names)))
+                 for b in range(min(8, len(city_names))) if a != b]
+        self.locations = self._pool(
+            city_names + ['Work From Home', 'Remote'] + pairs,
+            np.concatenate([city_weights * (1 - REMOTE_SHARE - MULTI_CITY_SHARE),
+                            [REMOTE_SHARE * 0.8, REMOTE_SHARE * 0.2],
+                            np.full(len(pairs), MULTI_CITY_SHARE / max(1, len(pairs)))]))
+
+        self.durations = self._pool(list(DURATIONS), list(DURATIONS.values()))
+        self.stipends = self._stipend_pool()
+        self.start_dates = self._start_date_pool(anchor)
+
+    @staticmethod
+    def _pool(values: List[str], weights) -> Tuple[np.ndarray, np.ndarray]:
+        return np.array(values, dtype=object), _normalized(weights)
+
+    def _stipend_pool(self) -> Tuple[np.ndarray, np.ndarray]:
+        amounts = np.arange(2000, 60001, 500)
+        # Amounts cluster around 8-25k, round thousands far more often than odd hundreds
+        amount_weights = _normalized(np.exp(-((amounts - 15000) / 9000.0) ** 2) * np.where(amounts % 1000 == 0, 4, 1))
+        lows, spreads = np.arange(2000, 40001, 1000), (2000, 5000, 10000)
+        kinds = {
+            'fixed': ([f'₹ {amount:,} /month' for amount in amounts.tolist()] + [str(a) for a in amounts.tolist()],
+                      np.concatenate([amount_weights * 0.85, amount_weights * 0.15])),
+            'range': ([f'₹ {low:,}-{low + spread:,} /month' for low in lows.tolist() for spread in spreads],
+                      _normalized(np.repeat(np.exp(-((lows - 12000) / 9000.0) ** 2), len(spreads)))),
+            'performance': (['Performance Based', 'Performance based incentives'], np.array([0.7, 0.3])),
+            'unpaid': (['Unpaid', 'Not specified'], np.array([0.8, 0.2])),
+        }
+        values = [value for kind in kinds.values() for value in kind[0]]
+        weights = np.concatenate([kind_weights * STIPEND_KINDS[name] for name, (_, kind_weights) in kinds.items()])
+        return self._pool(values, weights)
+
+    def _start_date_pool(self, anchor: date) -> Tuple[np.ndarray, np.ndarray]:
+        days = [anchor + timedelta(days=offset) for offset in range(-30, 181)]
+        # The 1st and 15th are the usual start dates
+        day_weights = np.array([5.0 if day.day in (1, 15) else 1.0 for day in days])
+        values = [day.strftime(date_format) for date_format in START_DATE_FORMATS for day in days]
+        weights = np.concatenate([day_weights * share for share in (0.55, 0.25, 0.1, 0.1)])
+        weights = _normalized(weights) * (1 - IMMEDIATE_SHARE)
+        return self._pool(values + ['Immediately'], np.append(weights, IMMEDIATE_SHARE))
+
+    def _draw(self, pool: Tuple[np.ndarray, np.ndarray], count: int) -> np.ndarray:
+        values, weights = pool
+        return values[self.rng.choice(len(values), size=count, p=weights)]
+
+    def chunk(self, count: int) -> pd.DataFrame:
+        """count new listings"""
+        return pd.DataFrame({
+            'internship_title': self._draw(self.titles, count),
+            'company_name': self._draw(self.companies, count),
+            'location': self._draw(self.locations, count),
+            'start_date': self._draw(self.start_dates, count),
+            'duration': self._draw(self.durations, count),
+            'stipend': self._draw(self.stipends, count),
+        }, columns=CATALOG_COLUMNS)
+
+    def write(self, path: str, rows: int) -> None:
+        """Write rows listings to a CSV at path, CHUNK_ROWS at a time"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8', newline='') as f:
+            for start in range(0, rows, CHUNK_ROWS):
+                self.chunk(min(CHUNK_ROWS, rows - start)).to_csv(f, index=False, header=start == 0)
+            if rows == 0:
+                f.write(','.join(CATALOG_COLUMNS) + '\n')
+        os.replace(temporary, path)
+
+
+def synthetic_catalog_path(rows: int, seed: int = 0, directory: str = os.path.join('..', 'data', 'synthetic')) -> str:
+    return os.path.join(directory, f'internships-{rows}-seed{seed}-v{GENERATOR_VERSION}.csv')
+
+
+def ensure_catalog(rows: int, seed: int = 0, directory: str = os.path.join('..', 'data', 'synthetic')) -> str:
+    """Path of the synthetic catalog with these parameters, generating it when missing"""
+    path = synthetic_catalog_path(rows, seed, directory)
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        CatalogGenerator(seed).write(path, rows)
+        print(f"✅ Generated {rows:,} listings at {path} ({time.perf_counter() - started:.1f}s)")
+    return path
+
+
+def parse_size(text: str) -> int:
+    """'10000', '10k', '2.5M' -> row count"""
+    text = text.strip().lower().replace('_', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic internship catalog CSV')
+    parser.add_argument('rows', type=parse_size, help='listings to generate (e.g. 10000, 100k, 10M)')
+    parser.add_argument('--output', help='CSV path (default: under ../data/synthetic, named by rows and seed)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--template', default=TEMPLATE_CSV, help='listings to take roles, companies and cities from')
+    args = parser.parse_args()
+
+    output = args.output or synthetic_catalog_path(args.rows, args.seed)
+    started = time.perf_counter()
+    CatalogGenerator(args.seed, args.template).write(output, args.rows)
+    print(f"✅ Generated {args.rows:,} listings at {output} ({time.perf_counter() - started:.1f}s)")
@@ -0,0 +1,92 @@
+import os
+import shutil
+
+import pytest
+
+import app as app_module
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'internship.csv')
+
+PROFILE = {'education': 'B.Tech Computer Science', 'skills': ['python'], 'location_preference': 'Any'}
+
+
+@pytest.fixture(scope='module')
+def client(tmp_path_factory):
+    """Test client over a copy of the shipped catalog, without a snapshot or file watcher"""
+    directory = tmp_path_factory.mktemp('data')
+    csv_path = str(directory / 'internship.csv')
+    if os.path.exists(DATA_CSV):
+        shutil.copy(DATA_CSV, csv_path)
+    else:
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write(app_module.SAMPLE_DATA)
+    patch = pytest.MonkeyPatch()
+    patch.setenv('DATA_SNAPSHOT', '')
+    patch.setattr(app_module, 'data_file_path', csv_path)
+    patch.setattr(app_module, 'reloader', None)
+    app_module.init_engine(check_data_file=False)
+    yield app_module.app.test_client()
+    patch.undo()
+
+
+@pytest.mark.parametrize('top_k', ['abc', 0, -3, 2.5, True, None, [5]])
+def test_search_rejects_invalid_top_k(client, top_k):
+    response = client.post('/api/recommendations', json={'query': 'python developer', 'top_k': top_k})
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'top_k must be a positive integer'
+
+
+@pytest.mark.parametrize('top_k', [1, '3', 4.0])
+def test_search_accepts_integer_top_k(client, top_k):
+    response = client.post('/api/recommendations', json={'query': 'python developer', 'top_k': top_k})
+    assert response.status_code == 200
+    assert response.get_json()['count'] <= int(top_k)
+
+
+def test_batch_rejects_invalid_top_k(client):
+    response = client.post('/api/recommendations/batch', json={'profiles': [PROFILE], 'top_k': 'abc'})
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'top_k must be a positive integer'
+
+
+def test_edits_are_refused_with_several_serve_workers(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(app_module, 'SERVE_WORKERS', 2)
+    response = client.patch('/api/internships/1', json={'stipend': '1000'}, headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 409
+    assert app_module.reloader.current().processor.edit_nonce is None
+
+
+@pytest.mark.parametrize('body', [['stipend', '1000'], 'stipend', 42])
+def test_edits_reject_a_body_that_is_not_an_object(client, monkeypatch, body):
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', 'secret')
+    for method in (client.post, client.patch):
+        url = '/api/internships' if method == client.post else '/api/internships/1'
+        response = method(url, json=body, headers={'X-Admin-Token': 'secret'})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Request body must be a JSON object of listing fields'
+    assert app_module.reloader.current().processor.edit_nonce is None
+
+
+def test_reload_under_serve_goes_through_the_arbiter(client, monkeypatch):
+    signals = []
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(app_module, 'ARBITER_PID', 4242)
+    monkeypatch.setattr(app_module.os, 'kill', lambda pid, signum: signals.append((pid, signum)))
+    reloads = app_module.reloader.reload_count
+    response = client.post('/admin/reload?wait=1', headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 202
+    assert signals == [(4242, app_module.signal.SIGUSR1)]
+    assert app_module.reloader.reload_count == reloads
+
+
+def test_metrics_carry_the_worker_label_under_serve(client):
+    app_module.registry.set_constant_labels(worker=4242)
+    try:
+        client.get('/health')
+        samples = [line for line in client.get('/metrics').get_data(as_text=True).splitlines()
+                   if line and not line.startswith('#')]
+    finally:
+        app_module.registry.set_constant_labels()
+    assert samples and all(line.startswith(line.split('{')[0] + '{worker="4242"') for line in samples)
+    assert 'worker=' not in client.get('/metrics').get_data(as_text=True)
@@ -0,0 +1,129 @@
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import indexes
+from catalog import date_to_day
+from data_processor import DataProcessor
+from dataset_stats import DatasetStats
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'internship.csv')
+
+# Raw listings covering every stipend, duration, start date and location format the parsers branch on
+TRICKY_LISTINGS = [
+    ('PM Internship - Software Developer', 'Infosys Limited', 'Bangalore', '01-Dec-2024', '3 Months',
+     '₹ 12,000 /month'),
+    ('PM Internship - Data Analyst', 'Tata Consultancy Services', 'Work From Home', 'Immediately', '8 Weeks',
+     '₹ 5,000-10,000 /month'),
+    ('PM Internship - Marketing Executive', 'Test Co', 'Remote', 'immediately', '2 Weeks', 'Performance Based'),
+    ('PM Internship - Civil Engineer', 'Larsen & Toubro', 'Mumbai, Pune', '2025-01-15', '1 Month', '15000'),
+    ('PM Internship - Mechanical Engineer', 'Tata Motors', 'Pune', '15/01/2025', '12 Months', 'Unpaid'),
+    ('PM Internship - HR Associate', 'Test Co Pvt Ltd', ' Delhi ', '01 Feb 2025', '6 months', 'Not specified'),
+    ('PM Internship - Financial Analyst', 'Test Co', 'Chennai', 'Immediately', 'Flexible', ''),
+    ('PM Internship - Graphic Designer', 'Test Co', 'Hyderabad', 'ASAP', '12 Weeks',
+     'Performance based incentives'),
+    ('Electrical Engineer', 'Test Co', 'Kolkata', 'Immediately', '4 Months', '₹ 8,000 - 12,000 /month'),
+    ('PM Internship - Web Developer', 'Test Co', 'Work from home', '01-Mar-2025', '6 Weeks', '₹ 20,000'),
+]
+
+# (stipend_amount, is_paid, duration_months) the original parser gives each listing above
+EXPECTED_FIELDS = [
+    (12000, True, 3),
+    (7500, True, 2),
+    (5000, True, 1),
+    (15000, True, 1),
+    (0, False, 12),
+    (0, False, 6),
+    (0, False, 6),
+    (5000, True, 3),
+    (10000, True, 4),
+    (20000, True, 1),
+]
+
+
+@pytest.fixture
+def tricky_csv(tmp_path):
+    path = tmp_path / 'tricky.csv'
+    pd.DataFrame(TRICKY_LISTINGS, columns=['internship_title', 'company_name', 'location', 'start_date',
+                                           'duration', 'stipend']).to_csv(path, index=False)
+    return str(path)
+
+
+def assert_same_records(vectorized: DataProcessor, row_by_row: DataProcessor) -> None:
+    expected = row_by_row._process_raw_data()
+    actual = list(vectorized.get_all_internships())
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert got == want, f"listing {want['id']} differs"
+
+
+def test_vectorized_matches_row_by_row_on_tricky_formats(tricky_csv):
+    assert_same_records(DataProcessor(tricky_csv), DataProcessor(tricky_csv, vectorized=False))
+
+
+def test_tricky_formats_parse_as_the_original_parser(tricky_csv):
+    records = list(DataProcessor(tricky_csv).get_all_internships())
+    parsed = [(record['stipend_amount'], record['is_paid'], record['duration_months']) for record in records]
+    assert parsed == EXPECTED_FIELDS
+    assert [record['work_mode'] for record in records] == [
+        'On-site', 'Remote', 'Remote', 'On-site', 'On-site', 'On-site', 'On-site', 'On-site', 'On-site', 'Remote']
+
+
+def test_immediate_start_dates_count_as_today(tricky_csv):
+    catalog = DataProcessor(tricky_csv).processed_data
+    today = date(2025, 1, 10)
+    days = catalog.start_date_days(today)
+    immediate = [row for row, listing in enumerate(TRICKY_LISTINGS) if listing[3].lower() in ('immediately', 'asap')]
+    assert days[immediate].tolist() == [date_to_day(today)] * len(immediate)
+    assert days[0] == date_to_day(date(2024, 12, 1))
+
+
+def test_start_date_filter_reads_today_at_query_time(tricky_csv, monkeypatch):
+    index = DataProcessor(tricky_csv).index
+    immediate = [row for row, listing in enumerate(TRICKY_LISTINGS) if listing[3].lower() in ('immediately', 'asap')]
+    january = (date_to_day(date(2025, 1, 1)), date_to_day(date(2025, 1, 31)))
+
+    class FrozenDate(date):
+        today_value = date(2025, 1, 10)
+
+        @classmethod
+        def today(cls):
+            return cls.today_value
+
+    monkeypatch.setattr(indexes, 'date', FrozenDate)
+    assert index.range_rows('start_date', *january).tolist() == sorted([3, 4] + immediate)
+    # The index was built on 10 Jan; a day past the range later the immediate listings fall out of it
+    FrozenDate.today_value = date(2025, 2, 1)
+    assert index.range_rows('start_date', *january).tolist() == [3, 4]
+    assert set(immediate) <= set(index.range_rows('start_date', date_to_day(date(2025, 2, 1))).tolist())
+
+
+@pytest.mark.skipif(not os.path.exists(DATA_CSV), reason='data/internship.csv not present')
+def test_vectorized_matches_row_by_row_on_shipped_catalog():
+    assert_same_records(DataProcessor(DATA_CSV), DataProcessor(DATA_CSV, vectorized=False))
+
+
+def test_incremental_stats_match_a_full_recount(tricky_csv):
+    processor = DataProcessor(tricky_csv)
+    processor.add_internship({'internship_title': 'Stats Check', 'company_name': 'Test Co', 'location': 'Pune',
+                              'start_date': 'Immediately', 'duration': '2 Months', 'stipend': '9000'})
+    processor.update_internship(2, {'stipend': '25000', 'location': 'Mumbai'})
+    processor.remove_internship(int(processor.processed_data.ids[0]))
+    assert processor.get_stats() == DatasetStats(processor.processed_data, processor.index).summary()
+
+
+def test_version_differs_for_different_edits_after_reload(tricky_csv):
+    processor = DataProcessor(tricky_csv)
+    assert processor.version == processor.source_version
+    for stipend in ('1000', '2000', '3000'):
+        processor.update_internship(1, {'stipend': stipend})
+    before_reload = processor.version
+
+    processor.load_data()
+    assert processor.version == processor.source_version
+    for duration in ('1 Month', '2 Months', '3 Months'):
+        processor.update_internship(1, {'duration': duration})
+    assert processor.version.startswith(processor.source_version + '+')
+    assert processor.version != before_reload
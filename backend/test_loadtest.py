@@ -0,0 +1,16 @@
+import pytest
+
+from loadtest import percentile
+
+
+@pytest.mark.parametrize('fraction, expected', [(0.5, 50), (0.95, 95), (0.99, 99), (0.07, 7), (1.0, 100),
+                                                (0.0, 1), (0.001, 1)])
+def test_percentile_is_the_nearest_rank(fraction, expected):
+    assert percentile(list(range(1, 101)), fraction) == expected
+
+
+def test_percentile_of_short_lists():
+    assert percentile([], 0.95) == 0.0
+    assert percentile([3.5], 0.99) == 3.5
+    assert percentile([1, 2, 3], 0.5) == 2
+    assert percentile([1, 2, 3, 4], 0.5) == 2
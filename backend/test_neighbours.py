@@ -0,0 +1,153 @@
+import os
+
+import numpy as np
+import pytest
+
+import neighbours
+from data_processor import DataProcessor
+from recommendation_engine import RecommendationEngine
+from snapshot_store import write_snapshot
+from synthetic_catalog import CatalogGenerator
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'internship.csv')
+
+NEW_LISTING = {
+    'internship_title': 'PM Internship - Software Developer', 'company_name': 'Infosys Limited',
+    'location': 'Bangalore', 'start_date': 'Immediately', 'duration': '3 Months', 'stipend': '₹ 12,000 /month',
+}
+
+
+def assert_table_exact(engine):
+    """Every live row's table lookup equals scoring it against every live row"""
+    index = engine.neighbours
+    for row in engine.internships.live_rows().tolist():
+        assert index.similar(row) == index._similar_to_row(row, neighbours.NEIGHBOUR_COUNT), f"row {row}"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    path = DATA_CSV
+    if not os.path.exists(path):
+        path = str(tmp_path / 'synthetic.csv')
+        CatalogGenerator(seed=1).write(path, 300)
+    return RecommendationEngine(DataProcessor(path), num_shards=1)
+
+
+@pytest.fixture
+def blocked_engine(tmp_path, monkeypatch):
+    """A catalog above NEIGHBOUR_EXACT_GROUPS, so its table comes from the blocked passes"""
+    path = str(tmp_path / 'synthetic.csv')
+    CatalogGenerator(seed=2).write(path, 3000)
+    monkeypatch.setattr(neighbours, 'NEIGHBOUR_EXACT_GROUPS', 256)
+    monkeypatch.setattr(neighbours, 'NEIGHBOUR_BLOCK_SIZE', 64)
+    return RecommendationEngine(DataProcessor(path), num_shards=1)
+
+
+def test_small_catalog_table_is_exact(engine):
+    assert_table_exact(engine)
+
+
+def test_blocked_table_scores_are_exact_and_finds_the_best_neighbours(blocked_engine):
+    index = blocked_engine.neighbours
+    assert len(index.group_rows) > neighbours.NEIGHBOUR_EXACT_GROUPS
+    rows = blocked_engine.internships.live_rows()[::10].tolist()
+    recall = []
+    for row in rows:
+        found = index.similar(row)
+        best = index._similar_to_row(row, neighbours.NEIGHBOUR_COUNT)
+        exact = dict(zip(*[values.tolist() for values in index._row_scores(row)]))
+        assert all(exact[neighbour] == score for neighbour, score in found)
+        assert [score for _, score in found] == sorted((score for _, score in found), reverse=True)
+        recall.append(len({n for n, _ in found[:5]} & {n for n, _ in best[:5]}) / 5)
+    assert np.mean(recall) >= 0.85
+
+
+def test_edits_update_the_table(engine):
+    added = engine.add_internship(NEW_LISTING)
+    first_id = engine.internships.ids[engine.internships.live_rows()[0]]
+    engine.update_internship(int(first_id), {'internship_title': 'PM Internship - Software Developer',
+                                             'company_name': 'Infosys Limited'})
+    removed = int(engine.internships.ids[engine.internships.live_rows()[5]])
+    assert engine.remove_internship(removed)
+    assert_table_exact(engine)
+
+    row = engine.data_processor.index.row_of(added['id'])
+    similar = engine.neighbours.similar(row)
+    assert row not in [neighbour for neighbour, _ in similar]
+    assert all(engine.internships.ids[neighbour] != removed for neighbour, _ in similar)
+
+
+def test_blocked_table_edits_score_exactly(blocked_engine):
+    row = blocked_engine.data_processor.index.row_of(blocked_engine.add_internship(NEW_LISTING)['id'])
+    index = blocked_engine.neighbours
+    exact = dict(zip(*[values.tolist() for values in index._row_scores(row)]))
+    found = index.similar(row)
+    assert len(found) == neighbours.NEIGHBOUR_COUNT and all(exact[other] == score for other, score in found)
+    assert [score for _, score in found] == sorted((score for _, score in found), reverse=True)
+    for neighbour, _ in index.similar(row, 5):
+        # The new listing is in a neighbour's list exactly when it outranks the last entry there
+        listed = index.similar(neighbour)
+        score = dict(zip(*[values.tolist() for values in index._row_scores(neighbour)]))[row]
+        if row in dict(listed):
+            assert dict(listed)[row] == score
+        else:
+            assert (score, -row) < (listed[-1][1], -listed[-1][0])
+
+
+def test_edit_cost_does_not_grow_with_the_catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(neighbours, 'NEIGHBOUR_EXACT_GROUPS', 64)
+    monkeypatch.setattr(neighbours, 'NEIGHBOUR_BLOCK_SIZE', 32)
+    monkeypatch.setattr(neighbours, 'NEIGHBOUR_PASSES', 4)
+    scored = []
+    scores_to = neighbours.NeighbourIndex._scores_to
+
+    def counting_scores_to(self, row, rows, reverse=False):
+        scored.append(len(rows))
+        return scores_to(self, row, rows, reverse)
+
+    monkeypatch.setattr(neighbours.NeighbourIndex, '_scores_to', counting_scores_to)
+
+    costs = []
+    for size in (1000, 4000):
+        path = str(tmp_path / f'synthetic_{size}.csv')
+        CatalogGenerator(seed=3).write(path, size)
+        engine = RecommendationEngine(DataProcessor(path), num_shards=1)
+        index = engine.neighbours
+        scored.clear()
+        for position in range(0, 400, 40):
+            row = int(engine.internships.live_rows()[position])
+            engine.update_internship(int(engine.internships.ids[row]),
+                                     {'internship_title': f'Edited listing {position}'})
+            for neighbour, _ in index.similar(row):
+                index.similar(neighbour)
+        costs.append(sum(scored))
+        # An edit or rescore sees at most NEIGHBOUR_PASSES blocks of groups (plus the added ones), `width` rows each
+        assert max(scored) <= index.width * (neighbours.NEIGHBOUR_PASSES * neighbours.NEIGHBOUR_BLOCK_SIZE + 11)
+
+        # The table is a growable buffer: later edits write into its spare capacity
+        table = index.table_rows
+        engine.add_internship(NEW_LISTING)
+        assert index.table_rows is table
+
+    assert costs[1] <= 1.5 * costs[0], costs
+
+
+def test_table_is_stored_in_the_snapshot(engine, tmp_path):
+    snapshot = str(tmp_path / 'snapshot')
+    write_snapshot(engine.data_processor, engine, snapshot)
+    loaded = RecommendationEngine(DataProcessor(engine.data_processor.csv_file_path, snapshot_path=snapshot),
+                                  num_shards=1)
+    for name in ('group_of', 'group_rows', 'table_rows', 'table_scores'):
+        assert np.array_equal(getattr(loaded.neighbours, name), getattr(engine.neighbours, name))
+
+    # Memory-mapped arrays are copied before the first edit
+    loaded.add_internship(NEW_LISTING)
+    assert_table_exact(loaded)
+
+
+def test_on_demand_lookups_are_memoized_with_a_bound(engine, monkeypatch):
+    monkeypatch.setattr(neighbours, 'NEIGHBOUR_MEMO_SIZE', 3)
+    rows = engine.internships.live_rows()[:5].tolist()
+    for row in rows:
+        engine.neighbours.similar(row, neighbours.NEIGHBOUR_COUNT + 5)
+    assert list(engine.neighbours._memo) == [(row, neighbours.NEIGHBOUR_COUNT + 5) for row in rows[-3:]]
@@ -0,0 +1,262 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+import recommendation_engine
+from data_processor import DataProcessor
+from recommendation_engine import RecommendationEngine
+from scoring import EDUCATION_FIELD_KEYWORDS, PRESTIGE_COMPANIES, PRESTIGE_ROLES, top_k_positions
+from synthetic_catalog import CatalogGenerator
+
+# Profiles covering skills (exact, partial and none), education fields, location preferences and stipend floors
+PROFILES = [
+    {'skills': ['Python', 'Machine Learning', 'Data Science'], 'education': 'Computer Science',
+     'location_preference': 'Work From Home', 'min_stipend': 20000},
+    {'skills': ['python', 'SQL'], 'education': 'B.Tech Computer Science', 'location_preference': 'Mumbai',
+     'min_stipend': 0},
+    {'skills': [], 'education': '', 'location_preference': 'any'},
+    {'skills': ['AutoCAD', 'Excel', 'Communication'], 'education': 'Mechanical Engineering',
+     'location_preference': 'Pune', 'min_stipend': 8000},
+    {'skills': ['Marketing'], 'education': 'MBA', 'location_preference': 'Bangalore', 'min_stipend': 5000},
+]
+
+
+# Skill lists hitting the bitset edge cases: case, substrings both ways, unknown skills and repeats
+SKILL_LISTS = [['Python'], ['python', 'PYTHON'], ['Data'], ['Machine Learning Engineering'],
+               ['sql', 'Excel', 'Java'], ['Unknown Skill'], ['a'], []]
+
+
+# The original per-listing scorer, kept as the reference BatchScorer and SkillBitsets must reproduce exactly
+def reference_match_score(user_profile: Dict[str, Any], internship: Dict[str, Any]) -> float:
+    """Calculate comprehensive match score between user and internship"""
+    total_score = 0.0
+    max_score = 0.0
+
+    # 1. Skills matching (40% weight)
+    skills_score = reference_skills_match(user_profile.get('skills', []), internship['skills'])
+    total_score += skills_score * 0.4
+    max_score += 0.4
+
+    # 2. Education relevance (25% weight)
+    education_score = reference_education_match(user_profile.get('education', ''), internship)
+    total_score += education_score * 0.25
+    max_score += 0.25
+
+    # 3. Location preference (15% weight)
+    location_score = reference_location_match(user_profile.get('location_preference', ''), internship)
+    total_score += location_score * 0.15
+    max_score += 0.15
+
+    # 4. Stipend attractiveness (10% weight)
+    stipend_score = reference_stipend_score(user_profile.get('min_stipend', 0), internship['stipend_amount'])
+    total_score += stipend_score * 0.1
+    max_score += 0.1
+
+    # 5. Company and role prestige (10% weight)
+    prestige_score = reference_prestige_score(internship)
+    total_score += prestige_score * 0.1
+    max_score += 0.1
+
+    # Normalize score
+    final_score = total_score / max_score if max_score > 0 else 0
+    return min(1.0, final_score)
+
+
+def reference_skills_match(user_skills: List[str], internship_skills: List[str]) -> float:
+    """Calculate skills matching score"""
+    if not user_skills or not internship_skills:
+        return 0.0
+
+    user_skills_lower = [skill.lower() for skill in user_skills]
+    internship_skills_lower = [skill.lower() for skill in internship_skills]
+
+    # Direct matches
+    direct_matches = len(set(user_skills_lower) & set(internship_skills_lower))
+
+    # Partial matches (e.g., "Python" in "Python Development")
+    partial_matches = 0
+    for user_skill in user_skills_lower:
+        for int_skill in internship_skills_lower:
+            if user_skill in int_skill or int_skill in user_skill:
+                partial_matches += 0.5
+
+    total_matches = direct_matches + partial_matches
+    max_possible_matches = max(len(user_skills), len(internship_skills))
+
+    return min(1.0, total_matches / max_possible_matches)
+
+
+def reference_education_match(user_education: str, internship: Dict[str, Any]) -> float:
+    """Calculate education relevance score"""
+    if not user_education:
+        return 0.5  # Neutral score
+
+    education_lower = user_education.lower()
+    title_lower = internship['title'].lower()
+    domain_lower = internship['domain'].lower()
+
+    for field, keywords in EDUCATION_FIELD_KEYWORDS.items():
+        if field in education_lower:
+            for keyword in keywords:
+                if keyword in title_lower or keyword in domain_lower:
+                    return 1.0
+
+    return 0.6  # Decent match for other fields
+
+
+def reference_location_match(user_location_pref: str, internship: Dict[str, Any]) -> float:
+    """Calculate location preference match"""
+    if not user_location_pref or user_location_pref.lower() == 'any':
+        return 1.0
+
+    user_pref_lower = user_location_pref.lower()
+
+    # Perfect match for remote preference
+    if user_pref_lower == 'work from home' and internship['work_mode'] == 'Remote':
+        return 1.0
+
+    # Good match for city preference
+    if user_pref_lower in internship['location'].lower():
+        return 1.0
+
+    # Remote is always an option
+    if internship['work_mode'] == 'Remote':
+        return 0.8
+
+    return 0.3  # Different location
+
+
+def reference_stipend_score(user_min_stipend: int, internship_stipend: int) -> float:
+    """Calculate stipend attractiveness score"""
+    if user_min_stipend == 0:
+        return 1.0 if internship_stipend > 0 else 0.5
+
+    if internship_stipend < user_min_stipend:
+        return 0.0
+
+    # Higher stipend = higher score
+    if internship_stipend >= user_min_stipend * 1.5:
+        return 1.0
+    elif internship_stipend >= user_min_stipend * 1.2:
+        return 0.8
+    else:
+        return 0.6
+
+
+def reference_prestige_score(internship: Dict[str, Any]) -> float:
+    """Calculate company and role prestige score"""
+    company = internship['company'].lower()
+    title = internship['title'].lower()
+
+    score = 0.5  # Base score
+
+    # Company prestige
+    for prestige_company in PRESTIGE_COMPANIES:
+        if prestige_company in company:
+            score += 0.3
+            break
+
+    # Role prestige
+    for prestige_role in PRESTIGE_ROLES:
+        if prestige_role in title:
+            score += 0.2
+            break
+
+    # High stipend indicates prestige
+    if internship['stipend_amount'] > 25000:
+        score += 0.2
+    elif internship['stipend_amount'] > 15000:
+        score += 0.1
+
+    return min(1.0, score)
+
+
+@pytest.fixture(scope='module')
+def engine(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('catalog') / 'synthetic.csv')
+    CatalogGenerator(seed=4).write(path, 800)
+    return RecommendationEngine(DataProcessor(path), num_shards=1)
+
+
+def test_batch_scoring_matches_per_listing_scoring(engine):
+    for profile in PROFILES:
+        rows = engine._filter_rows(profile)
+        assert len(rows)
+        expected = [reference_match_score(profile, engine.internships.record(row)) for row in rows]
+        assert engine.scorer.score(profile, rows).tolist() == expected
+
+
+def test_skill_bitsets_match_the_per_listing_skill_match(engine):
+    rows = engine.internships.live_rows()
+    skills = [engine.internships.record(row)['skills'] for row in rows]
+    skill_lists = SKILL_LISTS + [listing_skills for listing_skills in skills[:40:4] if listing_skills]
+    matrix = engine.scorer.skills.score_matrix(skill_lists, rows)
+    for user_skills, scores in zip(skill_lists, matrix):
+        assert scores.tolist() == [reference_skills_match(user_skills, listing) for listing in skills]
+
+
+def test_top_k_positions_match_a_stable_descending_sort():
+    rng = np.random.default_rng(0)
+    for scores in (rng.integers(0, 5, 200).astype(float), rng.random(50), np.zeros(7)):
+        expected = np.argsort(-scores, kind='stable')
+        for k in (0, 1, 5, 49, len(scores), len(scores) + 3, -2):
+            assert top_k_positions(scores, k).tolist() == expected[:k].tolist()
+
+
+def test_recommendations_are_the_best_scores_ties_by_row(engine):
+    for profile in PROFILES:
+        rows = engine._filter_rows(profile)
+        scores = engine.scorer.score(profile, rows)
+        best = np.argsort(-scores, kind='stable')[:10]
+        recommendations = engine.get_recommendations(profile, 10)
+        assert [rec['id'] for rec in recommendations] == engine.internships.ids[rows[best]].tolist()
+        assert [rec['match_score'] for rec in recommendations] == scores[best].tolist()
+
+
+def test_batch_recommendations_match_per_profile_recommendations(engine):
+    # Profiles sharing their hard filters are scored together as one matrix
+    profiles = PROFILES + [{**profile, 'skills': ['Python']} for profile in PROFILES]
+    for k in (1, 7, 0):
+        assert engine.get_recommendations_batch(profiles, k) == [engine.get_recommendations(profile, k)
+                                                                for profile in profiles]
+
+
+def test_sharded_scoring_matches_in_process_scoring(tmp_path, monkeypatch):
+    path = str(tmp_path / 'synthetic.csv')
+    CatalogGenerator(seed=5).write(path, 600)
+    monkeypatch.setattr(recommendation_engine, 'SHARD_MIN_ROWS', 0)
+    sharded = RecommendationEngine(DataProcessor(path), num_shards=2)
+    in_process = RecommendationEngine(DataProcessor(path), num_shards=1)
+    try:
+        for _ in range(2):
+            for profile in PROFILES:
+                rows = in_process._filter_rows(profile)
+                scores = in_process.scorer.score(profile, rows)
+                best = top_k_positions(scores, 10)
+                top_rows, top_scores = sharded.sharded.top_k(profile, rows, 10)
+                assert top_rows.tolist() == rows[best].tolist() and top_scores.tolist() == scores[best].tolist()
+                assert sharded.get_recommendations(profile, 10) == in_process.get_recommendations(profile, 10)
+            # Edits republish the shards' columns
+            for engine in (sharded, in_process):
+                engine.update_internship(int(engine.internships.ids[3]), {'stipend': '90000'})
+    finally:
+        sharded.sharded.close()
+
+
+def test_edited_listings_are_searchable_at_once(tmp_path):
+    path = str(tmp_path / 'synthetic.csv')
+    CatalogGenerator(seed=6).write(path, 300)
+    engine = RecommendationEngine(DataProcessor(path), num_shards=1)
+    added = engine.add_internship({'internship_title': 'Quantum Widget Engineer', 'company_name': 'Test Co',
+                                   'location': 'Work From Home', 'start_date': 'Immediately',
+                                   'duration': '3 Months', 'stipend': '15000'})
+    assert [rec['id'] for rec in engine.recommend('quantum widget', top_k=3)] == [added['id']]
+
+    engine.update_internship(added['id'], {'internship_title': 'Zeppelin Gadget Engineer'})
+    assert not engine.recommend('quantum widget', top_k=3)
+    assert [rec['id'] for rec in engine.recommend('zeppelin gadget', top_k=3)] == [added['id']]
+
+    engine.remove_internship(added['id'])
+    assert not engine.recommend('zeppelin gadget', top_k=3)
+    assert engine.data_processor.get_internship_by_id(added['id']) is None
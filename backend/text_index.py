@@ -0,0 +1,189 @@
+import numpy as np
+import scipy.sparse as sp
+from collections import Counter
+from typing import Any, Dict, Optional
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from catalog import grow_buffer
+
+# Changed documents kept as overrides before they are folded into the matrix
+# (at least this many, or 5% of the rows)
+OVERRIDE_LIMIT = 256
+
+
+class TextIndex:
+    """
+    TF-IDF document vectors that can be patched one document at a time.
+
+    Fitted once with TfidfVectorizer; after that the vocabulary only grows.
+    set_row() vectorizes a changed document with the fitted analyzer and idf
+    weights (a term never seen before gets the idf of a term found in one
+    document) and keeps it as an override of the fitted row, so an update
+    costs O(document) instead of a refit. Fitted terms keep their idf, so
+    after many updates scores drift slightly from what a full refit gives.
+    Overrides are folded into the matrix once there are more than
+    OVERRIDE_LIMIT of them.
+    """
+
+    def __init__(self, vectorizer: TfidfVectorizer, matrix, num_fitted_docs: Optional[int] = None):
+        self.vectorizer = vectorizer
+        self.analyzer = vectorizer.build_analyzer()
+        self.vocabulary = dict(vectorizer.vocabulary_)
+        self.num_terms = len(self.vocabulary)
+        self._idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+        self.num_fitted_docs = matrix.shape[0] if num_fitted_docs is None else num_fitted_docs
+        self.matrix = sp.csr_matrix(matrix)
+        self._overrides = {}
+        self._override_block = None
+
+    @classmethod
+    def fit(cls, documents, num_rows: Optional[int] = None, rows: Optional[np.ndarray] = None,
+            **vectorizer_options) -> 'TextIndex':
+        """Fit on documents; rows places document i at row rows[i] of a num_rows matrix"""
+        vectorizer = TfidfVectorizer(**vectorizer_options)
+        matrix = vectorizer.fit_transform(documents)
+        if rows is not None and not np.array_equal(rows, np.arange(num_rows)):
+            placement = sp.csr_matrix((np.ones(len(rows)), (rows, np.arange(len(rows)))),
+                                      shape=(num_rows, len(rows)))
+            matrix = placement @ matrix
+        return cls(vectorizer, matrix)
+
+    def state(self) -> Dict[str, Any]:
+        """Fitted vectorizer settings, vocabulary, idf and matrix for from_state()"""
+        if self._overrides:
+            self._compact()
+        params = self.vectorizer.get_params()
+        return {
+            'params': {name: list(value) if isinstance(value, tuple) else value for name, value in params.items()
+                       if name in ('max_features', 'stop_words', 'ngram_range', 'lowercase', 'sublinear_tf')},
+            'terms': sorted(self.vocabulary, key=self.vocabulary.get),
+            'num_fitted_docs': self.num_fitted_docs,
+            'shape': list(self.matrix.shape),
+            'idf': self.idf,
+            'data': self.matrix.data,
+            'indices': self.matrix.indices,
+            'indptr': self.matrix.indptr,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'TextIndex':
+        params = {name: tuple(value) if isinstance(value, list) else value for name, value in state['params'].items()}
+        vectorizer = TfidfVectorizer(**params)
+        vectorizer.vocabulary_ = {term: index for index, term in enumerate(state['terms'])}
+        vectorizer.idf_ = np.asarray(state['idf'], dtype=np.float64)
+        matrix = sp.csr_matrix((state['data'], state['indices'], state['indptr']), shape=tuple(state['shape']))
+        return cls(vectorizer, matrix, num_fitted_docs=state['num_fitted_docs'])
+
+    @property
+    def idf(self) -> np.ndarray:
+        return self._idf[:self.num_terms]
+
+    def transform(self, text: str, grow: bool = False) -> sp.csr_matrix:
+        """
+        L2-normalized tf-idf row for text, identical to vectorizer.transform()
+        for fitted terms. With grow=True unseen terms join the vocabulary.
+        """
+        counts = Counter(self.analyzer(text))
+        if grow:
+            for term in counts:
+                if term not in self.vocabulary:
+                    self.vocabulary[term] = self.num_terms
+                    self._idf = grow_buffer(self._idf, self.num_terms + 1)
+                    # Smooth idf of a term present in one document
+                    self._idf[self.num_terms] = np.log((1 + self.num_fitted_docs) / 2) + 1
+                    self.num_terms += 1
+        terms = sorted((self.vocabulary[term], count) for term, count in counts.items() if term in self.vocabulary)
+        indices = np.array([index for index, _ in terms], dtype=np.int32)
+        data = np.array([count for _, count in terms], dtype=np.float64)
+        data *= self._idf[indices]
+        # Sequential sum of squares, as sklearn's l2 row normalization does
+        norm = 0.0
+        for value in data.tolist():
+            norm += value * value
+        if norm > 0:
+            data /= np.sqrt(norm)
+        return sp.csr_matrix((data, indices, np.array([0, len(indices)])), shape=(1, self.num_terms))
+
+    def set_row(self, row: int, text: Optional[str]) -> None:
+        """Replace the vector of one row; text=None empties it (deleted row)"""
+        if text is None:
+            vector = sp.csr_matrix((1, self.num_terms))
+        else:
+            vector = self.transform(text, grow=True)
+        self._overrides[row] = (vector.indices.copy(), vector.data.copy())
+        self._override_block = None
+        if len(self._overrides) > max(OVERRIDE_LIMIT, self.matrix.shape[0] // 20):
+            self._compact()
+
+    def _overridden(self):
+        """(rows, matrix) of the overriding vectors, one matrix row per overridden row"""
+        block = self._override_block
+        if block is None or block[1].shape[1] != self.num_terms:
+            rows = np.array(sorted(self._overrides), dtype=np.int64)
+            vectors = [self._overrides[row] for row in rows]
+            indptr = np.concatenate([[0], np.cumsum([len(indices) for indices, _ in vectors])])
+            indices = np.concatenate([indices for indices, _ in vectors]) if vectors else np.zeros(0, np.int32)
+            data = np.concatenate([data for _, data in vectors]) if vectors else np.zeros(0)
+            block = self._override_block = (rows, sp.csr_matrix((data, indices, indptr),
+                                                                shape=(len(rows), self.num_terms)))
+        return block
+
+    def _compact(self) -> None:
+        """Fold the overrides into the matrix"""
+        rows, overrides = self._overridden()
+        base = self.matrix.tocoo()
+        keep = ~np.isin(base.row, rows)
+        overrides = overrides.tocoo()
+        num_rows = max(self.matrix.shape[0], int(rows[-1]) + 1 if len(rows) else 0)
+        self.matrix = sp.csr_matrix(
+            (np.concatenate([base.data[keep], overrides.data]),
+             (np.concatenate([base.row[keep], rows[overrides.row]]),
+              np.concatenate([base.col[keep], overrides.col]))),
+            shape=(num_rows, self.num_terms))
+        self._overrides = {}
+        self._override_block = None
+
+    def row_vectors(self, rows) -> sp.csr_matrix:
+        """Current vectors (overrides applied) of the given rows, one matrix row each, term order kept"""
+        rows = np.asarray(rows, dtype=np.int64)
+        overridden = np.zeros(len(rows), dtype=bool)
+        if self._overrides:
+            override_rows, overrides = self._overridden()
+            overridden = np.isin(rows, override_rows)
+            picked = overrides[np.searchsorted(override_rows, rows[overridden])]
+        from_matrix = ~overridden & (rows < self.matrix.shape[0])
+        base = self.matrix[rows[from_matrix]]
+
+        # Gather the row segments of both sources into one CSR, in the order of rows
+        lengths = np.zeros(len(rows), dtype=np.int64)
+        sources = np.zeros(len(rows), dtype=np.int64)
+        lengths[from_matrix] = np.diff(base.indptr)
+        sources[from_matrix] = base.indptr[:-1]
+        indices, data = [base.indices], [base.data]
+        if overridden.any():
+            lengths[overridden] = np.diff(picked.indptr)
+            sources[overridden] = picked.indptr[:-1] + len(base.indices)
+            indices.append(picked.indices)
+            data.append(picked.data)
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        positions = np.arange(indptr[-1]) + np.repeat(sources - indptr[:-1], lengths)
+        return sp.csr_matrix((np.concatenate(data)[positions], np.concatenate(indices)[positions], indptr),
+                             shape=(len(rows), self.num_terms))
+
+    def similarities(self, text: str):
+        """(rows, cosine similarity) for every row sharing a term with text"""
+        return self.similarities_to(self.transform(text))
+
+    def similarities_to(self, query: sp.csr_matrix):
+        """(rows, cosine similarity) for every row sharing a term with an L2-normalized (1, terms) vector"""
+        # Rows are L2-normalized, so the sparse product is the cosine similarity
+        matches = (self.matrix @ query[:, :self.matrix.shape[1]].T).tocoo()
+        rows = matches.row.astype(np.int64)
+        values = matches.data
+        if self._overrides:
+            override_rows, overrides = self._overridden()
+            keep = ~np.isin(rows, override_rows)
+            hits = (overrides @ query[:, :overrides.shape[1]].T).tocoo()
+            rows = np.concatenate([rows[keep], override_rows[hits.row]])
+            values = np.concatenate([values[keep], hits.data])
+        return rows, values